@@ -0,0 +1,267 @@
+"""Benchmark of the csv data loader on wide files.
+
+A csv file with the id and data columns and many other columns is generated
+from a corpus. Only the id and data are loaded, the other columns are skipped
+by the parser. The loader is run with each parser engine and block size, and
+with `--memory-map` also with the file mapped into memory. The runs are
+compared with two references:
+
+    * `read_csv_all_columns` - `pandas.read_csv` parsing every column in
+      chunks, without building items
+    * `read_csv_iterrows` - `pandas.read_csv` of the used columns in chunks
+      and an item built from each row with `iterrows`
+
+For every run the results file records the rows and megabytes per second of
+the median run and the speedup compared to `read_csv_iterrows`. Engines that
+are not installed, like `pyarrow`, are recorded with the error and skipped.
+
+Example:
+    .. code-block::
+
+        python benchmarks/bench_csv.py --rows 200000 --columns 40
+        python benchmarks/bench_csv.py --engines c pyarrow \\
+            --block-sizes 1048576 16777216 --memory-map
+"""
+
+import argparse
+import csv
+import os
+import random
+import statistics
+import tempfile
+
+import pandas as pd
+from common import timed, write_results
+from corpora import generate, PROFILES
+from data_preprocessing.steps import _fetch
+from data_preprocessing.utils.config_template import ConfigTemplates
+
+LOG_LEVEL = "ERROR"
+
+
+def write_wide_csv(docs, rows, columns, seed):
+    """Write a csv file with the documents and filler columns.
+
+    Args:
+        docs (list): Documents, repeated to fill the rows
+        rows (int): Number of rows
+        columns (int): Number of columns besides the id and data
+        seed (int): Seed of the filler values
+    Returns:
+        str: Path of the file
+    """
+    rng = random.Random(seed)
+    header = ["id", "text"] + ["column_{}".format(i) for i in range(columns)]
+    handle, path = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(handle, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for i in range(rows):
+            filler = [
+                rng.randint(0, 10 ** 6) if c % 3 == 0 else
+                round(rng.random(), 4) if c % 3 == 1 else
+                "value_{}".format(rng.randint(0, 100))
+                for c in range(columns)
+            ]
+            writer.writerow([i + 1, docs[i % len(docs)]] + filler)
+    return path
+
+
+def read_all_columns(path, batch_size):
+    """Parse every column of the file in chunks."""
+    for batch in pd.read_csv(path, chunksize=batch_size):
+        pass
+
+
+def read_iterrows(path, batch_size):
+    """Build an item from each row with `iterrows`, like the old loader."""
+    items = []
+    for batch in pd.read_csv(
+            path, usecols=["id", "text"], chunksize=batch_size):
+        for _, row in batch.iterrows():
+            items.append({"id": row["id"], "data": row["text"], "tags": {}})
+    return items
+
+
+def build_loader(path, batch_size, engine, block_size, memory_map=False):
+    """Build the csv data loader.
+
+    Args:
+        path (str): Path of the csv file
+        batch_size (int): Batch size of the data loader
+        engine (str): Parser engine
+        block_size (int): Bytes parsed at a time
+        memory_map (bool): Map the file into memory
+    Returns:
+        obj: CsvDataLoader
+    """
+    config = ConfigTemplates.data_loader_csv_loader(
+        file_path=path,
+        columns={"id": "id", "data": "text"},
+        batch_size=batch_size,
+        log_level=LOG_LEVEL,
+        engine=engine,
+        block_size=block_size,
+        memory_map=memory_map
+    )
+    config["name"] = "data_loader"
+    return _fetch(config)
+
+
+def measure(name, func, rows, size, repeat):
+    """Time a run and describe it.
+
+    Args:
+        name (str): Name of the run
+        func (obj): Function that returns the function to time
+        rows (int): Rows in the file
+        size (int): Size of the file in bytes
+        repeat (int): Number of runs
+    Returns:
+        dict: Result
+    """
+    times = timed(func, repeat)
+    seconds = statistics.median(times)
+    return {
+        "name": name,
+        "seconds": seconds,
+        "min_seconds": min(times),
+        "rows_per_sec": rows / seconds,
+        "mb_per_sec": size / 2 ** 20 / seconds
+    }
+
+
+def run(args):
+    """Run the benchmark.
+
+    Args:
+        args (obj): Parsed arguments
+    Returns:
+        list: Results
+    """
+    docs = generate(
+        args.profile,
+        args.docs,
+        seed=args.seed,
+        median_chars=args.median_chars
+    )
+    path = write_wide_csv(docs, args.rows, args.columns, args.seed)
+    size = os.path.getsize(path)
+    print("{} rows, {} columns, {:.1f} MB".format(
+        args.rows, args.columns + 2, size / 2 ** 20
+    ))
+    results = []
+    try:
+        results.append(measure(
+            "read_csv_all_columns",
+            lambda: lambda: read_all_columns(path, args.batch_size),
+            args.rows, size, args.repeat
+        ))
+        baseline = measure(
+            "read_csv_iterrows",
+            lambda: lambda: read_iterrows(path, args.batch_size),
+            args.rows, size, args.repeat
+        )
+        results.append(baseline)
+        modes = [False, True] if args.memory_map else [False]
+        for engine in args.engines:
+            for block_size in args.block_sizes:
+                for memory_map in modes:
+                    name = "loader_{}_{}{}".format(
+                        engine, block_size, "_mmap" if memory_map else ""
+                    )
+                    try:
+                        loader = build_loader(
+                            path, args.batch_size, engine, block_size,
+                            memory_map
+                        )
+                    except Exception as e:
+                        results.append(
+                            {"name": name, "error": type(e).__name__}
+                        )
+                        print("{:<36} skipped - {}".format(name, e))
+                        continue
+                    results.append(measure(
+                        name,
+                        lambda: lambda: list(loader.process()),
+                        args.rows, size, args.repeat
+                    ))
+        for result in results:
+            if "error" in result:
+                continue
+            result["speedup"] = baseline["seconds"] / result["seconds"]
+            _print(result)
+    finally:
+        os.remove(path)
+    return results
+
+
+def _print(result):
+    """Print one result."""
+    print("{:<36} {:>12.0f} rows/s {:>8.1f} MB/s speedup {:>6.2f}".format(
+        result["name"],
+        result["rows_per_sec"],
+        result["mb_per_sec"],
+        result["speedup"]
+    ))
+
+
+def parse_args(argv=None):
+    """Parse the command line arguments.
+
+    Args:
+        argv (list): Arguments, default is `sys.argv`
+    Returns:
+        obj: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--profile", default="tweets", choices=list(PROFILES),
+        help="Corpus profile of the data column"
+    )
+    parser.add_argument(
+        "--docs", type=int, default=2000,
+        help="Documents generated, repeated to fill the rows"
+    )
+    parser.add_argument(
+        "--median-chars", type=int, default=None,
+        help="Median document length, default from the profile"
+    )
+    parser.add_argument(
+        "--rows", type=int, default=100000, help="Rows in the csv file"
+    )
+    parser.add_argument(
+        "--columns", type=int, default=40,
+        help="Columns besides the id and data"
+    )
+    parser.add_argument(
+        "--engines", nargs="+", default=["c", "python", "pyarrow"],
+        choices=["c", "python", "pyarrow"], help="Parser engines"
+    )
+    parser.add_argument(
+        "--block-sizes", nargs="+", type=int, default=[2 ** 20, 2 ** 24],
+        help="Bytes parsed at a time"
+    )
+    parser.add_argument(
+        "--memory-map", action="store_true",
+        help="Also run the loader with the file mapped into memory"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=1000,
+        help="Batch size of the data loader and the references"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs of each setting"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", default="benchmark_csv.json",
+        help="Path of the JSON results file"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    write_results(args.output, "csv", args, run(args))
+    print("Results written to {}".format(args.output))
@@ -0,0 +1,262 @@
+"""Scaling benchmark of `process_data` and `multiprocess_data`.
+
+A representative pipeline runs on a generated corpus with `process_data` and
+with `multiprocess_data` at 1, 2, 4 ... N workers, for each batch size. For
+every run the results file records:
+
+    * `docs_per_sec` - throughput of the whole run
+    * `speedup` and `efficiency` - throughput compared to `process_data` with
+      the same batch size, efficiency is the speedup divided by the workers
+    * `first_batch_seconds` - time until the first batch or item is yielded
+    * `parent_cpu` - CPU time of the parent process divided by the wall time.
+      A value close to 1.0 means the parent is saturated, loading and
+      sending the data is the bottleneck and more workers will not help.
+
+The worker pool is started before the timed runs, so the start up of the
+workers is not counted.
+
+Example:
+    .. code-block::
+
+        python benchmarks/bench_scaling.py --profile html --size 500 \\
+            --batch-sizes 100 1000 --max-workers 16
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from common import write_results
+from corpora import generate, PROFILES
+from data_preprocessing import DataPreprocess
+from data_preprocessing.utils.config_template import ConfigTemplates
+
+LOG_LEVEL = "ERROR"
+
+
+def pipeline_config(batch_size):
+    """Config of the representative pipeline.
+
+    Args:
+        batch_size (int): Batch size of the data loader
+    Returns:
+        dict: Config
+    """
+    return {
+        "data_loader": ConfigTemplates.data_loader_list_loader(
+            batch_size=batch_size,
+            log_level=LOG_LEVEL
+        ),
+        "steps": [
+            ConfigTemplates.normalize_text_remove_html(log_level=LOG_LEVEL),
+            ConfigTemplates.normalize_text_remove_urls(log_level=LOG_LEVEL),
+            ConfigTemplates.normalize_text_lowercase(log_level=LOG_LEVEL),
+            ConfigTemplates.normalize_text_expand_contractions(
+                log_level=LOG_LEVEL
+            ),
+            ConfigTemplates.normalize_text_remove_punctuation(
+                log_level=LOG_LEVEL
+            ),
+            ConfigTemplates.normalize_text_remove_digits(log_level=LOG_LEVEL),
+            ConfigTemplates.normalize_text_remove_stopwords(
+                log_level=LOG_LEVEL
+            ),
+            ConfigTemplates.normalize_text_remove_whitespace(
+                log_level=LOG_LEVEL
+            )
+        ]
+    }
+
+
+def worker_counts(max_workers):
+    """Get the worker counts 1, 2, 4 ... up to and including max_workers.
+
+    Args:
+        max_workers (int): Largest number of workers
+    Returns:
+        list: Worker counts
+    """
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def measure(results_iter):
+    """Consume a generator of results and time it.
+
+    Args:
+        results_iter (obj): Generator from `process_data` or
+            `multiprocess_data`
+    Returns:
+        dict: Wall time, time to the first result and parent cpu time
+    """
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    first = None
+    for _ in results_iter:
+        if first is None:
+            first = time.perf_counter() - start
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "first_batch_seconds": first or seconds,
+        "parent_cpu": (time.process_time() - cpu_start) / seconds
+    }
+
+
+def median_run(func, repeat):
+    """Run a measurement `repeat` times and keep the median run.
+
+    Args:
+        func (obj): Function returning the measurement of one run
+        repeat (int): Number of runs
+    Returns:
+        dict: Measurement of the median run by wall time
+    """
+    runs = sorted((func() for _ in range(repeat)), key=lambda x: x["seconds"])
+    median = runs[(len(runs) - 1) // 2]
+    median["min_seconds"] = runs[0]["seconds"]
+    median["stdev_seconds"] = (
+        statistics.stdev(run["seconds"] for run in runs)
+        if len(runs) > 1 else 0.0
+    )
+    return median
+
+
+def run(args):
+    """Run the benchmark.
+
+    Args:
+        args (obj): Parsed arguments
+    Returns:
+        list: Results
+    """
+    docs = generate(
+        args.profile,
+        args.size,
+        seed=args.seed,
+        median_chars=args.median_chars
+    )
+    results = []
+    for batch_size in args.batch_sizes:
+        process = DataPreprocess(pipeline_config(batch_size), LOG_LEVEL)
+        serial = median_run(
+            lambda: measure(process.process_data(docs)),
+            args.repeat
+        )
+        serial.update({
+            "method": "process_data",
+            "batch_size": batch_size,
+            "workers": 0,
+            "docs_per_sec": len(docs) / serial["seconds"],
+            "speedup": 1.0,
+            "efficiency": 1.0
+        })
+        results.append(serial)
+        _print(serial)
+
+        for workers in worker_counts(args.max_workers):
+            # Start the pool before timing
+            for _ in process.multiprocess_data(docs[:workers], workers):
+                pass
+            result = median_run(
+                lambda: measure(process.multiprocess_data(
+                    docs,
+                    workers=workers,
+                    ordered=args.ordered,
+                    transport=args.transport,
+                    partitioned=args.partitioned
+                )),
+                args.repeat
+            )
+            speedup = serial["seconds"] / result["seconds"]
+            result.update({
+                "method": "multiprocess_data",
+                "batch_size": batch_size,
+                "workers": workers,
+                "docs_per_sec": len(docs) / result["seconds"],
+                "speedup": speedup,
+                "efficiency": speedup / workers
+            })
+            results.append(result)
+            _print(result)
+        process.disconnect()
+    return results
+
+
+def _print(result):
+    """Print one result."""
+    print("{:<18} batch {:>6} workers {:>3} {:>10.1f} docs/s "
+          "speedup {:>5.2f} eff {:>5.2f} first {:>7.3f}s parent cpu "
+          "{:>4.0%}".format(
+              result["method"],
+              result["batch_size"],
+              result["workers"],
+              result["docs_per_sec"],
+              result["speedup"],
+              result["efficiency"],
+              result["first_batch_seconds"],
+              result["parent_cpu"]
+          ))
+
+
+def parse_args(argv=None):
+    """Parse the command line arguments.
+
+    Args:
+        argv (list): Arguments, default is `sys.argv`
+    Returns:
+        obj: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--profile", default="mixed", choices=list(PROFILES),
+        help="Corpus profile to generate"
+    )
+    parser.add_argument(
+        "--size", type=int, default=2000, help="Documents in the corpus"
+    )
+    parser.add_argument(
+        "--median-chars", type=int, default=None,
+        help="Median document length, default from the profile"
+    )
+    parser.add_argument(
+        "--batch-sizes", nargs="+", type=int, default=[100, 1000],
+        help="Batch sizes of the data loader"
+    )
+    parser.add_argument(
+        "--max-workers", type=int, default=os.cpu_count(),
+        help="Largest number of workers"
+    )
+    parser.add_argument(
+        "--ordered", action="store_true",
+        help="Yield the items of multiprocess_data in order"
+    )
+    parser.add_argument(
+        "--transport", default="queue", choices=["queue", "shared_memory"],
+        help="Transport of multiprocess_data"
+    )
+    parser.add_argument(
+        "--partitioned", action="store_true",
+        help="Load the data in the workers of multiprocess_data"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs of each setting"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", default="benchmark_scaling.json",
+        help="Path of the JSON results file"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    write_results(args.output, "scaling", args, run(args))
+    print("Results written to {}".format(args.output))
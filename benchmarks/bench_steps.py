@@ -0,0 +1,264 @@
+"""Micro benchmarks of each step on synthetic corpora.
+
+Every `normalize_text` step, tokenizer and data loader is run on the
+generated corpora of `corpora.py`. For each step and profile the results
+file records the documents and characters per second of the median run and
+the peak memory of one run measured with tracemalloc. Steps that can not be
+loaded, for example when a model or corpus is not installed, are recorded
+with the error and skipped.
+
+Example:
+    .. code-block::
+
+        python benchmarks/bench_steps.py --size 2000 --profiles tweets html
+        python benchmarks/bench_steps.py --only lowercase remove_html \\
+            --median-chars 200000 --size 100 --output results/html.json
+"""
+
+import argparse
+import csv
+import os
+import statistics
+import tempfile
+
+from common import timed, peak_memory, write_results
+from corpora import generate, PROFILES
+from data_preprocessing.steps import _fetch
+from data_preprocessing.utils.config_template import ConfigTemplates
+
+NORMALIZE_TEXT = {
+    "lowercase": ConfigTemplates.normalize_text_lowercase,
+    "remove_digits": ConfigTemplates.normalize_text_remove_digits,
+    "remove_punctuation": ConfigTemplates.normalize_text_remove_punctuation,
+    "remove_whitespace": ConfigTemplates.normalize_text_remove_whitespace,
+    "remove_stopwords": ConfigTemplates.normalize_text_remove_stopwords,
+    "remove_html": ConfigTemplates.normalize_text_remove_html,
+    "remove_urls": ConfigTemplates.normalize_text_remove_urls,
+    "expand_contractions": ConfigTemplates.normalize_text_expand_contractions,
+    "porter_stemmer": ConfigTemplates.normalize_text_porter_stemmer,
+    "snowball_stemmer": ConfigTemplates.normalize_text_snowball_stemmer,
+    "lemmatizer": ConfigTemplates.normalize_text_lemmatizer
+}
+TOKENIZERS = {
+    "spaces": ConfigTemplates.tokenizer_spaces,
+    "nltk_regex": ConfigTemplates.tokenizer_nltk_regex,
+    "nltk_word_tokenize": ConfigTemplates.tokenizer_nltk_word,
+    "spacy_word_tokenize": ConfigTemplates.tokenizer_spacy_word_tokenize
+}
+DATA_LOADERS = ["list", "single_item", "csv"]
+LOG_LEVEL = "ERROR"
+
+
+def build_step(kind, step_type, batch_size, file_path=None):
+    """Build and warm up a step.
+
+    Args:
+        kind (str): `normalize_text`, `tokenizer` or `data_loader`
+        step_type (str): Type of the step
+        batch_size (int): Batch size of the data loaders
+        file_path (str): CSV file of the csv data loader
+    Returns:
+        obj: Step
+    """
+    if kind == "normalize_text":
+        config = NORMALIZE_TEXT[step_type](log_level=LOG_LEVEL)
+        config["tokenizer"] = _fetch(
+            ConfigTemplates.tokenizer_nltk_regex(log_level=LOG_LEVEL)
+        )
+    elif kind == "tokenizer":
+        config = TOKENIZERS[step_type](log_level=LOG_LEVEL)
+    else:
+        loaders = {
+            "list": ConfigTemplates.data_loader_list_loader,
+            "single_item": ConfigTemplates.data_loader_single_item_loader,
+            "csv": ConfigTemplates.data_loader_csv_loader
+        }
+        config = loaders[step_type](
+            log_level=LOG_LEVEL,
+            batch_size=batch_size,
+            file_path=file_path,
+            columns={"id": "id", "data": "text"}
+        )
+        config["name"] = "data_loader"
+    step = _fetch(config)
+    step.warm_up()
+    return step
+
+
+def step_runner(kind, step, docs, batch_size):
+    """Get a function that sets up one run of a step.
+
+    Args:
+        kind (str): `normalize_text`, `tokenizer` or `data_loader`
+        step (obj): Step
+        docs (list): Documents
+        batch_size (int): Number of items passed to `process_batch`
+    Returns:
+        obj: Function that returns the function to time
+    """
+    def setup():
+        if kind == "data_loader":
+            step_type = step._config["type"]
+            if step_type == "single_item":
+                return lambda: [step.process(doc) for doc in docs]
+            if step_type == "csv":
+                return lambda: list(step.process())
+            return lambda: list(step.process(docs))
+
+        items = [
+            {"id": str(i), "data": doc, "tags": {}}
+            for i, doc in enumerate(docs)
+        ]
+        batches = [
+            items[i:i + batch_size] for i in range(0, len(items), batch_size)
+        ]
+
+        def run():
+            for batch in batches:
+                step.process_batch(batch)
+        return run
+    return setup
+
+
+def write_csv(docs):
+    """Write the documents to a temporary CSV file for the csv loader.
+
+    Args:
+        docs (list): Documents
+    Returns:
+        str: Path of the file
+    """
+    handle, path = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(handle, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "text"])
+        for i, doc in enumerate(docs):
+            writer.writerow([i, doc])
+    return path
+
+
+def selected_steps(only):
+    """List the steps to benchmark.
+
+    Args:
+        only (list): Step types to run, all the steps when empty
+    Returns:
+        list: Tuples of the kind and type of each step
+    """
+    steps = [("normalize_text", name) for name in NORMALIZE_TEXT]
+    steps += [("tokenizer", name) for name in TOKENIZERS]
+    steps += [("data_loader", name) for name in DATA_LOADERS]
+    if only:
+        steps = [step for step in steps if step[1] in only]
+    return steps
+
+
+def run(args):
+    """Run the benchmark.
+
+    Args:
+        args (obj): Parsed arguments
+    Returns:
+        list: Results
+    """
+    results = []
+    for profile in args.profiles:
+        docs = generate(
+            profile,
+            args.size,
+            seed=args.seed,
+            median_chars=args.median_chars,
+            sigma=args.sigma
+        )
+        chars = sum(len(doc) for doc in docs)
+        file_path = write_csv(docs)
+        try:
+            for kind, step_type in selected_steps(args.only):
+                result = {
+                    "kind": kind,
+                    "type": step_type,
+                    "profile": profile,
+                    "docs": len(docs),
+                    "chars": chars
+                }
+                try:
+                    step = build_step(
+                        kind, step_type, args.batch_size, file_path
+                    )
+                except Exception as e:
+                    result["error"] = str(e)
+                    results.append(result)
+                    print("{:<14} {:<22} skipped - {}".format(
+                        profile, step_type, type(e).__name__
+                    ))
+                    continue
+                runner = step_runner(kind, step, docs, args.batch_size)
+                times = timed(runner, args.repeat)
+                seconds = statistics.median(times)
+                result.update({
+                    "seconds": seconds,
+                    "min_seconds": min(times),
+                    "ops_per_sec": len(docs) / seconds,
+                    "chars_per_sec": chars / seconds,
+                    "peak_memory": peak_memory(runner)
+                })
+                results.append(result)
+                print("{:<14} {:<22} {:>12.1f} docs/s {:>14.0f} chars/s "
+                      "{:>10.1f} MiB peak".format(
+                          profile,
+                          step_type,
+                          result["ops_per_sec"],
+                          result["chars_per_sec"],
+                          result["peak_memory"] / 2 ** 20
+                      ))
+        finally:
+            os.remove(file_path)
+    return results
+
+
+def parse_args(argv=None):
+    """Parse the command line arguments.
+
+    Args:
+        argv (list): Arguments, default is `sys.argv`
+    Returns:
+        obj: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--profiles", nargs="+", default=list(PROFILES),
+        choices=list(PROFILES), help="Corpus profiles to generate"
+    )
+    parser.add_argument(
+        "--size", type=int, default=500, help="Documents in each corpus"
+    )
+    parser.add_argument(
+        "--median-chars", type=int, default=None,
+        help="Median document length, default from the profile"
+    )
+    parser.add_argument(
+        "--sigma", type=float, default=None,
+        help="Spread of the log-normal document lengths"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=1000,
+        help="Items passed to process_batch at a time"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs of each step"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--only", nargs="+", default=None, help="Step types to run"
+    )
+    parser.add_argument(
+        "--output", default="benchmark_steps.json",
+        help="Path of the JSON results file"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    write_results(args.output, "steps", args, run(args))
+    print("Results written to {}".format(args.output))
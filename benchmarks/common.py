@@ -0,0 +1,94 @@
+"""Helpers shared by the benchmarks."""
+
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    # Run the benchmarks from a checkout without installing the package
+    sys.path.insert(0, ROOT)
+
+
+def environment():
+    """Describe the machine the benchmark runs on.
+
+    Returns:
+        dict: Python version, platform and number of cpus
+    """
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "date": datetime.datetime.now().isoformat()
+    }
+
+
+def timed(func, repeat):
+    """Time a function.
+
+    The function is called with no arguments `repeat` times. The setup for
+    each run, like copying the items, should be done by `func` before it
+    returns a function to time.
+
+    Args:
+        func (obj): Function that returns the function to time
+        repeat (int): Number of runs
+    Returns:
+        list: Seconds taken by each run
+    """
+    times = []
+    for _ in range(repeat):
+        run = func()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def peak_memory(func):
+    """Measure the peak memory allocated by a function with tracemalloc.
+
+    Args:
+        func (obj): Function that returns the function to measure
+    Returns:
+        int: Peak of the memory allocated while running, in bytes
+    """
+    run = func()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def write_results(path, benchmark, args, results):
+    """Write the results of a benchmark to a JSON file.
+
+    Args:
+        path (str): Path of the results file
+        benchmark (str): Name of the benchmark
+        args (obj): Arguments of the benchmark run
+        results (list): Results of the benchmark
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "benchmark": benchmark,
+                "environment": environment(),
+                "args": vars(args),
+                "results": results
+            },
+            f,
+            indent=2
+        )
@@ -0,0 +1,155 @@
+"""Synthetic corpora for the benchmarks.
+
+The corpora are generated from a fixed vocabulary with a seeded random
+generator, so every run of a benchmark works on the same documents. Document
+lengths follow a log-normal distribution around the median length of the
+profile.
+
+Profiles:
+    * `tweets` - short texts with mentions, hashtags, urls and contractions
+    * `html` - long html pages with tags, links and entities
+    * `mixed` - a mix of tweets, html pages and plain paragraphs
+
+Example:
+    .. code-block::
+
+        from corpora import generate
+
+        docs = generate("tweets", 10000, seed=1)
+        docs = generate("html", 100, median_chars=200000)
+"""
+
+import math
+import random
+
+WORDS = [
+    "the", "a", "and", "of", "to", "in", "is", "it", "that", "for", "was",
+    "on", "are", "with", "they", "be", "at", "one", "have", "this", "from",
+    "data", "model", "running", "cities", "dogs", "better", "studies",
+    "process", "pipeline", "cleaning", "language", "natural", "learning",
+    "Machine", "Python", "TEXT", "Normalize", "quickly", "jumped", "lazy",
+    "foxes", "weather", "today", "tomorrow", "meeting", "project", "report",
+    "café", "naïve", "résumé", "straße", "οδος", "данные",
+    "数据"
+]
+CONTRACTIONS = ["I'm", "can't", "won't", "we'll", "they're", "it's", "I'd've"]
+PUNCTUATION = [".", ",", "!", "?", ";", ":", "...", "-"]
+TAGS = ["p", "div", "span", "li", "h2", "td", "em", "strong"]
+ENTITIES = ["&amp;", "&lt;", "&gt;", "&nbsp;", "&quot;"]
+
+PROFILES = {
+    "tweets": {"median_chars": 120, "sigma": 0.5},
+    "html": {"median_chars": 20000, "sigma": 0.8},
+    "mixed": {"median_chars": 2000, "sigma": 1.5}
+}
+
+
+def generate(profile, size, seed=0, median_chars=None, sigma=None):
+    """Generate a corpus of documents.
+
+    Args:
+        profile (str): Name of the profile, `tweets`, `html` or `mixed`
+        size (int): Number of documents
+        seed (int): Seed of the random generator
+        median_chars (int): Median document length, default from the profile
+        sigma (float): Spread of the document lengths, default from the
+            profile
+    Returns:
+        list: Documents as strings
+    """
+    if profile not in PROFILES:
+        raise KeyError("Unknown profile {}, use one of {}".format(
+            profile,
+            ", ".join(PROFILES)
+        ))
+    if median_chars is None:
+        median_chars = PROFILES[profile]["median_chars"]
+    if sigma is None:
+        sigma = PROFILES[profile]["sigma"]
+    rand = random.Random(seed)
+    docs = []
+    for _ in range(size):
+        length = max(
+            1, int(rand.lognormvariate(math.log(median_chars), sigma))
+        )
+        kind = profile
+        if profile == "mixed":
+            kind = rand.choice(["tweets", "html", "text"])
+        if kind == "tweets":
+            docs.append(_tweet(rand, length))
+        elif kind == "html":
+            docs.append(_html(rand, length))
+        else:
+            docs.append(_text(rand, length))
+    return docs
+
+
+def _word(rand):
+    """Get a random word, with some digits and contractions."""
+    value = rand.random()
+    if value < 0.05:
+        return rand.choice(CONTRACTIONS)
+    if value < 0.08:
+        return str(rand.randint(0, 100000))
+    return rand.choice(WORDS)
+
+
+def _text(rand, length):
+    """Plain text with sentences of about `length` characters."""
+    parts = []
+    size = 0
+    while size < length:
+        words = [_word(rand) for _ in range(rand.randint(4, 18))]
+        words[0] = words[0].capitalize()
+        sentence = " ".join(words) + rand.choice(PUNCTUATION)
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(parts)
+
+
+def _tweet(rand, length):
+    """Short text with mentions, hashtags and urls."""
+    words = []
+    size = 0
+    while size < length:
+        value = rand.random()
+        if value < 0.06:
+            word = "@" + rand.choice(WORDS)
+        elif value < 0.12:
+            word = "#" + rand.choice(WORDS)
+        elif value < 0.15:
+            word = "https://t.co/{:x}".format(rand.getrandbits(32))
+        else:
+            word = _word(rand)
+            if rand.random() < 0.1:
+                word += rand.choice(PUNCTUATION)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+def _html(rand, length):
+    """Html page with tags, links and entities."""
+    parts = ["<html><head><title>{}</title></head><body>".format(
+        _text(rand, 40)
+    )]
+    size = len(parts[0])
+    while size < length:
+        tag = rand.choice(TAGS)
+        text = _text(rand, rand.randint(40, 400))
+        if rand.random() < 0.2:
+            text += ' <a href="https://example.com/{}">{}</a>'.format(
+                rand.getrandbits(24),
+                rand.choice(WORDS)
+            )
+        if rand.random() < 0.2:
+            text += " " + rand.choice(ENTITIES)
+        part = '<{t} class="c{c}">{x}</{t}>\n'.format(
+            t=tag,
+            c=rand.randint(0, 9),
+            x=text
+        )
+        parts.append(part)
+        size += len(part)
+    parts.append("</body></html>")
+    return "".join(parts)
@@ -3,7 +3,10 @@
 The DataPreprocess class is used to process your data through a list of steps.
 You must pass in a config object that contains a valid data loader and a list
 of processing steps. Each record is converted into our item mode, which is a
-dictionary with an unique id and the raw data.
+dictionary with an unique id and the raw data. Items are pushed through the
+steps in batches, the size of the batches is defined by the data loader
+`batch_size`. Adjacent token steps pass the tokens between them and the text
+is only joined once at the end of the run of token steps.
 
 Example:
     .. code-block::
@@ -26,23 +29,61 @@ Example:
         print(data)
 """
 
+import asyncio
+import collections
+import itertools
 import json
 import csv
 import logging
 import queue
+import threading
 import time
-import multiprocessing as mp
+import uuid
 from data_preprocessing.utils.config import validate_config
 from data_preprocessing.utils.logger import setup_logging
+from concurrent.futures import ThreadPoolExecutor
+from data_preprocessing.utils.pool import WorkerPool, ExecutorChannel
+from data_preprocessing.utils.transport import (
+    SharedChunk, SharedMemoryChannel, read_chunk, write_results
+)
+from data_preprocessing.utils.pool import (
+    _PIPELINES, _run_chunk, Partition, worker_error
+)
+from data_preprocessing.utils.cache import (
+    ResultCache, CacheChannel, fingerprint
+)
+from data_preprocessing.utils.dedupe import create_filter, BloomFilter
+from data_preprocessing.utils.checkpoint import Checkpoint, DEFAULT_INTERVAL
+from data_preprocessing.utils.stats import (
+    PipelineStats, ErrorCounter, data_size
+)
 from data_preprocessing.steps import _fetch
+from data_preprocessing.steps import sinks
+from data_preprocessing.steps.base import link_token_steps
+from data_preprocessing.steps.normalize_text.char_map import fuse_char_steps
 
 
 class DataPreprocess():
     """Load data and process through pipeline.
 
+    The worker processes started by `multiprocess_data` are kept running and
+    reused by later calls. They are stopped by `disconnect`, or when the
+    object is used as a context manager.
+
+    Models and corpora that steps load lazily are loaded when the object is
+    created. The workers are forked afterwards, so they share the loaded
+    models with the parent process instead of loading their own copy.
+
     Args:
         config (obj): Config is a json object
         log_level (str): Set the log level, default is INFO
+
+    Example:
+        .. code-block::
+
+            with DataPreprocess(config) as process:
+                for item in process.multiprocess_data(data, workers=4):
+                    print(item)
     """
 
     def __init__(self, config, log_level="INFO"):
@@ -60,12 +101,67 @@ class DataPreprocess():
             step["tokenizer"] = tokenizer
 
         self._data_loader = _fetch(config["data_loader"])
-        self._pipeline_steps = [_fetch(i) for i in config.get("steps")]
+        self._pipeline_steps = self._build_steps(config.get("steps"))
         self._batch_size = config["data_loader"]["batch_size"]
 
+        # Time and counters of each step, returned by disconnect
+        self._stats = PipelineStats([
+            step._stats_name() for step in self._pipeline_steps
+        ])
+        self._count_errors(self._pipeline_steps)
+
+        # Steps that are not thread safe get a copy for each thread
+        self._tokenizer = tokenizer
+        self._thread_safe = all(
+            step._thread_safe() for step in self._pipeline_steps + [tokenizer]
+        )
+        self._local = threading.local()
+
+        # Load models and corpora now, so the workers share them
+        self._warm_up()
+
+        # Optional cache of the processed items
+        self._cache = None
+        if self._config.get("cache"):
+            self._cache = ResultCache(
+                fingerprint(self._config),
+                **self._config["cache"]
+            )
+
+        # Optional sink the processed items are written to
+        self._sink = None
+        if self._config.get("sink"):
+            self._sink = sinks._fetch(self._config["sink"])
+
+        # Optional checkpoints of the data loader position
+        self._checkpoint = None
+        loader_config = self._config["data_loader"]
+        if loader_config.get("checkpoint_path"):
+            self._checkpoint = Checkpoint(
+                loader_config["checkpoint_path"],
+                loader_config.get("checkpoint_interval", DEFAULT_INTERVAL)
+            )
+            if loader_config.get("resume"):
+                self._resume()
+
+        # Worker pool for multiprocess_data, started on first use
+        self._pool = None
+        # Thread pool for threaded_process_data, kept between calls so the
+        # steps built for each thread are reused
+        self._thread_pool = None
+        self._threads = None
+        self._pipeline_id = uuid.uuid4().hex
+        _PIPELINES[self._pipeline_id] = self
+
         # Start time
         self._start_time = time.time()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disconnect()
+
     def process_item(self, data):
         """Method to process single item through the defined pipeline.
 
@@ -94,21 +190,29 @@ class DataPreprocess():
                 data = "Sentences To Clean."
                 data = process.process_item(data)
         """
-        self._items_processed = 0
         data = self._data_loader.process(data)
-        data = self._process_steps(data)
-        self._items_processed += 1
+        data = self._cached_batch([data])[0]
+        self._write([data])
         return data
 
-    def process_data(self, data=None):
+    def process_data(self, data=None, shard_index=0, num_shards=1):
         """Generator to process data through the defined pipeline.
 
         The Data arg is only used when loading in memory data like a list. The
         processed data will be streamed in batches. The size is defined in the
         data loader configuration.
 
+        With `num_shards` set, only the part of the data in the shard
+        `shard_index` is loaded. Every machine runs the same config with its
+        own shard index, the shards do not overlap and together hold all the
+        data. The csv, text and jsonl data loaders read a byte range of the
+        file, other data loaders and JSON arrays keep the items with a stable
+        hash of their id.
+
         Args:
             data (obj): Dictionary with items to process
+            shard_index (int): Index of the shard to process, from 0
+            num_shards (int): Number of shards the data is split into
         Yields:
             obj: List of processed items
 
@@ -133,44 +237,81 @@ class DataPreprocess():
                 for batch in process.process_data(data):
                     processed_data.update(batch)
         """
-        self._items_processed = 0
         if self._config["data_loader"]["type"] == "single_item":
             self._log.warn(
                 "Please use the method `process_item`"
                 "with the data loader single_item"
             )
             raise Exception("Invalid Method")
+        shard = self._shard(shard_index, num_shards)
         if data:
             self._log.info("Processing {} items".format(len(data)))
         batch = []
-        for item in self._data_loader.process(data):
-            self._items_processed += 1
-            self._log.debug("Processing item {} - {}".format(
-                item["id"],
-                item["data"]
-            ))
-            item = self._process_steps(item)
-            self._log.debug("Step completed on item {} - {}".format(
-                item["id"],
-                item["data"]
-            ))
+        for item in self._load_items(data, shard):
             batch.append(item)
             if len(batch) >= self._batch_size:
-                yield batch
+                position = self._position()
+                yield self._write(self._cached_batch(batch))
+                self._commit(position)
                 batch = []
         if batch:
-            yield batch
+            yield self._write(self._cached_batch(batch))
+        self._commit(self._position(), final=True)
 
-    def multiprocess_data(self, data=None, workers=1):
+    def multiprocess_data(self, data=None, workers=1, chunk_size=None,
+                          ordered=False, executor=None, max_in_flight=None,
+                          transport="queue", shard_index=0, num_shards=1,
+                          partitioned=False):
         """Generator that uses multiprocessing to process data.
 
         The Data arg is only used when loading in memory data like a list. The
         processed data will be streamed in batches. The size is defined in the
-        data loader configuration.
+        data loader configuration. Items are sent to and returned from the
+        workers in chunks, every worker processes a chunk with
+        `process_batch`. The chunk size defaults to splitting each batch into
+        one chunk per worker.
+
+        The data loader keeps loading while the workers process, up to
+        `max_in_flight` chunks are sent to the workers at a time (default is
+        two chunks per worker). Items are yielded as soon as a worker returns
+        them.
+
+        By default items are yielded in the order the workers finish them.
+        With `ordered` set to True the items are yielded in the same order as
+        `process_data`. Finished chunks wait in a reorder buffer until the
+        chunks before them are done, the buffer never holds more than
+        `max_in_flight` chunks.
+
+        The worker processes are started on the first call and reused until
+        `disconnect` is called. If the number of workers changes, the pool is
+        restarted. Instead of the worker processes you can pass a
+        `concurrent.futures` executor. A `ProcessPoolExecutor` must start its
+        workers with fork after this object is created.
+
+        With `transport` set to `shared_memory` the texts of each chunk are
+        sent to the worker processes in a shared memory block instead of the
+        queue, see `data_preprocessing.utils.transport`. This saves copying
+        large documents, it is not used with an executor.
+
+        With `partitioned` set to True the parent does not run the data
+        loader. The data is split into partitions and each worker loads the
+        items of a partition itself, so parsing and building the items runs
+        in parallel. The csv, text and jsonl data loaders split the file into
+        byte ranges, the list data loader sends slices of `chunk_size`
+        records. The duplicate filter, the cache and checkpoints need the
+        items in the parent and are not used with partitions.
 
         Args:
             data (obj): Dictionary with items to process
             workers (int): Number of workers for processing
+            chunk_size (int): Number of items sent to a worker at a time
+            ordered (bool): Yield the items in the input order
+            executor (obj): Optional `concurrent.futures` executor
+            max_in_flight (int): Maximum number of chunks being processed
+            transport (str): `queue` or `shared_memory`
+            shard_index (int): Index of the shard to process, from 0
+            num_shards (int): Number of shards the data is split into
+            partitioned (bool): Load the data in the workers
         Yields:
             dict: Process Item
 
@@ -195,53 +336,413 @@ class DataPreprocess():
                 for batch in process.multiprocess_data(data, workers=4):
                     processed_data.update(batch)
         """
-        self._items_processed = 0
         if self._config["data_loader"]["type"] == "single_item":
             self._log.warn(
                 "Please use the method `process_item`"
                 "with the data loader single_item"
             )
             raise Exception("Invalid Method")
-        processes = []
-        self.queue = mp.JoinableQueue()
-        self.kafka_queue = mp.Queue()
-
-        for i in range(workers):
-            worker_process = mp.Process(
-                target=self._worker,
-                args=(self.queue, self.kafka_queue),
-                daemon=True,
-                name='data_preprocess_worker_{}'.format(i)
-            )
-            worker_process.start()
-            processes.append(worker_process)
-        self._log.info("Setting up workers - {}".format(
-                ", ".join([x.name for x in processes])
-            )
-        )
+        if chunk_size is None:
+            chunk_size = -(-self._batch_size // workers)
+        elif not isinstance(chunk_size, int) or chunk_size < 1:
+            raise TypeError("The chunk_size must be a positive int!")
+        if max_in_flight is None:
+            max_in_flight = 2 * getattr(executor, "_max_workers", workers)
+        elif not isinstance(max_in_flight, int) or max_in_flight < 1:
+            raise TypeError("The max_in_flight must be a positive int!")
+        if transport not in ["queue", "shared_memory"]:
+            raise ValueError("The transport must be queue or shared_memory!")
+        if executor is not None and transport != "queue":
+            raise ValueError("The shared_memory transport needs the workers!")
+        if partitioned:
+            self._check_partitioned(transport)
+        if executor is None:
+            self._start_pool(workers)
+            channel = self._pool
+            if transport == "shared_memory":
+                channel = SharedMemoryChannel(self._pool)
+        else:
+            channel = ExecutorChannel(executor, self._pipeline_id)
+        if self._cache and not partitioned:
+            channel = CacheChannel(channel, self._cache)
         if data:
             self._log.info("Processing {} items".format(len(data)))
 
         # self.kafka_queue.qsize() causes issues on a mac
-        counter = 0
-        for item in self._data_loader.process(data):
-            self._items_processed += 1
-            counter += 1
-            self.queue.put(item)
-            if counter == self._batch_size:
-                for item in range(0, counter):
-                    yield self.kafka_queue.get()
-                counter = 0
-
-        self.queue.join()
-        if counter:
-            for item in range(0, counter):
-                yield self.kafka_queue.get()
+        shard = self._shard(shard_index, num_shards)
+        if partitioned:
+            chunks = self._data_loader.partitions(
+                data,
+                getattr(executor, "_max_workers", workers),
+                chunk_size,
+                shard
+            )
+        else:
+            chunks = self._chunk_items(
+                self._load_items(data, shard),
+                chunk_size
+            )
+        try:
+            for item in self._stream_chunks(
+                    channel, chunks, ordered, max_in_flight):
+                yield item
+        finally:
+            if hasattr(channel, "close"):
+                channel.close()
+
+    def threaded_process_data(self, data=None, threads=4, chunk_size=None,
+                              ordered=False, max_in_flight=None,
+                              shard_index=0, num_shards=1, partitioned=False):
+        """Generator that uses a thread pool to process data.
+
+        Items are not pickled, the threads work on the items directly. This
+        is useful for steps that release the GIL and for free threaded
+        builds of python. Steps that are not thread safe, like the spacy
+        tokenizer, are built again for each thread.
+
+        The threads are started on the first call and kept until
+        `disconnect`, later calls with the same number of threads reuse
+        them and the steps they built.
+
+        The arguments are the same as `multiprocess_data`.
+
+        Args:
+            data (obj): Dictionary with items to process
+            threads (int): Number of threads for processing
+            chunk_size (int): Number of items sent to a thread at a time
+            ordered (bool): Yield the items in the input order
+            max_in_flight (int): Maximum number of chunks being processed
+            shard_index (int): Index of the shard to process, from 0
+            num_shards (int): Number of shards the data is split into
+            partitioned (bool): Load the data in the threads
+        Yields:
+            dict: Process Item
+
+        Example:
+            .. code-block::
+
+                process = DataPreprocess(config)
+                data = ["List Of Sentences To Clean"]
+                for item in process.threaded_process_data(data, threads=4):
+                    print(item)
+        """
+        self._start_threads(threads)
+        for item in self.multiprocess_data(
+                data,
+                workers=threads,
+                chunk_size=chunk_size,
+                ordered=ordered,
+                executor=self._thread_pool,
+                max_in_flight=max_in_flight,
+                shard_index=shard_index,
+                num_shards=num_shards,
+                partitioned=partitioned):
+            yield item
+
+    async def aprocess_data(self, data=None, executor=None, max_pending=2,
+                            shard_index=0, num_shards=1):
+        """Async generator to process data through the defined pipeline.
+
+        The processed data is streamed in batches like `process_data`. The
+        steps run on the executor so the event loop is not blocked, the
+        default is the loop's default thread pool executor. The data loader
+        is also read in the default executor, so loading files does not stall
+        the event loop.
+
+        The data can be an async iterable of records when using the list data
+        loader. At most `max_pending` batches are processed ahead of the
+        consumer, when the consumer is slow no more data is loaded.
+
+        Args:
+            data (obj): List or async iterable of items to process
+            executor (obj): Optional `concurrent.futures` executor
+            max_pending (int): Maximum number of batches processed ahead
+            shard_index (int): Index of the shard to process, from 0
+            num_shards (int): Number of shards the data is split into
+        Yields:
+            obj: List of processed items
+
+        Example:
+            .. code-block::
+
+                async def main():
+                    process = DataPreprocess(config)
+                    async for batch in process.aprocess_data(source):
+                        print(batch)
+        """
+        if self._config["data_loader"]["type"] == "single_item":
+            self._log.warn(
+                "Please use the method `process_item`"
+                "with the data loader single_item"
+            )
+            raise Exception("Invalid Method")
+        if not isinstance(max_pending, int) or max_pending < 1:
+            raise TypeError("The max_pending must be a positive int!")
+        shard = self._shard(shard_index, num_shards)
+        loop = asyncio.get_running_loop()
+        threads = executor is None or isinstance(executor, ThreadPoolExecutor)
+
+        pending = collections.deque()
+        async for batch in self._aload_batches(data, loop, shard):
+            pending.append((
+                self._submit_batch(loop, executor, batch, threads),
+                self._position()
+            ))
+            if len(pending) >= max_pending:
+                future, position = pending.popleft()
+                yield self._write(await future)
+                self._commit(position)
+        while pending:
+            future, position = pending.popleft()
+            yield self._write(await future)
+            self._commit(position)
+        self._commit(self._position(), final=True)
+
+    def _submit_batch(self, loop, executor, batch, threads):
+        """Submit a batch of `aprocess_data` to the executor.
+
+        With the cache set, only the items that are not in the cache are
+        submitted.
+
+        Args:
+            loop (obj): Running event loop
+            executor (obj): `concurrent.futures` executor or None
+            batch (list): Batch of items
+            threads (bool): Use the thread steps of the pipeline
+        Returns:
+            obj: Awaitable of the processed batch
+        """
+        if self._cache is None:
+            return loop.run_in_executor(
+                executor, _run_chunk, self._pipeline_id, batch, threads
+            )
+        indexes, keys, misses = self._cache.lookup(batch)
+        future = None
+        if misses:
+            future = loop.run_in_executor(
+                executor, _run_chunk, self._pipeline_id, misses, threads
+            )
+        return self._amerge_cached(batch, indexes, keys, future)
+
+    async def _amerge_cached(self, batch, indexes, keys, future):
+        """Wait for the items that were not in the cache.
+
+        Args:
+            batch (list): Batch of items
+            indexes (list): Indexes of the submitted items
+            keys (list): Cache keys of the submitted items
+            future (obj): Future of the submitted items or None
+        Returns:
+            list: Processed batch
+        """
+        results = await future if future is not None else []
+        return self._cache.merge(batch, indexes, keys, results)
+
+    async def _aload_batches(self, data, loop, shard=None):
+        """Load batches of items for `aprocess_data`.
+
+        Args:
+            data (obj): List or async iterable of items to process
+            loop (obj): Running event loop
+            shard (tuple): Optional index and number of shards
+        Yields:
+            list: Batch of items
+        """
+        if hasattr(data, "__aiter__"):
+            if self._config["data_loader"]["type"] != "list":
+                raise TypeError(
+                    "Async iterables need the list data loader!"
+                )
+            dedupe = self._dedupe_filter()
+            records = []
+            async for record in data:
+                records.append(record)
+                if len(records) == self._batch_size:
+                    batch = list(self._drop_duplicates(
+                        self._loader_items(records, shard), dedupe
+                    ))
+                    if batch:
+                        yield batch
+                    records = []
+            if records:
+                batch = list(self._drop_duplicates(
+                    self._loader_items(records, shard), dedupe
+                ))
+                if batch:
+                    yield batch
+            return
+
+        items = self._load_items(data, shard)
+        while True:
+            batch = await loop.run_in_executor(
+                None,
+                self._next_batch,
+                items
+            )
+            if not batch:
+                break
+            yield batch
+
+    def _load_items(self, data, shard=None):
+        """Load the items with the data loader and drop duplicates.
+
+        Args:
+            data (obj): Data passed to the data loader
+            shard (tuple): Optional index and number of shards
+        Returns:
+            obj: Iterable of items
+        """
+        return self._drop_duplicates(
+            self._loader_items(data, shard),
+            self._dedupe_filter()
+        )
+
+    def _loader_items(self, data, shard):
+        """Load the items of a shard with the data loader.
+
+        Args:
+            data (obj): Data passed to the data loader
+            shard (tuple): Index and number of shards, or None for all
+        Returns:
+            obj: Iterable of items
+        """
+        if shard is None:
+            return self._data_loader.process(data)
+        return self._data_loader.process(data, shard=shard)
+
+    def _check_partitioned(self, transport):
+        """Check that the data can be loaded in partitions by the workers.
+
+        Args:
+            transport (str): Transport of `multiprocess_data`
+        """
+        if not hasattr(self._data_loader, "partitions"):
+            raise TypeError(
+                "The data loader {} can not load partitions!".format(
+                    self._config["data_loader"]["type"]
+                )
+            )
+        if transport != "queue":
+            raise ValueError("Partitions are sent on the queue transport!")
+        for key in ["cache", "dedupe"]:
+            if self._config.get(key):
+                raise ValueError(
+                    "The {} is not used with partitions!".format(key)
+                )
+        if self._checkpoint:
+            raise ValueError("Checkpoints are not used with partitions!")
+
+    def _load_partition(self, partition):
+        """Load the items of a partition in a worker.
+
+        Args:
+            partition (obj): Partition
+        Returns:
+            list: Items of the partition
+        """
+        if partition.byte_range is not None:
+            return list(self._data_loader.process(
+                partition.data,
+                byte_range=partition.byte_range
+            ))
+        return list(self._loader_items(partition.data, partition.shard))
+
+    def _shard(self, shard_index, num_shards):
+        """Check the shard arguments.
+
+        Args:
+            shard_index (int): Index of the shard, from 0
+            num_shards (int): Number of shards
+        Returns:
+            tuple: Index and number of shards, or None for all the data
+        """
+        if not isinstance(num_shards, int) or num_shards < 1:
+            raise TypeError("The num_shards must be a positive int!")
+        if not isinstance(shard_index, int):
+            raise TypeError("The shard_index must be an int!")
+        if not 0 <= shard_index < num_shards:
+            raise ValueError(
+                "The shard_index must be between 0 and {}!".format(
+                    num_shards - 1
+                )
+            )
+        if num_shards == 1:
+            return None
+        return (shard_index, num_shards)
+
+    def _dedupe_filter(self):
+        """Create the duplicate filter for a run.
+
+        Returns:
+            obj: Filter, or None if dedupe is not set in the config
+        """
+        config = self._config.get("dedupe")
+        if not config:
+            return None
+        dedupe = create_filter(config)
+        if isinstance(dedupe, BloomFilter):
+            self._log.info(
+                "Dedupe bloom filter holds {} items at the error rate".format(
+                    dedupe.capacity
+                )
+            )
+        return dedupe
+
+    def _drop_duplicates(self, items, dedupe):
+        """Drop the items with a key that was already seen in the run.
+
+        Args:
+            items (obj): Iterable of items
+            dedupe (obj): Filter, or None to keep all the items
+        Returns:
+            obj: Iterable of items
+        """
+        if dedupe is None:
+            return items
+        return self._filter_items(items, dedupe)
+
+    def _filter_items(self, items, dedupe):
+        """Generator that drops the duplicates.
+
+        Args:
+            items (obj): Iterable of items
+            dedupe (obj): Filter
+        Yields:
+            dict: Items that were not seen before
+        """
+        seen = dedupe.seen
+        item_key = dedupe.key
+        stats = self._stats
+        for item in items:
+            key = item_key(item)
+            if key and seen(key):
+                stats.duplicates += 1
+                continue
+            yield item
+
+    def _next_batch(self, items):
+        """Read the next batch of items from the data loader.
+
+        Args:
+            items (obj): Iterator of items from the data loader
+        Returns:
+            list: Batch of items, empty when the data loader is done
+        """
+        return list(itertools.islice(items, self._batch_size))
 
     def disconnect(self):
         """Method to get the stats of processing.
 
-        This should be called after the data is processed.
+        This should be called after the data is processed. The worker
+        processes started by `multiprocess_data` are stopped and their stats
+        are added to the stats of the pipeline, the threads started by
+        `threaded_process_data` are stopped. The stats count the items
+        and the time of each step since the object was created, see
+        `data_preprocessing.utils.stats`. Stats of process pool executors
+        are not collected.
+
+        Returns:
+            obj: PipelineStats
 
         Example:
             .. code-block::
@@ -262,17 +763,48 @@ class DataPreprocess():
                 data = ["List Of Sentences To Clean", "another senteNce!"]
                 for batch in process.process_data(data):
                     pass
-                process.disconnect()
+                stats = process.disconnect()
+                print(stats.to_dict())
         """
+        if self._pool:
+            self._merge_stats(self._pool.shutdown())
+            self._pool = None
+        if self._thread_pool:
+            self._thread_pool.shutdown()
+            self._thread_pool = None
         end_time = time.time()
+        self._stats.elapsed = end_time - self._start_time
         self._log.info("Processing took {a} seconds.".format(
-            a=end_time - self._start_time
+            a=self._stats.elapsed
         ))
         self._log.info(
             "{} items were processed.".format(
-                self._items_processed
+                self._stats.items
             )
         )
+        if self._stats.duplicates:
+            self._log.info("{} duplicate items were dropped.".format(
+                self._stats.duplicates
+            ))
+        if self._cache:
+            self._log.info("Cache - {} hits, {} misses".format(
+                self._cache.hits,
+                self._cache.misses
+            ))
+            self._cache.close()
+        if self._sink:
+            self._sink.close()
+            self._sink = None
+        for step in self._stats.steps:
+            self._log.info(
+                "Step {} - {} items in {:.4f} seconds, {} errors".format(
+                    step.name,
+                    step.items,
+                    step.time,
+                    step.errors
+                )
+            )
+        return self._stats
 
     def _process_steps(self, item):
         """Process data through the defined steps in the config.
@@ -282,19 +814,351 @@ class DataPreprocess():
         Returns:
             dict: processed item
         """
-        for step in self._pipeline_steps:
-            if not item.get("data"):
-                self._log.warn("No data not processing item ({})".format(
-                    item["id"]
+        return self._process_batch([item])[0]
+
+    def _build_steps(self, step_configs):
+        """Build the pipeline steps from the step configs.
+
+        Args:
+            step_configs (list): Step configs, each with the tokenizer object
+        Returns:
+            list: Step objects
+        """
+        return link_token_steps(fuse_char_steps(
+            [_fetch(i) for i in step_configs]
+        ))
+
+    def _thread_steps(self):
+        """Get the pipeline steps for the current thread.
+
+        The steps are shared by all the threads if they are thread safe,
+        otherwise each thread builds its own steps and tokenizer.
+
+        Returns:
+            list: Step objects
+        """
+        if self._thread_safe:
+            return self._pipeline_steps
+        steps = getattr(self._local, "steps", None)
+        if steps is None:
+            tokenizer = _fetch(self._config["tokenizer"])
+            steps = self._build_steps([
+                dict(step, tokenizer=tokenizer)
+                for step in self._config["steps"]
+            ])
+            self._count_errors(steps)
+            self._local.steps = steps
+        return steps
+
+    def _warm_up(self):
+        """Load the lazily loaded resources of the steps."""
+        for step in self._pipeline_steps + [self._tokenizer]:
+            try:
+                step.warm_up()
+            except Exception as e:
+                self._log.warning("Could not warm up {} - {}".format(
+                    step._config.get("type"),
+                    e
                 ))
-                return item
-            item = step.process(item)
 
-        return item
+    def _cached_batch(self, items):
+        """Process a batch of items, skipping the items in the cache.
+
+        Args:
+            items (list): Items to process
+        Returns:
+            list: processed items
+        """
+        if self._cache is None:
+            return self._process_batch(items)
+        indexes, keys, misses = self._cache.lookup(items)
+        results = self._process_batch(misses) if misses else []
+        return self._cache.merge(items, indexes, keys, results)
+
+    def _write(self, items):
+        """Write the processed items to the sink.
+
+        Args:
+            items (list): Processed items
+        Returns:
+            list: The items
+        """
+        if self._sink is not None:
+            self._sink.process_batch(items)
+        return items
+
+    def _resume(self):
+        """Start the data loader and the sink from the last checkpoint."""
+        state = self._checkpoint.load()
+        if state is None:
+            self._log.info("No checkpoint found, starting from the beginning")
+            return
+        file_path = self._config["data_loader"]["file_path"]
+        if state["file_path"] != file_path:
+            raise ValueError(
+                "The checkpoint is for the file {a}, not {b}!".format(
+                    a=state["file_path"],
+                    b=file_path
+                )
+            )
+        self._data_loader.restore(state["loader"])
+        if self._sink and state.get("sink"):
+            self._sink.restore(state["sink"])
+        self._log.info("Resuming from the checkpoint {}".format(
+            self._checkpoint.path
+        ))
+
+    def _position(self):
+        """Get the position of the data loader for a checkpoint.
+
+        Returns:
+            dict: Position, or None if checkpoints are not set
+        """
+        if self._checkpoint is None:
+            return None
+        return self._data_loader.position
+
+    def _commit(self, position, final=False):
+        """Save a checkpoint when the interval has passed.
+
+        The items loaded before the position must be yielded and written to
+        the sink. The sink is committed before the checkpoint is saved.
+
+        Args:
+            position (dict): Position of the data loader
+            final (bool): Save the checkpoint at the end of the data
+        """
+        if self._checkpoint is None:
+            return
+        if not final and not self._checkpoint.due():
+            return
+        self._checkpoint.save({
+            "file_path": self._config["data_loader"]["file_path"],
+            "loader": position,
+            "sink": self._sink.commit() if self._sink else None
+        })
+
+    def _commit_chunk(self, positions, finished, seq):
+        """Commit the position after the chunks that are all yielded.
+
+        Chunks can finish out of order, the position is only committed when
+        all the chunks before it are yielded.
+
+        Args:
+            positions (dict): Position after each chunk in flight by sequence
+            finished (set): Sequence numbers of the yielded chunks
+            seq (int): Sequence number of the chunk that was yielded
+        """
+        if self._checkpoint is None:
+            return
+        finished.add(seq)
+        position = None
+        while positions and next(iter(positions)) in finished:
+            first = next(iter(positions))
+            finished.remove(first)
+            position = positions.pop(first)
+        if position is not None:
+            self._commit(position)
+
+    def _process_batch(self, items, steps=None):
+        """Process a batch of items through the defined steps in the config.
+
+        Each step processes the whole batch with `process_batch`. Items with
+        no data are not passed to the remaining steps.
+
+        Args:
+            items (list): Items to process through the configured steps
+            steps (list): Steps to use, default is the pipeline steps
+        Returns:
+            list: processed items
+        """
+        if steps is None:
+            steps = self._pipeline_steps
+        stats = self._stats
+        active = range(len(items))
+        for step_index, step in enumerate(steps):
+            ready = []
+            for index in active:
+                if not items[index].get("data"):
+                    # Join the empty list of tokens from a token step
+                    if isinstance(items[index].get("data"), list):
+                        items[index]["data"] = ""
+                    self._log.warn("No data not processing item ({})".format(
+                        items[index].get("id")
+                    ))
+                    continue
+                ready.append(index)
+            active = ready
+            if not active:
+                break
+            batch = [items[i] for i in active]
+            chars_in = data_size(batch)
+            start = time.perf_counter()
+            processed = step.process_batch(batch)
+            stats.record(
+                step_index,
+                len(batch),
+                time.perf_counter() - start,
+                chars_in,
+                data_size(processed)
+            )
+            for index, item in zip(active, processed):
+                items[index] = item
+
+        stats.add_items(len(items))
+        return items
+
+    def _start_pool(self, workers):
+        """Start the worker pool or reuse the running pool.
+
+        Args:
+            workers (int): Number of workers for processing
+        """
+        if self._pool:
+            if self._pool.workers == workers and self._pool.is_alive():
+                self._pool.drain()
+                return
+            self._merge_stats(self._pool.shutdown())
+        self._pool = WorkerPool(self._worker, workers, self._log)
+
+    def _start_threads(self, threads):
+        """Start the thread pool or reuse the running thread pool.
+
+        Args:
+            threads (int): Number of threads for processing
+        """
+        if self._thread_pool:
+            if self._threads == threads:
+                return
+            self._thread_pool.shutdown()
+        self._thread_pool = ThreadPoolExecutor(
+            threads,
+            thread_name_prefix="data_preprocess_thread"
+        )
+        self._threads = threads
+
+    def _count_errors(self, steps):
+        """Count the errors logged by the steps in the pipeline stats.
+
+        Args:
+            steps (list): Step objects of the pipeline
+        """
+        for step, step_stats in zip(steps, self._stats.steps):
+            step._log.addHandler(ErrorCounter(step_stats))
+
+    def _merge_stats(self, worker_stats):
+        """Add the stats sent by the workers when they stopped.
+
+        Args:
+            worker_stats (list): PipelineStats of each worker
+        """
+        for stats in worker_stats:
+            self._stats.merge(stats)
+
+    def _chunk_items(self, items, chunk_size):
+        """Group the loaded items into chunks.
+
+        Args:
+            items (obj): Iterable of items from the data loader
+            chunk_size (int): Number of items in a chunk
+        Yields:
+            list: Chunk of items
+        """
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _stream_chunks(self, channel, chunks, ordered, max_in_flight):
+        """Stream chunks through the workers with a window of work in flight.
+
+        New chunks are loaded and sent while fewer than `max_in_flight`
+        chunks are being processed, so loading overlaps with processing.
+        Results are yielded as soon as they are returned. When ordered is set
+        the finished chunks are held in a reorder buffer until all the chunks
+        before them are yielded. The buffered chunks count as part of the
+        window, so at most `max_in_flight` chunks are being processed or
+        waiting in the buffer, even when the first chunk is slow.
+
+        Args:
+            channel (obj): Worker pool or executor channel
+            chunks (obj): Iterable of chunks
+            ordered (bool): Yield the items in the input order
+            max_in_flight (int): Maximum number of chunks being processed
+        Yields:
+            dict: Processed item
+        """
+        chunks = iter(chunks)
+        reorder_buffer = {}
+        # Position of the data loader after each chunk, for checkpoints
+        positions = {}
+        finished = set()
+        next_chunk = 0
+        seq = 0
+        in_flight = 0
+        loading = True
+        while True:
+            # Chunks waiting in the reorder buffer count as in flight
+            while loading and in_flight < max_in_flight and (
+                    not ordered or seq - next_chunk < max_in_flight):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    loading = False
+                    break
+                channel.put((seq, chunk))
+                if self._checkpoint:
+                    positions[seq] = self._position()
+                seq += 1
+                in_flight += 1
+            if not in_flight:
+                self._commit(self._position(), final=True)
+                break
+
+            result_seq, results = channel.get()
+            in_flight -= 1
+            if isinstance(results, Exception):
+                raise results
+            if not ordered:
+                for item in self._write(results):
+                    yield item
+                self._commit_chunk(positions, finished, result_seq)
+                continue
+            reorder_buffer[result_seq] = results
+            while next_chunk in reorder_buffer:
+                for item in self._write(reorder_buffer.pop(next_chunk)):
+                    yield item
+                self._commit_chunk(positions, finished, next_chunk)
+                next_chunk += 1
 
     def _worker(self, queue, kafka_queue):
+        # The stats of the parent were copied when the worker started
+        self._stats.reset()
         while True:
             msg = queue.get()
-            msg = self._process_steps(msg)
-            kafka_queue.put(msg)
+            if msg is None:
+                kafka_queue.put((None, self._stats))
+                queue.task_done()
+                break
+            seq, msg = msg
+            try:
+                if isinstance(msg, SharedChunk):
+                    chunk = msg
+                    msg = self._process_batch(read_chunk(chunk))
+                    msg = write_results(chunk, msg)
+                else:
+                    if isinstance(msg, Partition):
+                        msg = self._load_partition(msg)
+                    msg = self._process_batch(msg)
+            except Exception as e:
+                # Send the error back, the parent raises it
+                self._log.error("Error processing chunk {a} - {b}".format(
+                    a=seq,
+                    b=e
+                ))
+                msg = worker_error(e)
+            kafka_queue.put((seq, msg))
             queue.task_done()
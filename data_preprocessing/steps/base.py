@@ -3,6 +3,16 @@
 Steps are defined with a dictionary. Each step requires a key ('type'). The
 type defines which step to use. Steps are used in the processing pipeline.
 There are data loaders and normalize_text steps.
+
+The pipeline pushes items through each step in batches with `process_batch`.
+Built-in steps implement `process_batch` natively and `process` handles a
+single item by wrapping it in a batch of one.
+
+Token steps split the item data into tokens and join them back into a string.
+When two token steps are next to each other and both split on whitespace, the
+pipeline links them with `link_token_steps`. The first step then leaves the
+item data as a list of tokens for the next step, and the text is only joined
+by the last token step of the run.
 """
 
 import hashlib
@@ -20,14 +30,110 @@ class Steps:
         """Initialize steps base class."""
         self._config = config
         self._log = self._logger()
-        if self._config.get("name") not in ["tokenizer", "data_loader"]:
+        if self._config.get("name") not in [
+                "tokenizer", "data_loader", "sink"]:
             self._tokenizer = self._config["tokenizer"]
+        # Set by the pipeline when the next step takes the tokens as is
+        self._keep_tokens = False
         self._log.info("Initializing {} {}".format(
             config.get('type'),
             config.get('name')
             )
         )
 
+    def process_batch(self, items):
+        """Process a batch of items through the step.
+
+        Steps override this method to handle the whole batch in one call. The
+        default falls back to calling `process` on each item.
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        return [self.process(item) for item in items]
+
+    def warm_up(self):
+        """Load any lazily loaded resources used by the step.
+
+        Steps that load models or corpora on first use override this method,
+        so the resources are loaded before the step is used by threads or
+        worker processes.
+        """
+        pass
+
+    def _thread_safe(self):
+        """Check if one instance of the step can be used by many threads.
+
+        Returns:
+            bool: True if the step is thread safe
+        """
+        return True
+
+    def _stats_name(self):
+        """Get the name of the step used in the pipeline stats.
+
+        Returns:
+            str: Name of the step
+        """
+        return self._config.get("type")
+
+    def _whitespace_tokens(self):
+        """Check if the step splits the item data into tokens on whitespace.
+
+        Returns:
+            bool: True if the tokens are split on whitespace
+        """
+        return False
+
+    def _tokenize_batch(self, items):
+        """Tokenize the items with the tokenizer.
+
+        Items that already hold a list of tokens from the previous step are
+        not tokenized again.
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        text_items = [item for item in items if not isinstance(
+            item["data"], list
+        )]
+        if text_items:
+            self._tokenizer.process_batch(text_items)
+        return items
+
+    def _join_tokens(self, tokens):
+        """Join the tokens back into text.
+
+        If the next step takes the tokens as is, the tokens are returned
+        without the empty tokens that would be lost by joining and splitting
+        the text again.
+
+        Args:
+            tokens (list): List of tokens
+        Returns:
+            obj: Text or list of tokens
+        """
+        if self._keep_tokens:
+            return [token for token in tokens if token]
+        return " ".join(tokens)
+
+    def _join_failed(self, item):
+        """Join the tokens left in an item by an error of the step.
+
+        The data of an item the step could not process can still be the list
+        of tokens from the tokenizer or from the previous step. The tokens
+        are joined unless the next step takes them as is.
+
+        Args:
+            item (dict): Item the step could not process
+        """
+        if isinstance(item.get("data"), list):
+            item["data"] = self._join_tokens(item["data"])
+
     def _item_model(self, item, additional_keys=None):
         """Format each record into a standard item format.
 
@@ -74,6 +180,19 @@ class Steps:
 
         return formatted_item
 
+    def _in_shard(self, item, shard):
+        """Check if an item is in a shard, with a stable hash of its id.
+
+        Args:
+            item (dict): item
+            shard (tuple): Index and number of shards
+        Returns:
+            bool: True if the item is in the shard
+        """
+        index, count = shard
+        digest = hashlib.md5(str(item["id"]).encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "little") % count == index
+
     def _create_id(self, text):
         """Create unique id from text.
 
@@ -91,3 +210,22 @@ class Steps:
             self._config.get("log_level")
         )
         return log
+
+
+def link_token_steps(steps):
+    """Link adjacent token steps so tokens are passed between them.
+
+    A step keeps its tokens when the next step is a token step and both steps
+    split the text on whitespace. Splitting the joined text again would give
+    the same tokens, so the output does not change.
+
+    Args:
+        steps (list): Step objects of the pipeline
+    Returns:
+        list: Step objects of the pipeline
+    """
+    for step, next_step in zip(steps, steps[1:]):
+        step._keep_tokens = (
+            step._whitespace_tokens() and next_step._whitespace_tokens()
+        )
+    return steps
@@ -13,6 +13,14 @@ valid_types = {
         "path": "data_preprocessing.steps.data_loaders.csv_loader",
         "class": "CsvDataLoader"
     },
+    "jsonl": {
+        "path": "data_preprocessing.steps.data_loaders.jsonl_loader",
+        "class": "JsonlDataLoader"
+    },
+    "text": {
+        "path": "data_preprocessing.steps.data_loaders.text_loader",
+        "class": "TextDataLoader"
+    },
     "single_item": {
         "path": "data_preprocessing.steps.data_loaders.single_item",
         "class": "SingleItemLoader"
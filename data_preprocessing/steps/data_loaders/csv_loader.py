@@ -6,6 +6,57 @@ two columns, one for the id and one for the data. If you want to include
 additional columns in the item, you can add the `addition_columns` key with a
 list of the column names.
 
+Items are built from whole columns of each block of rows. The data column is
+read as text, rows with empty data are skipped. Rows with an empty id get the
+md5 of their data as the id.
+
+The records are read in blocks of `block_size` bytes and each block is parsed
+by `pandas.read_csv`. Only the id, data and additional columns are parsed.
+The parser is set with `engine`, `c` (default), `python` or `pyarrow`. The
+`pyarrow` engine needs the `pyarrow` package and parses a block with many
+threads, use it with a large `block_size`. The `dtype` key sets the types of
+the columns, so pandas does not infer them for every block.
+
+The loader keeps its position in the file, the byte offset and the number of
+the next row. With `checkpoint_path` set in the config, `DataPreprocess`
+saves the position of the last row that was written or yielded every
+`checkpoint_interval` seconds, together with the files of the sink. With
+`resume` set to True a later run seeks to the saved byte offset, the rows
+before it are not read or parsed again.
+
+Records are split with the quotes of the fields, so fields with line breaks
+inside quotes are kept in one record. A quote inside an unquoted field is
+kept as text, like pandas does. Files with a lone `\\r` at the end of their
+lines are read like files with `\\n`. When pandas parses another number of
+rows from a block than the records found, for example from a lone `\\r`
+inside a line, the block is split again with the rules of the csv parser. A
+record that still can not be parsed raises an error with its byte offset.
+
+With `shard_index` and `num_shards` passed to `process_data`, the file is
+split into byte ranges of the same size and each shard only reads its own
+range. A range starts at the first line after its start byte with an even
+number of quotes before it, so records with line breaks in quoted fields are
+not split. Each shard counts the quotes from the start of the file up to its
+own end.
+
+With `partitioned` set in `multiprocess_data`, the file is split into byte
+ranges of about 4 MB, at least one for each worker. Each worker reads and
+parses its own ranges. The ranges are found like the ranges of the shards.
+
+Quotes inside unquoted fields are counted too when the shards and
+partitions are found, remove them before sharding or partitioning a file
+that also has line breaks in quoted fields.
+
+With `memory_map` set to True the file is mapped into memory. The records
+are found in the mapped buffer and each block is copied once for the parser,
+instead of copying every line into a Python buffer first. Pages of the file
+are read by the OS when they are used and shared by the workers.
+
+Files compressed with gzip, bz2, xz or zstd are decompressed while they are
+read, see `data_preprocessing.utils.compression`. Compressed files are read
+from the start, they can be resumed from a checkpoint but not sharded or
+partitioned.
+
 Example:
     .. code-block::
 
@@ -22,7 +73,16 @@ Example:
                 },
                 "batch_size": 1000,
                 "log_level": "INFO",
-                "preserve_original": True # default is False
+                "preserve_original": True, # default is False
+                "engine": "pyarrow",  # default is c
+                "block_size": 16 * 2 ** 20,  # bytes, default is 1 MB
+                "memory_map": True,  # default is False
+                "compression": "infer",  # default is infer
+                "decompress_thread": False,  # default is False
+                "dtype": {"job_id": "int64"},
+                "checkpoint_path": "fake_job_postings.checkpoint",
+                "checkpoint_interval": 60,  # seconds, default is 60
+                "resume": True  # default is False
             },
             "steps": [
                 {
@@ -38,8 +98,22 @@ Example:
             break
 
 """
+import io
+import os
+
 import pandas as pd
 from data_preprocessing.steps.base import Steps
+from data_preprocessing.utils.compression import codec, open_data
+from data_preprocessing.utils.pool import Partition
+from data_preprocessing.utils.records import (
+    csv_record_ends, newline_reader, partition_count, read_record,
+    record_ends, record_ranges, record_shard, seek
+)
+
+# First bytes of lines that can be blank
+SPACE = b" \t\r\n"
+# Size of the blocks of records parsed at a time
+DEFAULT_BLOCK_SIZE = 2 ** 20
 
 
 class CsvDataLoader(Steps):
@@ -70,12 +144,76 @@ class CsvDataLoader(Steps):
         if self._additional_columns:
             if not isinstance(self._additional_columns, list):
                 raise TypeError("additional_columns must be a list")
+        self._block_size = config.get("block_size") or DEFAULT_BLOCK_SIZE
+        self._read_options = self._parser_options(config)
+        # Position to start reading from, set by restore
+        self._start = None
+        # Byte offset and number of the next row
+        self._offset = 0
+        self._row = 0
+        self._shard = None
+
+    @property
+    def position(self):
+        """Position of the next row in the file.
+
+        Returns:
+            dict: Byte offset and row number of the next row, and the shard
+        """
+        return {"offset": self._offset, "row": self._row, "shard": self._shard}
+
+    def restore(self, position):
+        """Start reading from a position saved by a checkpoint.
+
+        Args:
+            position (dict): Position returned by `position`
+        """
+        self._start = dict(position)
+        self._offset = position["offset"]
+        self._row = position["row"]
+
+    def partitions(self, data, workers, chunk_size, shard=None):
+        """Split the file into byte ranges loaded by the workers.
 
-    def process(self, *args):
+        The ranges start at whole records, a shard passed in is split into
+        smaller ranges.
+
+        Args:
+            data (obj): Not used
+            workers (int): Number of workers
+            chunk_size (int): Not used, the ranges are split by size
+            shard (tuple): Optional index and number of shards
+        Yields:
+            obj: Partition with the start and end byte offsets of a range
+        """
+        path = self._config["file_path"]
+        if codec(path, self._config.get("compression")):
+            raise ValueError("Compressed csv files can not be partitioned!")
+        with open(path, "rb") as raw:
+            f = newline_reader(raw)
+            read_record(f)
+            start = f.tell()
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            if shard:
+                start, end = record_shard(f, start, shard)
+            ranges = record_ranges(
+                f, start, end, partition_count(end - start, workers)
+            )
+        for byte_range in ranges:
+            if byte_range[0] < byte_range[1]:
+                yield Partition(None, None, byte_range)
+
+    def process(self, *args, shard=None, byte_range=None):
         """Load data from a csv file.
 
         Transform into a valid item and yield the item.
 
+        Args:
+            shard (tuple): Optional index and number of shards, only the
+                byte range of the shard is read
+            byte_range (tuple): Optional start and end byte offsets of the
+                records to read, from `partitions`
         Yields:
             obj: Formatted item containing the id and data
         """
@@ -84,51 +222,339 @@ class CsvDataLoader(Steps):
         column_names = [columns["id"], columns["data"]]
         if self._additional_columns:
             column_names += self._additional_columns
-        batch_size = self._config["batch_size"]
         self._log.info(
             "Loading items from csv file - {}".format(
                 path
             )
         )
+        memory_map = self._config.get("memory_map", False)
+        if codec(path, self._config.get("compression")):
+            if shard:
+                raise ValueError("Compressed csv files can not be sharded!")
+            if memory_map:
+                self._log.warn(
+                    "Compressed csv files can not be memory mapped"
+                )
         try:
-            # TODO - look into using dask for large files
-            for batch in pd.read_csv(
-                    path, usecols=column_names, chunksize=batch_size):
-
-                for index, row in batch.iterrows():
-                    item = self._build_item(row, columns)
-                    if not item:
-                        self._log.warn("Skipping row - {}".format(index))
-                        continue
-                    yield self._item_model(item, self._additional_columns)
+            with open_data(self._config, memory_map) as f:
+                for item in self._load(
+                        f, columns, column_names, shard, byte_range):
+                    yield item
         except Exception as e:
             self._log.error("Error processing csv file")
             raise e
 
-    def _build_item(self, row, columns):
-        """Internal method to build the item in the right
+    def _load(self, f, columns, column_names, shard, byte_range=None):
+        """Load the items of a file, a stream or a memory map of the file.
+
+        Args:
+            f (obj): Binary file, stream or memory map
+            columns (dict): dict containing the columns for id and data
+            column_names (list): Columns to read
+            shard (tuple): Optional index and number of shards
+            byte_range (tuple): Optional start and end byte offsets to read
+        Yields:
+            obj: Formatted item containing the id and data
+        """
+        f = newline_reader(f)
+        header = read_record(f)
+        start = f.tell()
+        end = None
+        self._shard = list(shard) if shard else None
+        if byte_range:
+            start, end = byte_range
+        elif shard:
+            start, end = record_shard(f, start, shard)
+            self._log.debug(
+                "Reading shard {a} of {b} - bytes {c} to {d}".format(
+                    a=shard[0],
+                    b=shard[1],
+                    c=start,
+                    d=end
+                )
+            )
+        self._offset = start
+        self._row = 0
+        if self._start:
+            if self._start.get("shard") != self._shard:
+                raise ValueError(
+                    "The checkpoint is for the shard {}!".format(
+                        self._start.get("shard")
+                    )
+                )
+            self._log.info("Resuming csv file at row {}".format(
+                self._start["row"]
+            ))
+            self._offset = self._start["offset"]
+            self._row = self._start["row"]
+        seek(f, self._offset)
+        if isinstance(f, io.IOBase):
+            blocks = self._read_blocks(f, header, column_names, end)
+        else:
+            blocks = self._map_blocks(f, header, column_names, end)
+        for batch, ends in blocks:
+            for item, end in zip(self._build_items(batch, columns), ends):
+                self._offset = end
+                self._row += 1
+                if item is None:
+                    self._log.warn("Skipping row - {}".format(
+                        self._row - 1
+                    ))
+                    continue
+                yield item
+        self._offset = f.tell()
+
+    def _read_blocks(self, f, header, column_names, end=None):
+        """Read the records of the file in blocks and parse each block.
+
+        Args:
+            f (obj): Binary file at the start of a record
+            header (bytes): Header record of the file
+            column_names (list): Columns to read
+            end (int): Optional byte offset to stop reading at
+        Yields:
+            tuple: Pandas df of the block and the byte offset after each row
+        """
+        offset = f.tell()
+        block_end = offset + self._block_size
+        records = []
+        ends = []
+        while end is None or offset < end:
+            record = read_record(f)
+            if not record:
+                break
+            offset += len(record)
+            records.append(record)
+            # Blank lines are skipped by pandas
+            if not record.strip():
+                if ends:
+                    ends[-1] = offset
+                continue
+            ends.append(offset)
+            if offset >= block_end:
+                yield self._parse(
+                    header, b"".join(records), column_names, ends
+                )
+                block_end = offset + self._block_size
+                records = []
+                ends = []
+        if ends:
+            yield self._parse(header, b"".join(records), column_names, ends)
+
+    def _map_blocks(self, buffer, header, column_names, end=None):
+        """Find the records of a memory map in blocks and parse each block.
+
+        A block of about `block_size` bytes is copied from the map once, the
+        records are found in the block and the whole records are parsed.
+
+        Args:
+            buffer (obj): Memory map at the start of a record
+            header (bytes): Header record of the file
+            column_names (list): Columns to read
+            end (int): Optional byte offset to stop reading at
+        Yields:
+            tuple: Pandas df of the block and the byte offset after each row
+        """
+        if end is None:
+            end = len(buffer)
+        offset = buffer.tell()
+        size = self._block_size
+        while offset < end:
+            stop = min(offset + size, end)
+            block = buffer[offset:stop]
+            records = record_ends(block)
+            if stop == end and (not records or records[-1] < len(block)):
+                # The last record of the file has no line break
+                records.append(len(block))
+            if not records:
+                # A record longer than the block
+                size *= 2
+                continue
+            size = self._block_size
+            ends = []
+            start = 0
+            for record in records:
+                # Blank lines are skipped by pandas, only lines starting
+                # with white space are copied to check
+                if block[start] in SPACE and not block[start:record].strip():
+                    if ends:
+                        ends[-1] = offset + record
+                else:
+                    ends.append(offset + record)
+                start = record
+            if ends:
+                yield self._parse(header, block[:start], column_names, ends)
+            offset += start
+        buffer.seek(offset)
+
+    def _parse(self, header, block, column_names, ends):
+        """Parse a block of records.
+
+        When pandas parses another number of rows than the records found,
+        the records of the block are found again with `csv_record_ends`. An
+        error names the first record that can not be parsed.
+
+        Args:
+            header (bytes): Header record of the file
+            block (bytes): Records of the block
+            column_names (list): Columns to read
+            ends (list): Byte offset after each record of the block
+        Returns:
+            tuple: Pandas df with a row for each record and the byte offset
+                after each row
+        """
+        start = ends[-1] - len(block)
+        try:
+            batch = self._read(header, block, column_names)
+        except ValueError:
+            self._raise_record(header, block, start, column_names)
+        if len(batch) == len(ends):
+            return batch, ends
+        ends = self._block_ends(block, start)
+        if len(batch) != len(ends):
+            self._raise_record(header, block, start, column_names)
+        return batch, ends
+
+    def _read(self, header, block, column_names):
+        """Parse records with pandas.
+
+        Args:
+            header (bytes): Header record of the file
+            block (bytes): Records to parse
+            column_names (list): Columns to read
+        Returns:
+            obj: Pandas df of the records
+        """
+        return pd.read_csv(
+            io.BytesIO(header + block),
+            usecols=column_names,
+            **self._read_options
+        )
+
+    def _block_ends(self, block, start):
+        """Find the records of a block with the rules of the csv parser.
+
+        Args:
+            block (bytes): Records of the block
+            start (int): Byte offset of the block
+        Returns:
+            list: Byte offset after each record that is not blank
+        """
+        ends = []
+        previous = 0
+        for end in csv_record_ends(block):
+            # Blank lines are skipped by pandas
+            if not block[previous:end].strip():
+                if ends:
+                    ends[-1] = start + end
+            else:
+                ends.append(start + end)
+            previous = end
+        return ends
+
+    def _raise_record(self, header, block, start, column_names):
+        """Raise an error for the first record of a block pandas can not
+        parse as one row.
+
+        Args:
+            header (bytes): Header record of the file
+            block (bytes): Records of the block
+            start (int): Byte offset of the block
+            column_names (list): Columns to read
+        """
+        previous = 0
+        for end in csv_record_ends(block):
+            record = block[previous:end]
+            if record.strip():
+                try:
+                    rows = len(self._read(header, record, column_names))
+                except ValueError:
+                    rows = None
+                if rows != 1:
+                    raise ValueError(
+                        "Can not parse the csv record at byte {a} - {b}"
+                        .format(a=start + previous, b=record[:200])
+                    )
+            previous = end
+        raise ValueError(
+            "Can not parse the csv records at bytes {a} to {b}".format(
+                a=start,
+                b=start + len(block)
+            )
+        )
+
+    def _parser_options(self, config):
+        """Get the options of `pandas.read_csv` from the config.
+
+        Args:
+            config (json): Json object containing the configuration details
+        Returns:
+            dict: Keyword arguments of `pandas.read_csv`
+        """
+        dtype = dict(config.get("dtype") or {})
+        dtype[config["columns"]["data"]] = str
+        options = {"dtype": dtype}
+        engine = config.get("engine")
+        if engine == "pyarrow":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError(
+                    "The pyarrow engine needs the pyarrow package!"
+                )
+        if engine:
+            options["engine"] = engine
+        return options
+
+    def _build_items(self, batch, columns):
+        """Internal method to build the items of a block in the right
         format.
 
+        The columns are converted to lists once, so only the dict of each
+        item is built per row.
+
         Example:
             item = {
                 "id": 1,
-                "data": "data to process"
+                "data": "data to process",
+                "tags": {}
             }
         Args:
-            row (obj): Pandas df row
+            batch (obj): Pandas df of the block
             columns (dict): dict containing the columns for id and data
         Returns:
-            dict: item
+            list: Items, None for the rows without data
         """
-        try:
+        ids = batch[columns["id"]]
+        missing_ids = (ids.isna() | ~ids.astype(bool)).tolist()
+        # Int ids are read as floats when some ids are empty
+        if ids.dtype.kind == "f" and ids.dropna().mod(1).eq(0).all():
+            ids = ids.astype("Int64")
+        ids = ids.tolist()
+        texts = batch[columns["data"]]
+        valid = texts.notna().tolist()
+        texts = texts.tolist()
+        additional = [
+            (c, batch[c].tolist()) for c in self._additional_columns or []
+        ]
+        preserve_original = self._config["preserve_original"]
+        create_id = self._create_id
+
+        items = []
+        for i, text in enumerate(texts):
+            if not valid[i]:
+                items.append(None)
+                continue
             item = {
-                "id": row[columns["id"]],
-                "data": row[columns["data"]]
+                "id": create_id(text) if missing_ids[i] else ids[i],
+                "data": text,
+                "tags": {}
             }
-            if self._additional_columns:
-                for c in self._additional_columns:
-                    item[c] = row[c]
-        except Exception as e:
-            self._log.warn("Error processing row in csv file {}".format(e))
-            return ""
-        return item
+            if additional:
+                item["additional_keys"] = {
+                    c: values[i] for c, values in additional
+                }
+            if preserve_original:
+                item["original_data"] = text
+            items.append(item)
+        return items
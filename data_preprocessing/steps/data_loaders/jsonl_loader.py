@@ -0,0 +1,341 @@
+"""Process data from a JSON Lines file or a JSON array.
+
+This data loader reads a file with one JSON object on each line, or a file
+with one top level JSON array of objects, and formats each object to the item
+model. The `columns` config sets the fields of the id, the data and the
+additional columns. A field in a nested object is set with a path of keys
+joined by dots, like `user.name`. A key containing a dot is used as is when
+the object has it. Without an id field, or for objects without an id, an id is
+generated by hashing the text.
+
+Objects without the data field are skipped, like blank lines and lines that
+are not valid JSON.
+
+JSON Lines files are read one line at a time like the text data loader, so
+they keep the byte offset of the next line for checkpoints, read a byte range
+of the file for `shard_index` and `num_shards`, and can be split into byte
+ranges with `partitioned` set in `multiprocess_data`.
+
+A JSON array is parsed incrementally, the file is read in blocks of
+`buffer_size` bytes and each object is decoded as soon as it is complete, so
+the array is never held in memory. An array is read from the start, a resumed
+run skips the objects before the checkpoint and shards keep the items with a
+stable hash of their id. Arrays can not be partitioned.
+
+The format is found from the first character of the file, or set with
+`format` to `lines` or `array`. Compressed files are decompressed while they
+are read, see `data_preprocessing.utils.compression`.
+
+Example:
+    .. code-block::
+
+        from data_preprocessing import DataPreprocess
+
+        config = {
+            "data_loader": {
+                "type": "jsonl",
+                "file_path": "posts.jsonl.gz",
+                "columns": {
+                    "id": "id",
+                    "data": "body.text",
+                    "additional_columns": ["user.name", "lang"]
+                },
+                "format": "lines",  # default is found from the file
+                "batch_size": 1000,
+                "log_level": "INFO",
+                "preserve_original": True # default is False
+            },
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ]
+        }
+        loader = DataPreprocess(config, log_level='INFO')
+        for batch in loader.process_data():
+            print(batch)
+            break
+
+"""
+
+import codecs
+import json
+import re
+
+from data_preprocessing.steps.data_loaders.text_loader import TextDataLoader
+from data_preprocessing.utils.compression import (
+    DEFAULT_BUFFER_SIZE, codec, open_data
+)
+
+# First character that is not white space
+NOT_SPACE = re.compile(r"\S")
+
+
+class JsonlDataLoader(TextDataLoader):
+    """JSON Lines Data Loader class.
+
+    Args:
+        config (json): Json object containing the configuration details
+
+    Example:
+        .. code-block::
+
+            config = {
+                "type": "jsonl",
+                "file_path": "posts.jsonl",
+                "columns": {
+                    "id": "id",
+                    "data": "body.text",
+                    "additional_columns": ["user.name"]
+                },
+                "batch_size": 1000,
+                "log_level": "INFO",
+                "preserve_original": True # default is False
+            }
+    """
+    def __init__(self, config):
+        super().__init__(config)
+        columns = config["columns"]
+        self._id_field = columns.get("id")
+        self._data_field = columns["data"]
+        self._additional_columns = columns.get("additional_columns")
+        if self._additional_columns:
+            if not isinstance(self._additional_columns, list):
+                raise TypeError("additional_columns must be a list")
+        self._format = config.get("format")
+
+    def partitions(self, data, workers, chunk_size, shard=None):
+        """Split the file into byte ranges loaded by the workers.
+
+        Args:
+            data (obj): Not used
+            workers (int): Number of workers
+            chunk_size (int): Not used, the ranges are split by size
+            shard (tuple): Optional index and number of shards
+        Yields:
+            obj: Partition with the shard of a byte range
+        """
+        if self._file_format() == "array":
+            raise ValueError("JSON arrays can not be partitioned!")
+        for partition in super().partitions(data, workers, chunk_size, shard):
+            yield partition
+
+    def process(self, *args, shard=None):
+        """Load data from a JSON Lines file or a JSON array.
+
+        Transform each object into a valid item and yield the item.
+
+        Args:
+            shard (tuple): Optional index and number of shards
+        Yields:
+            obj: Formatted item containing the id and data
+        """
+        path = self._config["file_path"]
+        self._log.info("Loading items from json file - {}".format(path))
+        array = self._file_format() == "array"
+        compressed = codec(path, self._config.get("compression"))
+        if shard and compressed and not array:
+            raise ValueError("Compressed json lines can not be sharded!")
+        try:
+            with open_data(self._config, memory_map=not array) as f:
+                if array:
+                    items = self._load_array(f, shard)
+                else:
+                    items = self._load(f, shard)
+                for item in items:
+                    yield item
+        except Exception as e:
+            self._log.error("Error processing json file")
+            raise e
+
+    def _file_format(self):
+        """Get the format of the file.
+
+        Returns:
+            str: `lines` or `array`
+        """
+        if not self._format:
+            with open_data(self._config) as f:
+                start = f.read(4096)
+                while start and not start.strip():
+                    start = f.read(4096)
+            self._format = "array" if start.lstrip()[:1] == b"[" else "lines"
+        return self._format
+
+    def _load_array(self, f, shard):
+        """Load the items of the objects of a JSON array.
+
+        Args:
+            f (obj): Binary file or stream of a compressed file
+            shard (tuple): Optional index and number of shards
+        Yields:
+            obj: Formatted item containing the id and data
+        """
+        self._shard = list(shard) if shard else None
+        self._offset = None
+        self._row = 0
+        start = 0
+        if self._start:
+            if self._start.get("shard") != self._shard:
+                raise ValueError(
+                    "The checkpoint is for the shard {}!".format(
+                        self._start.get("shard")
+                    )
+                )
+            self._log.info("Resuming json array at object {}".format(
+                self._start["row"]
+            ))
+            start = self._start["row"]
+        records = _array_records(
+            f,
+            self._encoding,
+            self._config.get("buffer_size") or DEFAULT_BUFFER_SIZE
+        )
+        for record in records:
+            self._row += 1
+            if self._row <= start:
+                continue
+            item = self._record_item(record)
+            if item is None:
+                continue
+            if shard and not self._in_shard(item, shard):
+                continue
+            yield item
+
+    def _line_item(self, line):
+        """Build the item of a line.
+
+        Args:
+            line (bytes): Line with the line break
+        Returns:
+            dict: Formatted item, None for a line without an item
+        """
+        if not line.strip():
+            return None
+        try:
+            record = json.loads(line.decode(self._encoding))
+        except ValueError as e:
+            self._log.warn("Skipping row - {a} - {b}".format(
+                a=self._row - 1,
+                b=e
+            ))
+            return None
+        return self._record_item(record)
+
+    def _record_item(self, record):
+        """Build the item of a JSON object.
+
+        Args:
+            record (obj): Decoded JSON object
+        Returns:
+            dict: Formatted item, None for an object without data
+        """
+        data = _field(record, self._data_field)
+        if isinstance(data, (int, float)) and not isinstance(data, bool):
+            data = str(data)
+        if not isinstance(data, str):
+            self._log.warn("Skipping row - {}".format(self._row - 1))
+            return None
+        values = {"data": data}
+        if self._id_field:
+            values["id"] = _field(record, self._id_field)
+        for column in self._additional_columns or []:
+            values[column] = _field(record, column)
+        return self._item_model(values, self._additional_columns)
+
+
+def _field(record, path):
+    """Get a field of a JSON object with a path of keys.
+
+    Args:
+        record (obj): Decoded JSON object
+        path (str): Key, or keys of nested objects joined by dots
+    Returns:
+        obj: Value of the field, None when it is missing
+    """
+    if not isinstance(record, dict):
+        return None
+    if path in record:
+        return record[path]
+    value = record
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _array_records(f, encoding, size):
+    """Parse the objects of a JSON array one at a time.
+
+    The file is read in blocks of `size` bytes. Each value of the array is
+    decoded as soon as the block holds all of it, a value longer than the
+    block is decoded after more blocks are read.
+
+    Args:
+        f (obj): Binary file at the start of the array
+        encoding (str): Encoding of the file
+        size (int): Bytes read at a time
+    Yields:
+        obj: Decoded values of the array
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder(encoding)()
+    buffer = ""
+    position = 0
+    finished = False
+    read_size = size
+    # The next token is the start of the array, a value or a separator
+    state = "start"
+    while True:
+        match = NOT_SPACE.search(buffer, position)
+        need = match is None
+        if match:
+            position = match.start()
+            char = buffer[position]
+            if state == "start":
+                if char != "[":
+                    raise ValueError("The json file is not an array!")
+                position += 1
+                state = "first"
+            elif state == "next":
+                if char == "]":
+                    return
+                if char != ",":
+                    raise ValueError(
+                        "Expected , or ] in the json array, got {}".format(
+                            char
+                        )
+                    )
+                position += 1
+                state = "value"
+            elif state == "first" and char == "]":
+                return
+            else:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                except ValueError:
+                    if finished:
+                        raise
+                    need = True
+                else:
+                    # A number at the end of the block can go on
+                    if end == len(buffer) and not finished:
+                        need = True
+                    else:
+                        yield value
+                        position = end
+                        state = "next"
+                        read_size = size
+        if not need:
+            continue
+        if finished:
+            raise ValueError("The json array is not closed!")
+        data = f.read(read_size)
+        finished = not data
+        buffer = buffer[position:] + text.decode(data, finished)
+        position = 0
+        # Read more at a time while a value is longer than the blocks
+        read_size *= 2
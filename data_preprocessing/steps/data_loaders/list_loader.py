@@ -4,6 +4,13 @@ This data loader processes data from an in memory list, formats the data to the
 item model and processes through the data preprocessing pipeline. An id is
 generated by hashing the text.
 
+With `shard_index` and `num_shards` passed to `process_data`, each shard
+keeps the items with a stable hash of their id, so every machine running the
+same config on the same list keeps a different part of the data.
+
+With `partitioned` set in `multiprocess_data`, slices of the list are sent
+to the workers and each worker builds the items of its slice.
+
 Example:
     .. code-block::
 
@@ -32,6 +39,7 @@ Example:
 """
 
 from data_preprocessing.steps.base import Steps
+from data_preprocessing.utils.pool import Partition
 
 
 class ListDataLoader(Steps):
@@ -60,13 +68,32 @@ class ListDataLoader(Steps):
             }
         super().__init__(config)
 
-    def process(self, data):
+    def partitions(self, data, workers, chunk_size, shard=None):
+        """Split the list into partitions loaded by the workers.
+
+        Args:
+            data (list): data to process
+            workers (int): Number of workers
+            chunk_size (int): Number of records in a partition
+            shard (tuple): Optional index and number of shards
+        Yields:
+            obj: Partition with a slice of the list
+        """
+        if not isinstance(data, list):
+            self._log.error("Bad data type passed to list loader")
+            raise TypeError("Data must be a list!")
+        for start in range(0, len(data), chunk_size):
+            yield Partition(data[start:start + chunk_size], shard)
+
+    def process(self, data, shard=None):
         """ Process list of data.
 
         Transform into a valid item and yield the item.
 
         Args:
             data (list): data to process
+            shard (tuple): Optional index and number of shards, only the items
+                of the shard are yielded
         Yields:
             obj: item
         """
@@ -79,7 +106,9 @@ class ListDataLoader(Steps):
             if isinstance(item, dict) or isinstance(item, list):
                 self._log.warn("Skipping item bad format- {}".format(item))
                 continue
-            item = {
+            item = self._item_model({
                 "data": item
-            }
-            yield self._item_model(item)
+            })
+            if shard and not self._in_shard(item, shard):
+                continue
+            yield item
@@ -0,0 +1,225 @@
+"""Process data from a text file.
+
+This data loader reads a text file with one record on each line, formats each
+line to the item model and processes it through the data preprocessing
+pipeline. An id is generated by hashing the text. Blank lines are skipped.
+
+The file is mapped into memory and the line breaks are found in the mapped
+buffer, only the text of the lines that are loaded is copied and decoded.
+Pages of the file are read by the OS when they are used, so files larger
+than the memory can be loaded without reading them through Python buffers.
+
+Like the csv data loader, the loader keeps the byte offset of the next line
+for checkpoints, reads a byte range of the file for `shard_index` and
+`num_shards`, and splits the file into byte ranges with `partitioned` set in
+`multiprocess_data`.
+
+Files compressed with gzip, bz2, xz or zstd are decompressed while they are
+read, see `data_preprocessing.utils.compression`. They are read as a stream
+instead of a memory map, and can not be sharded or partitioned.
+
+Example:
+    .. code-block::
+
+        from data_preprocessing import DataPreprocess
+
+        config = {
+            "data_loader": {
+                "type": "text",
+                "file_path": "posts.txt",
+                "encoding": "utf-8",  # default is utf-8
+                "compression": "infer",  # default is infer
+                "batch_size": 1000,
+                "log_level": "INFO",
+                "preserve_original": True # default is False
+            },
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ]
+        }
+        loader = DataPreprocess(config, log_level='INFO')
+        for batch in loader.process_data():
+            print(batch)
+            break
+
+"""
+
+import io
+import os
+
+from data_preprocessing.steps.base import Steps
+from data_preprocessing.utils.compression import codec, open_data
+from data_preprocessing.utils.pool import Partition
+from data_preprocessing.utils.records import (
+    file_shards, record_end, seek, shard_range
+)
+
+
+class TextDataLoader(Steps):
+    """Text Data Loader class.
+
+    Args:
+        config (json): Json object containing the configuration details
+
+    Example:
+        .. code-block::
+
+            config = {
+                "type": "text",
+                "file_path": "posts.txt",
+                "batch_size": 1000,
+                "log_level": "INFO",
+                "preserve_original": True # default is False
+            }
+    """
+    def __init__(self, config):
+        super().__init__(config)
+        self._encoding = config.get("encoding") or "utf-8"
+        # Position to start reading from, set by restore
+        self._start = None
+        # Byte offset and number of the next line
+        self._offset = 0
+        self._row = 0
+        self._shard = None
+
+    @property
+    def position(self):
+        """Position of the next line in the file.
+
+        Returns:
+            dict: Byte offset and line number of the next line, and the shard
+        """
+        return {"offset": self._offset, "row": self._row, "shard": self._shard}
+
+    def restore(self, position):
+        """Start reading from a position saved by a checkpoint.
+
+        Args:
+            position (dict): Position returned by `position`
+        """
+        self._start = dict(position)
+        self._offset = position["offset"]
+        self._row = position["row"]
+
+    def partitions(self, data, workers, chunk_size, shard=None):
+        """Split the file into byte ranges loaded by the workers.
+
+        Args:
+            data (obj): Not used
+            workers (int): Number of workers
+            chunk_size (int): Not used, the ranges are split by size
+            shard (tuple): Optional index and number of shards
+        Yields:
+            obj: Partition with the shard of a byte range
+        """
+        path = self._config["file_path"]
+        if codec(path, self._config.get("compression")):
+            raise ValueError("Compressed text files can not be partitioned!")
+        for part in file_shards(path, workers, shard):
+            yield Partition(None, part)
+
+    def process(self, *args, shard=None):
+        """Load data from a text file.
+
+        Transform each line into a valid item and yield the item.
+
+        Args:
+            shard (tuple): Optional index and number of shards, only the
+                byte range of the shard is read
+        Yields:
+            obj: Formatted item containing the id and data
+        """
+        path = self._config["file_path"]
+        self._log.info("Loading items from text file - {}".format(path))
+        if shard and codec(path, self._config.get("compression")):
+            raise ValueError("Compressed text files can not be sharded!")
+        try:
+            with open_data(self._config, memory_map=True) as f:
+                for item in self._load(f, shard):
+                    yield item
+        except Exception as e:
+            self._log.error("Error processing text file")
+            raise e
+
+    def _load(self, f, shard):
+        """Load the items of the lines of a memory map or a stream.
+
+        Args:
+            f (obj): Memory map of the file or stream of a compressed file
+            shard (tuple): Optional index and number of shards
+        Yields:
+            obj: Formatted item containing the id and data
+        """
+        start = 0
+        end = None
+        self._shard = list(shard) if shard else None
+        if shard:
+            start, end = shard_range(f, 0, shard)
+            self._log.debug(
+                "Reading shard {a} of {b} - bytes {c} to {d}".format(
+                    a=shard[0],
+                    b=shard[1],
+                    c=start,
+                    d=end
+                )
+            )
+        self._offset = start
+        self._row = 0
+        if self._start:
+            if self._start.get("shard") != self._shard:
+                raise ValueError(
+                    "The checkpoint is for the shard {}!".format(
+                        self._start.get("shard")
+                    )
+                )
+            self._log.info("Resuming file at line {}".format(
+                self._start["row"]
+            ))
+            self._offset = self._start["offset"]
+            self._row = self._start["row"]
+        seek(f, self._offset)
+        if isinstance(f, io.IOBase):
+            lines = iter(f.readline, b"")
+        else:
+            lines = self._map_lines(f, end)
+        for line in lines:
+            self._offset += len(line)
+            self._row += 1
+            item = self._line_item(line)
+            if item is not None:
+                yield item
+
+    def _line_item(self, line):
+        """Build the item of a line.
+
+        Args:
+            line (bytes): Line with the line break
+        Returns:
+            dict: Formatted item, None for a blank line
+        """
+        line = line.decode(self._encoding).rstrip("\r\n")
+        if not line.strip():
+            return None
+        return self._item_model({"data": line})
+
+    def _map_lines(self, buffer, end=None):
+        """Get the lines of a memory map.
+
+        Args:
+            buffer (obj): Memory map at the start of a line
+            end (int): Optional byte offset to stop reading at
+        Yields:
+            bytes: Line with the line break
+        """
+        if end is None:
+            buffer.seek(0, os.SEEK_END)
+            end = buffer.tell()
+        offset = self._offset
+        while offset < end:
+            stop = record_end(buffer, offset, quoted=False)
+            yield buffer[offset:stop]
+            offset = stop
@@ -0,0 +1,246 @@
+"""Normalize Text - Fused character map step.
+
+The steps `lowercase`, `remove_digits`, `remove_punctuation` and
+`remove_whitespace` only work on single characters. When two or more of these
+steps are next to each other in the pipeline they are fused into a single
+`FusedCharMap` step, so each item is handled with one call instead of one call
+per step. The output is the same as running the steps one after another.
+
+ASCII text is converted with a single `str.translate` pass for each run of
+steps between `remove_whitespace` steps. Other text runs the steps in order,
+with the translation tables of adjacent steps merged into one table.
+`str.lower` is not a character map for all unicode text (for example the
+final sigma), so the merged ASCII table is only used for ASCII text.
+
+This step is built by the pipeline and is not set in the config.
+
+Example:
+    .. code-block::
+
+        from data_preprocessing import DataPreprocess
+
+        config = {
+            "data_loader": {
+                "type": "single_item",
+                "batch_size": 10
+            },
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO",
+                },
+                {
+                    "name": "normalize_text",
+                    "type": "remove_punctuation",
+                    "log_level": "INFO",
+                }
+            ]
+        }
+        # The two steps run as one fused step
+        process = DataPreprocess(config)
+        data = "Sentences TO CleAn!"
+        data = process.process_item(data)
+"""
+from data_preprocessing.steps.base import Steps
+
+CHAR_STEPS = [
+    "lowercase",
+    "remove_digits",
+    "remove_punctuation",
+    "remove_whitespace"
+]
+
+
+class FusedCharMap(Steps):
+    """Fused character map step class.
+
+    Args:
+        config (json): Json object containing the configuration details, the
+            key `steps` contains the step objects to fuse
+
+    Example:
+        .. code-block::
+
+            # config built by the pipeline
+            config = {
+                "name": "normalize_text",
+                "type": "fused_char_map",
+                "log_level": "INFO",
+                "tokenizer": tokenizer,
+                "steps": [lowercase_step, remove_digits_step]
+            }
+    """
+    def __init__(self, config):
+        super().__init__(config)
+        self._steps = config["steps"]
+        self._segments = self._compile()
+
+    def process(self, item):
+        """Process item - Run the fused steps on the item data.
+
+        Args:
+            item (dict): item
+        Returns:
+            dict: Returns the updated item
+        """
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Process batch - Run the fused steps on the data of each item.
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        self._log.debug("Fused Char Map Step ({}) - {} items".format(
+                ", ".join(step._config["type"] for step in self._steps),
+                len(items)
+            )
+        )
+        segments = self._segments
+        for item in items:
+            try:
+                text = item["data"]
+                if text.isascii():
+                    for ascii_table, _, whitespace in segments:
+                        text = text.translate(ascii_table)
+                        if whitespace:
+                            text = " ".join(text.split())
+                else:
+                    for _, ops, whitespace in segments:
+                        for table in ops:
+                            if table is None:
+                                text = text.lower()
+                            else:
+                                text = text.translate(table)
+                        if whitespace:
+                            text = " ".join(text.split())
+                item["data"] = text
+            except Exception as e:
+                self._log.error(
+                    "Error in fused char map (item id:{}) - {}".format(
+                        item["id"],
+                        e
+                    )
+                )
+        return items
+
+    def _stats_name(self):
+        """Get the name of the step used in the pipeline stats.
+
+        Returns:
+            str: Names of the fused steps
+        """
+        return "+".join(step._config["type"] for step in self._steps)
+
+    def _compile(self):
+        """Compile the fused steps into segments.
+
+        Each segment is a tuple with the merged ASCII table, the list of
+        operations for non ASCII text and a flag to remove whitespace at the
+        end of the segment. An operation is a translation table, or None for
+        lowercase.
+
+        Returns:
+            list: segments
+        """
+        segments = []
+        ops = []
+        for step in self._steps:
+            step_type = step._config["type"]
+            if step_type == "remove_whitespace":
+                segments.append(self._segment(ops, True))
+                ops = []
+            elif step_type == "lowercase":
+                ops.append(None)
+            elif ops and ops[-1] is not None:
+                ops[-1] = _merge_tables(ops[-1], step._table)
+            else:
+                ops.append(_merge_tables({}, step._table))
+        if ops:
+            segments.append(self._segment(ops, False))
+        return segments
+
+    def _segment(self, ops, whitespace):
+        """Build a segment with the merged ASCII table.
+
+        Args:
+            ops (list): Translation tables or None for lowercase
+            whitespace (bool): Remove whitespace after the operations
+        Returns:
+            tuple: segment
+        """
+        ascii_table = {}
+        for code in range(128):
+            char = chr(code)
+            text = char
+            for table in ops:
+                if table is None:
+                    text = text.lower()
+                else:
+                    text = text.translate(table)
+            if text != char:
+                ascii_table[code] = text
+        return ascii_table, ops, whitespace
+
+
+def _merge_tables(first, second):
+    """Merge two translation tables into one table.
+
+    Translating with the merged table is the same as translating with the
+    first table and then the second table.
+
+    Args:
+        first (dict): Translation table applied first
+        second (dict): Translation table applied second
+    Returns:
+        dict: Merged translation table with string values
+    """
+    merged = {}
+    for code, value in first.items():
+        if value is None:
+            value = ""
+        elif isinstance(value, int):
+            value = chr(value)
+        merged[code] = value.translate(second)
+    for code, value in second.items():
+        if code in merged:
+            continue
+        if value is None:
+            value = ""
+        elif isinstance(value, int):
+            value = chr(value)
+        merged[code] = value
+    return merged
+
+
+def fuse_char_steps(steps):
+    """Fuse runs of adjacent character steps into `FusedCharMap` steps.
+
+    Args:
+        steps (list): Step objects of the pipeline
+    Returns:
+        list: Step objects with the runs of character steps fused
+    """
+    fused = []
+    run = []
+    for step in steps + [None]:
+        if step is not None and step._config.get("type") in CHAR_STEPS:
+            run.append(step)
+            continue
+        if len(run) > 1:
+            fused.append(FusedCharMap({
+                "name": "normalize_text",
+                "type": "fused_char_map",
+                "log_level": run[0]._config.get("log_level"),
+                "tokenizer": run[0]._config.get("tokenizer"),
+                "steps": run
+            }))
+        else:
+            fused.extend(run)
+        run = []
+        if step is not None:
+            fused.append(step)
+    return fused
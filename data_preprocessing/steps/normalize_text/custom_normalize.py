@@ -5,7 +5,11 @@ you must create a class with a method called process that takes one argument
 for the data. You must return the item in order for it to finish through the
 remainder of the pipeline. In your config you must add the key `custom_class`
 that contains the custom class object. The config type must be set to
-`custom_normalize`
+`custom_normalize`. The custom class can also define a `process_batch` method
+that takes a list of items and returns the list of updated items, it is used
+instead of `process` when the pipeline processes data in batches. The custom
+class is shared by all the threads of `threaded_process_data`, so it must be
+thread safe when used with threads.
 
 Example:
     .. code-block::
@@ -71,14 +75,38 @@ class CustomNormalize(Steps):
         Returns:
             dict: Returns the updated item
         """
-        try:
-            self._log.debug("Custom Step")
-            item = self.custom_module.process(item)
-        except Exception as e:
-            self._log.error(
-                "Error in custom step (item id:{}) - {}".format(
-                    item["id"],
-                    e
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Process batch - Custom processing step.
+
+        If the custom class defines a `process_batch` method the whole batch
+        is passed to it, otherwise `process` is called for each item.
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        self._log.debug("Custom Step - {} items".format(len(items)))
+        if hasattr(self.custom_module, "process_batch"):
+            try:
+                return self.custom_module.process_batch(items)
+            except Exception as e:
+                self._log.error(
+                    "Error in custom step batch - {}".format(e)
+                )
+                return items
+        processed = []
+        for item in items:
+            try:
+                item = self.custom_module.process(item)
+            except Exception as e:
+                self._log.error(
+                    "Error in custom step (item id:{}) - {}".format(
+                        item["id"],
+                        e
+                    )
                 )
-            )
-        return item
+            processed.append(item)
+        return processed
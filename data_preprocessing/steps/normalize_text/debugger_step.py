@@ -67,15 +67,30 @@ class DebuggerStep(Steps):
         Returns:
             dict: Returns the updated item
         """
-        try:
-            self._log.warning("---------------Debugger Step---------------")
-            self._log.warning(item["data"])
-            self._log.warning("--------------------End--------------------")
-        except Exception as e:
-            self._log.error(
-                "Error debugging (item id:{}) - {}".format(
-                    item["id"],
-                    e
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Debugging step to log the text of each item.
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        for item in items:
+            try:
+                self._log.warning(
+                    "---------------Debugger Step---------------"
+                )
+                self._log.warning(item["data"])
+                self._log.warning(
+                    "--------------------End--------------------"
+                )
+            except Exception as e:
+                self._log.error(
+                    "Error debugging (item id:{}) - {}".format(
+                        item["id"],
+                        e
+                    )
                 )
-            )
-        return item
+        return items
@@ -63,20 +63,46 @@ class ExpandContractions(Steps):
         Returns:
             dict: Returns the updated item
         """
-        try:
-            self._log.debug("Expand Contractions Step")
-            text = regexp_tokenize(item["data"], pattern="\s+", gaps=True)  # noqa
+        return self.process_batch([item])[0]
 
-            for index, word in enumerate(text):
-                if CONTRACTIONS.get(word):
-                    text[index] = CONTRACTIONS[word]
+    def process_batch(self, items):
+        """Process batch - Expand Contractions step.
 
-            item["data"] = " ".join(text)
-        except Exception as e:
-            self._log.error(
-                "Error debugging (item id:{}) - {}".format(
-                    item["id"],
-                    e
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        self._log.debug(
+            "Expand Contractions Step - {} items".format(len(items))
+        )
+        for item in items:
+            try:
+                text = item["data"]
+                if not isinstance(text, list):
+                    text = regexp_tokenize(
+                        text, pattern=r"\s+", gaps=True
+                    )
+
+                # Split the expanded words so the tokens have no whitespace
+                tokens = []
+                for word in text:
+                    if CONTRACTIONS.get(word):
+                        tokens.extend(CONTRACTIONS[word].split())
+                    else:
+                        tokens.append(word)
+
+                item["data"] = self._join_tokens(tokens)
+            except Exception as e:
+                self._log.error(
+                    "Error debugging (item id:{}) - {}".format(
+                        item["id"],
+                        e
+                    )
                 )
-            )
-        return item
+                self._join_failed(item)
+        return items
+
+    def _whitespace_tokens(self):
+        """The tokens are split on whitespace."""
+        return True
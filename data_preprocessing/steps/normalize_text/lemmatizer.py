@@ -59,16 +59,40 @@ class Lemmatizer(Steps):
         Returns:
             dict: Returns the updated item
         """
-        try:
-            self._log.debug("Lemmatizer Step")
-            text = regexp_tokenize(item["data"], pattern="\s+", gaps=True)
-            text = " ".join([self._lemmatizer.lemmatize(w) for w in text])
-            item["data"] = text
-        except Exception as e:
-            self._log.error(
-                "Error with lemmatizer on item id:{} - {}".format(
-                    item["id"],
-                    e
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Process batch - Reduce inflectional forms to a common base form.
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        self._log.debug("Lemmatizer Step - {} items".format(len(items)))
+        lemmatize = self._lemmatizer.lemmatize
+        for item in items:
+            try:
+                text = item["data"]
+                if not isinstance(text, list):
+                    text = regexp_tokenize(text, pattern=r"\s+", gaps=True)
+                item["data"] = self._join_tokens(
+                    [lemmatize(w) for w in text]
+                )
+            except Exception as e:
+                self._log.error(
+                    "Error with lemmatizer on item id:{} - {}".format(
+                        item["id"],
+                        e
+                    )
                 )
-            )
-        return item
+                self._join_failed(item)
+        return items
+
+    def warm_up(self):
+        """Load the WordNet corpus, it is loaded lazily on first use."""
+        self._lemmatizer.lemmatize("warm")
+
+    def _whitespace_tokens(self):
+        """The tokens are split on whitespace."""
+        return True
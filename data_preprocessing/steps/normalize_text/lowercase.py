@@ -55,14 +55,25 @@ class NormalizeLowerCase(Steps):
         Returns:
             dict: Returns the updated item
         """
-        try:
-            self._log.debug("Lowercase Step")
-            item["data"] = item["data"].lower()
-        except Exception as e:
-            self._log.error(
-                "Error converting (item id:{}) to lowercase - {}".format(
-                    item["id"],
-                    e
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Process batch - Convert the data of each item to lowercase.
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        self._log.debug("Lowercase Step - {} items".format(len(items)))
+        for item in items:
+            try:
+                item["data"] = item["data"].lower()
+            except Exception as e:
+                self._log.error(
+                    "Error converting (item id:{}) to lowercase - {}".format(
+                        item["id"],
+                        e
+                    )
                 )
-            )
-        return item
+        return items
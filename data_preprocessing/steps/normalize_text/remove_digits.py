@@ -47,6 +47,7 @@ class RemoveDigits(Steps):
     """
     def __init__(self, config):
         super().__init__(config)
+        self._table = str.maketrans('', '', digits)
 
     def process(self, item):
         """Process item - remove digits from text
@@ -56,15 +57,25 @@ class RemoveDigits(Steps):
         Returns:
             dict: Returns the updated item
         """
-        try:
-            self._log.debug("Remove Digits Step")
-            remove_digits = str.maketrans('', '', digits)
-            item["data"] = item["data"].translate(remove_digits)
-        except Exception as e:
-            self._log.error(
-                "Error removing digits from item id:{} - {}".format(
-                    item["id"],
-                    e
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Process batch - remove digits from the text of each item
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        self._log.debug("Remove Digits Step - {} items".format(len(items)))
+        for item in items:
+            try:
+                item["data"] = item["data"].translate(self._table)
+            except Exception as e:
+                self._log.error(
+                    "Error removing digits from item id:{} - {}".format(
+                        item["id"],
+                        e
+                    )
                 )
-            )
-        return item
+        return items
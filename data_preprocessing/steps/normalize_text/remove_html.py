@@ -70,17 +70,28 @@ class RemoveHtml(Steps):
         Returns:
             dict: Returns the updated item
         """
-        try:
-            self._log.debug("Remove HTML Step")
-            item["data"] = self._strip_html(item["data"])
-        except Exception as e:
-            self._log.error(
-                "Error removing html from item id:{} - {}".format(
-                    item["id"],
-                    e
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Process batch - remove html from the text of each item
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        self._log.debug("Remove HTML Step - {} items".format(len(items)))
+        for item in items:
+            try:
+                item["data"] = self._strip_html(item["data"])
+            except Exception as e:
+                self._log.error(
+                    "Error removing html from item id:{} - {}".format(
+                        item["id"],
+                        e
+                    )
                 )
-            )
-        return item
+        return items
 
     def _strip_html(self, html):
         """ Strip html using the _RemoveHtmlParser class.
@@ -48,6 +48,7 @@ class RemovePunctuation(Steps):
     """
     def __init__(self, config):
         super().__init__(config)
+        self._table = str.maketrans(punctuation, ' '*len(punctuation))
 
     def process(self, item):
         """Process item - remove punctuation from text
@@ -57,17 +58,27 @@ class RemovePunctuation(Steps):
         Returns:
             dict: Returns the updated item
         """
-        try:
-            self._log.debug("Remove Punctuation Step")
-            remove_punctuation = str.maketrans(
-                punctuation, ' '*len(punctuation)
-            )
-            item["data"] = item["data"].translate(remove_punctuation)
-        except Exception as e:
-            self._log.error(
-                "Error removing punctuation from item id:{} - {}".format(
-                    item["id"],
-                    e
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Process batch - remove punctuation from the text of each item
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        self._log.debug(
+            "Remove Punctuation Step - {} items".format(len(items))
+        )
+        for item in items:
+            try:
+                item["data"] = item["data"].translate(self._table)
+            except Exception as e:
+                self._log.error(
+                    "Error removing punctuation from item id:{} - {}".format(
+                        item["id"],
+                        e
+                    )
                 )
-            )
-        return item
+        return items
@@ -81,20 +81,39 @@ class RemoveStopWords(Steps):
         Returns:
             dict: Returns the updated item
         """
-        try:
-            self._log.debug("Remove Stop Words Step - using {}".format(
-                    self._config.get("options")
-                )
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """
+        Process batch - remove stop words from the text of each item
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        self._log.debug("Remove Stop Words Step - using {} - {} items".format(
+                self._config.get("options"),
+                len(items)
             )
-            item = self._tokenizer.process(item)
-            item_text = [i for i in item["data"] if i not in self._stop_words]
-            item_text = " ".join(item_text)
-            item["data"] = item_text
-        except Exception as e:
-            self._log.error(
-                "Error removing stopwords from item id:{} - {}".format(
-                    item["id"],
-                    e
+        )
+        items = self._tokenize_batch(items)
+        for item in items:
+            try:
+                item_text = [
+                    i for i in item["data"] if i not in self._stop_words
+                ]
+                item["data"] = self._join_tokens(item_text)
+            except Exception as e:
+                self._log.error(
+                    "Error removing stopwords from item id:{} - {}".format(
+                        item["id"],
+                        e
+                    )
                 )
-            )
-        return item
+                self._join_failed(item)
+        return items
+
+    def _whitespace_tokens(self):
+        """The tokens are split on whitespace if the tokenizer does."""
+        return self._tokenizer._whitespace_tokens()
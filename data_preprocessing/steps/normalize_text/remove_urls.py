@@ -51,7 +51,10 @@ class RemoveUrls(Steps):
     """
     def __init__(self, config):
         super().__init__(config)
-        self._regex = r'(?:(?:http|https):\/\/)?([-a-zA-Z0-9.]{2,256}\.[a-z]{2,4})\b(?:\/[-a-zA-Z0-9@:%_\+.~#?&//=]*)?'  # noqa
+        self._regex = re.compile(
+            r'(?:(?:http|https):\/\/)?([-a-zA-Z0-9.]{2,256}\.[a-z]{2,4})\b(?:\/[-a-zA-Z0-9@:%_\+.~#?&//=]*)?',  # noqa
+            flags=re.DOTALL | re.MULTILINE | re.IGNORECASE
+        )
 
     def process(self, item):
         """Process item - remove urls from the items data
@@ -61,35 +64,36 @@ class RemoveUrls(Steps):
         Returns:
             dict: Updated item
         """
-        try:
-            self._log.debug("Remove Urls Step")
-            save_urls = self._config.get("save_urls", "no")
-            item_data = item["data"]
-            if save_urls == "yes":
-                urls = []
-                regex_iter = re.finditer(
-                    self._regex,
-                    item_data,
-                    flags=re.DOTALL | re.MULTILINE | re.IGNORECASE
-                )
-                for url in regex_iter:
-                    url = url[0]
-                    urls.append(url)
-                    item_data = item_data.replace(url, "")
-                item["tags"]["urls"] = urls
-            else:
-                item_data = re.sub(
-                    self._regex,
-                    "",
-                    item_data,
-                    flags=re.DOTALL | re.MULTILINE | re.IGNORECASE
-                )
-            item["data"] = item_data
-        except Exception as e:
-            self._log.error(
-                "Error removing urls from item id:{} - {}".format(
-                    item["id"],
-                    e
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Process batch - remove urls from the data of each item
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Updated items
+        """
+        self._log.debug("Remove Urls Step - {} items".format(len(items)))
+        save_urls = self._config.get("save_urls", "no")
+        for item in items:
+            try:
+                item_data = item["data"]
+                if save_urls == "yes":
+                    urls = []
+                    for url in self._regex.finditer(item_data):
+                        url = url[0]
+                        urls.append(url)
+                        item_data = item_data.replace(url, "")
+                    item["tags"]["urls"] = urls
+                else:
+                    item_data = self._regex.sub("", item_data)
+                item["data"] = item_data
+            except Exception as e:
+                self._log.error(
+                    "Error removing urls from item id:{} - {}".format(
+                        item["id"],
+                        e
+                    )
                 )
-            )
-        return item
+        return items
@@ -56,17 +56,30 @@ class RemoveWhiteSpace(Steps):
         Returns:
             dict: Returns the updated item
         """
-        try:
-            self._log.debug("Remove Whitespace Step")
-            item_text = item["data"].strip()
-            item_text = item_text.replace("\n", " ").replace("\r", " ")
-            item_text = " ".join(item_text.split())
-            item["data"] = item_text
-        except Exception as e:
-            self._log.error(
-                "Error removing whitespace from item id:{} - {}".format(
-                    item["id"],
-                    e
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Process batch - remove whitespace from the text of each item
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        self._log.debug(
+            "Remove Whitespace Step - {} items".format(len(items))
+        )
+        for item in items:
+            try:
+                item_text = item["data"].strip()
+                item_text = item_text.replace("\n", " ").replace("\r", " ")
+                item_text = " ".join(item_text.split())
+                item["data"] = item_text
+            except Exception as e:
+                self._log.error(
+                    "Error removing whitespace from item id:{} - {}".format(
+                        item["id"],
+                        e
+                    )
                 )
-            )
-        return item
+        return items
@@ -68,21 +68,37 @@ class NLTKSnowballStemmer(Steps):
         Returns:
             dict: Returns the updated item
         """
-        try:
-            self._log.debug("Snowball Stemmer Step")
-            item = self._tokenizer.process(item)
-            text = " ".join(
-                [self._snowball_stemmer.stem(w) for w in item["data"]]
-            )
-            item["data"] = text
-        except Exception as e:
-            self._log.error(
-                "Error stemming from item id:{} - {}".format(
-                    item["id"],
-                    e
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Process Batch - Stem the words of each item into their root word.
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        self._log.debug("Snowball Stemmer Step - {} items".format(len(items)))
+        items = self._tokenize_batch(items)
+        stem = self._snowball_stemmer.stem
+        for item in items:
+            try:
+                item["data"] = self._join_tokens(
+                    [stem(w) for w in item["data"]]
                 )
-            )
-        return item
+            except Exception as e:
+                self._log.error(
+                    "Error stemming from item id:{} - {}".format(
+                        item["id"],
+                        e
+                    )
+                )
+                self._join_failed(item)
+        return items
+
+    def _whitespace_tokens(self):
+        """The tokens are split on whitespace if the tokenizer does."""
+        return self._tokenizer._whitespace_tokens()
 
     def _validate_config(self):
         """Validate Config"""
@@ -0,0 +1,60 @@
+""" Load Sink Class"""
+
+import importlib
+import inspect
+import uuid
+
+valid_types = {
+    "jsonl": {
+        "path": "data_preprocessing.steps.sinks.jsonl_sink",
+        "class": "JsonlSink"
+    },
+    "csv": {
+        "path": "data_preprocessing.steps.sinks.csv_sink",
+        "class": "CsvSink"
+    },
+    "parquet": {
+        "path": "data_preprocessing.steps.sinks.parquet_sink",
+        "class": "ParquetSink"
+    }
+}
+
+
+def _fetch(config):
+    """Fetch the sink based on the config and return the object.
+
+    Args:
+        config (obj): Object with config for steps
+    Returns:
+        obj .steps.base Steps
+    """
+    try:
+        step_type = config.get("type")
+        module = importlib.import_module(
+            valid_types[step_type]["path"],
+            "data_preprocessing"
+        )
+        class_name = "{c}_{i}".format(
+            c=valid_types[step_type]["class"],
+            i=_create_id()
+        )
+        obj = type(
+            class_name,
+            (getattr(module, valid_types[step_type]["class"]),),
+            {}
+        )
+        if inspect.isclass(obj):
+            return obj(config)
+    except Exception as e:
+        raise ImportError(
+            "Could not import sink Class - {}".format(e)
+        )
+
+
+def _create_id():
+    """Create unique id.
+
+    Returns:
+        str: Random id as a string
+    """
+    return str(uuid.uuid1().int)
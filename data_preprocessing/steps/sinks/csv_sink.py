@@ -0,0 +1,103 @@
+"""Sink - CSV.
+
+Write the processed items to a CSV file. The config type must be set to
+`csv`. The columns are the id and the data, the additional keys of the item
+and the tags as JSON. Items with preserve_original also have the original
+data column. The columns are set by the first item written.
+
+Example:
+    .. code-block::
+
+        from data_preprocessing import DataPreprocess
+
+        config = {
+            "data_loader": {
+                "type": "list",
+                "batch_size": 1000
+            },
+            "sink": {
+                "type": "csv",
+                "file_path": "items.csv",
+                "max_file_size": 2 ** 30
+            },
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO",
+                }
+            ]
+        }
+        with DataPreprocess(config) as process:
+            for _ in process.process_data(data):
+                pass
+"""
+import csv
+import io
+import json
+
+from data_preprocessing.steps.sinks.sink import Sink
+
+
+class CsvSink(Sink):
+    """CSV sink class.
+
+    Args:
+        config (json): Json object containing the configuration details
+
+    Example:
+        .. code-block::
+
+            config = {
+                "type": "csv",
+                "file_path": "items.csv",
+                "log_level": "INFO"
+            }
+    """
+    def __init__(self, config):
+        self._columns = None
+        self._additional_keys = []
+        super().__init__(config)
+
+    def _serialize(self, items):
+        """Serialize the items as CSV rows.
+
+        Args:
+            items (list): List of items
+        Returns:
+            bytes: Serialized items
+        """
+        if self._columns is None and items:
+            self._set_columns(items[0])
+        text = io.StringIO()
+        writer = csv.writer(text)
+        for item in items:
+            row = [item.get("id"), item.get("data")]
+            additional = item.get("additional_keys") or {}
+            row += [additional.get(key) for key in self._additional_keys]
+            row.append(json.dumps(item.get("tags") or {}, ensure_ascii=False))
+            if "original_data" in self._columns:
+                row.append(item.get("original_data"))
+            writer.writerow(row)
+        return text.getvalue().encode("utf-8")
+
+    def _header(self):
+        """Get the header row of the CSV file.
+
+        Returns:
+            bytes: Header
+        """
+        text = io.StringIO()
+        csv.writer(text).writerow(self._columns)
+        return text.getvalue().encode("utf-8")
+
+    def _set_columns(self, item):
+        """Set the columns from the first item.
+
+        Args:
+            item (dict): item
+        """
+        self._additional_keys = list(item.get("additional_keys") or {})
+        self._columns = ["id", "data"] + self._additional_keys + ["tags"]
+        if "original_data" in item:
+            self._columns.append("original_data")
@@ -0,0 +1,79 @@
+"""Sink - JSON lines.
+
+Write each processed item as a line of JSON. The config type must be set to
+`jsonl`.
+
+Example:
+    .. code-block::
+
+        from data_preprocessing import DataPreprocess
+
+        config = {
+            "data_loader": {
+                "type": "list",
+                "batch_size": 1000
+            },
+            "sink": {
+                "type": "jsonl",
+                "file_path": "items.jsonl.gz",
+                "compression": "gzip"
+            },
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO",
+                }
+            ]
+        }
+        with DataPreprocess(config) as process:
+            for _ in process.process_data(data):
+                pass
+"""
+import json
+
+from data_preprocessing.steps.sinks.sink import Sink
+
+
+class JsonlSink(Sink):
+    """JSON lines sink class.
+
+    Args:
+        config (json): Json object containing the configuration details
+
+    Example:
+        .. code-block::
+
+            config = {
+                "type": "jsonl",
+                "file_path": "items.jsonl",
+                "log_level": "INFO"
+            }
+    """
+    def _serialize(self, items):
+        """Serialize the items as JSON lines.
+
+        Args:
+            items (list): List of items
+        Returns:
+            bytes: Serialized items
+        """
+        lines = [
+            json.dumps(item, ensure_ascii=False, default=_to_json)
+            for item in items
+        ]
+        lines.append("")
+        return "\n".join(lines).encode("utf-8")
+
+
+def _to_json(value):
+    """Convert a value that is not JSON, like the numpy numbers of pandas.
+
+    Args:
+        value (obj): Value
+    Returns:
+        obj: JSON value
+    """
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
@@ -0,0 +1,164 @@
+"""Sink - Parquet.
+
+Write the processed items to a Parquet file, this sink needs the `pyarrow`
+package. The config type must be set to `parquet`. Each buffer is written as
+a row group. The compression is the Parquet codec, like `zstd`, `gzip` or
+`snappy`. The tags and additional keys are written as JSON text columns.
+
+Example:
+    .. code-block::
+
+        from data_preprocessing import DataPreprocess
+
+        config = {
+            "data_loader": {
+                "type": "list",
+                "batch_size": 1000
+            },
+            "sink": {
+                "type": "parquet",
+                "file_path": "items.parquet",
+                "compression": "zstd",
+                "buffer_size": 64 * 2 ** 20
+            },
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO",
+                }
+            ]
+        }
+        with DataPreprocess(config) as process:
+            for _ in process.process_data(data):
+                pass
+"""
+import json
+import os
+
+from data_preprocessing.steps.sinks.sink import Sink
+from data_preprocessing.utils.stats import data_size
+
+
+class ParquetSink(Sink):
+    """Parquet sink class.
+
+    Args:
+        config (json): Json object containing the configuration details
+
+    Example:
+        .. code-block::
+
+            config = {
+                "type": "parquet",
+                "file_path": "items.parquet",
+                "log_level": "INFO"
+            }
+    """
+    def __init__(self, config):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("The parquet sink needs the pyarrow package!")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._schema = None
+        self._parquet_writer = None
+        super().__init__(config)
+
+    def _encode(self, items):
+        """Build the rows of a batch before it is queued for the writer.
+
+        Args:
+            items (list): List of items
+        Returns:
+            tuple: Rows and size of the items
+        """
+        return [self._row(item) for item in items], data_size(items)
+
+    def _write_data(self, data):
+        """Buffer the rows of a batch and write them when the buffer is full.
+
+        Args:
+            data (tuple): Rows and size of the items
+        """
+        rows, size = data
+        self._buffer.extend(rows)
+        self._buffered += size
+        if self._buffered >= self._buffer_size:
+            self._flush()
+
+    def _write_buffer(self, buffer):
+        """Write the buffered rows as a row group.
+
+        Args:
+            buffer (list): Rows
+        """
+        table = self._pa.Table.from_pylist(buffer, schema=self._schema)
+        if self._parquet_writer is None:
+            self._schema = table.schema
+            self._parquet_writer = self._pq.ParquetWriter(
+                self._raw,
+                self._schema,
+                compression=self._compression or "none"
+            )
+        self._parquet_writer.write_table(table)
+
+    def commit(self):
+        """Write all the items to disk for a checkpoint.
+
+        Parquet files can not be appended to, the file is closed and the
+        next items are written to a new file.
+
+        Returns:
+            dict: The files, the size is always None
+        """
+        if self._thread is not None:
+            self._queue.join()
+        self._raise_error()
+        self._flush()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if self._raw is not None:
+            self._raw.flush()
+            os.fsync(self._raw.fileno())
+            self._close_file()
+        return {"files": list(self.files), "size": None}
+
+    def _open_file(self):
+        """Open the next file, the Parquet writer compresses the data."""
+        path = self._next_path()
+        self._raw = open(path, "wb")
+        self._file = self._raw
+        self.files.append(path)
+
+    def _close_file(self):
+        """Close the Parquet writer and the file."""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        super()._close_file()
+
+    def _row(self, item):
+        """Build a row from an item.
+
+        Args:
+            item (dict): item
+        Returns:
+            dict: Row
+        """
+        row = {
+            "id": item.get("id"),
+            "data": item.get("data"),
+            "tags": json.dumps(item.get("tags") or {}, ensure_ascii=False)
+        }
+        if "additional_keys" in item:
+            row["additional_keys"] = json.dumps(
+                item["additional_keys"],
+                ensure_ascii=False
+            )
+        if "original_data" in item:
+            row["original_data"] = item["original_data"]
+        return row
@@ -0,0 +1,343 @@
+"""Sink - Base class for the sinks.
+
+A sink writes the processed items to files. The sink is set with the `sink`
+key of the config, next to the `data_loader`. Every batch returned by
+`process_item`, `process_data`, `multiprocess_data` and `aprocess_data` is
+written to the sink, and the sink is closed by `disconnect`.
+
+Each batch is serialized when it is passed to the sink, before it is
+yielded, so the items can be changed in the loop. The serialized data is
+compressed and written by a background thread, so disk I/O overlaps with
+processing. Serialized items are buffered and written to the file in blocks
+of `buffer_size` bytes. The files can be compressed with `gzip` or `zstd`
+(needs the `zstandard` package). With `max_file_size` set a new file is
+started when the file reaches the size, the files are named with a number
+after the name of the file, from `items-00000.jsonl.gz`.
+
+Checkpoints of the data loader commit the sink first, see
+`data_preprocessing.utils.checkpoint`. The buffered items are written, the
+compressed stream is ended and the file is synced to disk. A resumed run cuts
+the last file back to the committed size and appends to it.
+
+Example:
+    .. code-block::
+
+        from data_preprocessing import DataPreprocess
+
+        config = {
+            "data_loader": {
+                "type": "list",
+                "batch_size": 1000
+            },
+            "sink": {
+                "type": "jsonl",
+                "file_path": "items.jsonl.gz",
+                "compression": "gzip",  # default is no compression
+                "max_file_size": 2 ** 30,  # default is one file
+                "buffer_size": 2 ** 20,  # default is 1 MB
+                "background": True  # default is True
+            },
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO",
+                }
+            ]
+        }
+        with DataPreprocess(config) as process:
+            for _ in process.multiprocess_data(data, workers=4):
+                pass
+"""
+
+import gzip
+import os
+import queue
+import threading
+
+from data_preprocessing.steps.base import Steps
+
+DEFAULT_BUFFER_SIZE = 2 ** 20
+DEFAULT_QUEUE_SIZE = 8
+
+
+class Sink(Steps):
+    """Base class of the sinks.
+
+    Sinks implement `_serialize` to turn a batch of items into bytes, and
+    `_header` for the bytes written at the start of each file.
+
+    Args:
+        config (json): Json object containing the configuration details
+    """
+    def __init__(self, config):
+        super().__init__(config)
+        self.files = []
+        self._path = config["file_path"]
+        self._compression = config.get("compression")
+        self._max_file_size = config.get("max_file_size")
+        self._buffer_size = config.get("buffer_size") or DEFAULT_BUFFER_SIZE
+        self._buffer = []
+        self._buffered = 0
+        self._raw = None
+        self._file = None
+        self._error = None
+        self._queue = None
+        self._thread = None
+        if config.get("background", True):
+            self._queue = queue.Queue(
+                config.get("queue_size") or DEFAULT_QUEUE_SIZE
+            )
+            self._thread = threading.Thread(
+                target=self._writer,
+                name="data_preprocess_sink",
+                daemon=True
+            )
+            self._thread.start()
+
+    def process(self, item):
+        """Process item - Write the item.
+
+        Args:
+            item (dict): item
+        Returns:
+            dict: Returns the item
+        """
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Process batch - Write the items.
+
+        The batch is serialized by the caller. With the background writer
+        the serialized batch is put on the queue of the writer, this blocks
+        when the writer is behind by `queue_size` batches.
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the items
+        """
+        self._raise_error()
+        data = self._encode(items)
+        if self._queue is None:
+            self._write_data(data)
+        else:
+            self._queue.put(data)
+        return items
+
+    def commit(self):
+        """Write all the items to disk for a checkpoint.
+
+        Returns:
+            dict: The files and the size of the last file, or None for the
+                size when the last file is closed
+        """
+        if self._thread is not None:
+            self._queue.join()
+        self._raise_error()
+        self._flush()
+        if self._file is None:
+            return {"files": list(self.files), "size": None}
+        if self._file is not self._raw:
+            # End the compressed stream, a new one is appended after it
+            self._file.close()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        size = self._raw.tell()
+        if self._file is not self._raw:
+            self._file = _compressor(self._raw, self._compression)
+        return {"files": list(self.files), "size": size}
+
+    def restore(self, state):
+        """Continue the files of a checkpoint.
+
+        The last file is cut back to the committed size, files started after
+        the checkpoint are removed.
+
+        Args:
+            state (dict): State returned by `commit`
+        """
+        self.files = list(state["files"])
+        index = len(self.files)
+        while self._max_file_size:
+            path = self._numbered_path(index)
+            if not os.path.exists(path):
+                break
+            os.remove(path)
+            index += 1
+        if state["size"] is None or not self.files:
+            return
+        self._raw = open(self.files[-1], "r+b")
+        self._raw.truncate(state["size"])
+        self._raw.seek(state["size"])
+        self._file = _compressor(self._raw, self._compression)
+
+    def close(self):
+        """Write the buffered items and close the file."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        try:
+            if self._error is None:
+                self._flush()
+        finally:
+            self._close_file()
+        self._raise_error()
+        self._log.info("Items written to {}".format(", ".join(self.files)))
+
+    def _serialize(self, items):
+        """Serialize a batch of items.
+
+        Args:
+            items (list): List of items
+        Returns:
+            bytes: Serialized items
+        """
+        raise NotImplementedError
+
+    def _encode(self, items):
+        """Serialize a batch before it is queued for the writer.
+
+        Args:
+            items (list): List of items
+        Returns:
+            obj: Data of the batch, passed to `_write_data`
+        """
+        return self._serialize(items)
+
+    def _header(self):
+        """Get the bytes written at the start of each file.
+
+        Returns:
+            bytes: Header
+        """
+        return b""
+
+    def _writer(self):
+        """Background thread that writes the batches from the queue."""
+        while True:
+            data = self._queue.get()
+            if data is None:
+                break
+            try:
+                if self._error is None:
+                    self._write_data(data)
+            except Exception as e:
+                self._log.error("Error writing items - {}".format(e))
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        """Raise the error of the background writer in the caller."""
+        if self._error is not None:
+            error = self._error
+            self._error = None
+            raise error
+
+    def _write_data(self, data):
+        """Buffer a serialized batch and write the buffer when it is full.
+
+        Args:
+            data (bytes): Serialized items
+        """
+        self._buffer.append(data)
+        self._buffered += len(data)
+        if self._buffered >= self._buffer_size:
+            self._flush()
+
+    def _flush(self):
+        """Write the buffer to the file and start a new file when full."""
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._open_file()
+        self._write_buffer(self._buffer)
+        self._buffer = []
+        self._buffered = 0
+        if self._max_file_size and self._raw.tell() >= self._max_file_size:
+            self._close_file()
+
+    def _write_buffer(self, buffer):
+        """Write the buffered data to the open file.
+
+        Args:
+            buffer (list): Serialized batches
+        """
+        self._file.write(b"".join(buffer))
+
+    def _open_file(self):
+        """Open the next file."""
+        path = self._next_path()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._raw = open(path, "wb")
+        self._file = _compressor(self._raw, self._compression)
+        self.files.append(path)
+        header = self._header()
+        if header:
+            self._file.write(header)
+
+    def _close_file(self):
+        """Close the open file."""
+        if self._file is None:
+            return
+        if self._file is not self._raw:
+            self._file.close()
+        self._raw.close()
+        self._file = None
+        self._raw = None
+
+    def _next_path(self):
+        """Path of the next file.
+
+        Returns:
+            str: The file path, with a number when files are rotated or a
+                file was already written
+        """
+        if not self._max_file_size and not self.files:
+            return self._path
+        return self._numbered_path(len(self.files))
+
+    def _numbered_path(self, index):
+        """Path of a file with a number after the name.
+
+        Args:
+            index (int): Number of the file
+        Returns:
+            str: The file path
+        """
+        directory, name = os.path.split(self._path)
+        stem, dot, extension = name.partition(".")
+        return os.path.join(directory, "{}-{:05d}{}{}".format(
+            stem,
+            index,
+            dot,
+            extension
+        ))
+
+
+def _compressor(raw, compression):
+    """Wrap a file in a compressor.
+
+    Args:
+        raw (obj): Binary file
+        compression (str): `gzip`, `zstd` or None
+    Returns:
+        obj: File to write to
+    """
+    if not compression:
+        return raw
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(
+                "The zstd compression needs the zstandard package!"
+            )
+        return zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+    raise ValueError("Unknown compression {}".format(compression))
@@ -54,15 +54,32 @@ class TokenizeNLTKRegex(Steps):
         Returns:
             dict: Returns the updated item
         """
-        try:
-            self._log.debug("NLTK Regex Tokenize Step")
-            text = regexp_tokenize(item["data"], pattern="\s+", gaps=True)
-            item["data"] = text
-        except Exception as e:
-            self._log.error(
-                "Error in NLTK Regex Tokenize from item id:{} - {}".format(
-                    item["id"],
-                    e
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Process Batch - Tokenize the text of each item into tokens.
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        self._log.debug(
+            "NLTK Regex Tokenize Step - {} items".format(len(items))
+        )
+        for item in items:
+            try:
+                text = regexp_tokenize(item["data"], pattern=r"\s+", gaps=True)
+                item["data"] = text
+            except Exception as e:
+                self._log.error(
+                    "Error in NLTK Regex Tokenize from item id:{} - {}".format(
+                        item["id"],
+                        e
+                    )
                 )
-            )
-        return item
+        return items
+
+    def _whitespace_tokens(self):
+        """The tokens are split on whitespace."""
+        return True
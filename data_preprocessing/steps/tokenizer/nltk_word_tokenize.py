@@ -54,14 +54,31 @@ class TokenizeNLTKWord(Steps):
         Returns:
             dict: Returns the updated item
         """
-        try:
-            self._log.debug("NLTK Word Tokenize Step")
-            item["data"] = word_tokenize(item["data"])
-        except Exception as e:
-            self._log.error(
-                "Error in NLTK Word Tokenize from item id:{} - {}".format(
-                    item["id"],
-                    e
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Process Batch - Tokenize the text of each item into tokens.
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        self._log.debug(
+            "NLTK Word Tokenize Step - {} items".format(len(items))
+        )
+        for item in items:
+            try:
+                item["data"] = word_tokenize(item["data"])
+            except Exception as e:
+                self._log.error(
+                    "Error in NLTK Word Tokenize from item id:{} - {}".format(
+                        item["id"],
+                        e
+                    )
                 )
-            )
-        return item
+        return items
+
+    def warm_up(self):
+        """Load the punkt model used by `word_tokenize`."""
+        word_tokenize("Warm up.")
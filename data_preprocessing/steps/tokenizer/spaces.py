@@ -53,14 +53,29 @@ class TokenizeSpaces(Steps):
         Returns:
             dict: Returns the updated item
         """
-        try:
-            self._log.debug("SpacesTokenize Step")
-            item["data"] = item["data"].split()
-        except Exception as e:
-            self._log.error(
-                "Error in Spaces Tokenize from item id:{} - {}".format(
-                    item["id"],
-                    e
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Process Batch - Tokenize the text of each item into tokens.
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        self._log.debug("SpacesTokenize Step - {} items".format(len(items)))
+        for item in items:
+            try:
+                item["data"] = item["data"].split()
+            except Exception as e:
+                self._log.error(
+                    "Error in Spaces Tokenize from item id:{} - {}".format(
+                        item["id"],
+                        e
+                    )
                 )
-            )
-        return item
+        return items
+
+    def _whitespace_tokens(self):
+        """The tokens are split on whitespace."""
+        return True
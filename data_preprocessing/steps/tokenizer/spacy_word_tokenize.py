@@ -55,15 +55,30 @@ class TokenizeSpacyWord(Steps):
         Returns:
             dict: Returns the updated item
         """
-        try:
-            self._log.debug("Spacy Tokenize Step")
-            doc = self._nlp(item["data"])
-            item["data"] = [token.text for token in doc]
-        except Exception as e:
-            self._log.error(
-                "Error in Spacy Tokenize from item id:{} - {}".format(
-                    item["id"],
-                    e
+        return self.process_batch([item])[0]
+
+    def process_batch(self, items):
+        """Process Batch - Tokenize the text of each item into tokens.
+
+        Args:
+            items (list): List of items
+        Returns:
+            list: Returns the updated items
+        """
+        self._log.debug("Spacy Tokenize Step - {} items".format(len(items)))
+        for item in items:
+            try:
+                doc = self._nlp(item["data"])
+                item["data"] = [token.text for token in doc]
+            except Exception as e:
+                self._log.error(
+                    "Error in Spacy Tokenize from item id:{} - {}".format(
+                        item["id"],
+                        e
+                    )
                 )
-            )
-        return item
+        return items
+
+    def _thread_safe(self):
+        """The spacy pipeline is not shared between threads."""
+        return False
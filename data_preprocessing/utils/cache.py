@@ -0,0 +1,333 @@
+"""Result cache for `DataPreprocess`.
+
+The cache is set with the `cache` key of the config. Items are looked up by
+the md5 of their data before they are processed, so repeated texts are only
+processed once. The processed data and tags of an item are stored in an in
+memory LRU tier, limited by `max_size` in bytes. With `path` set the results
+are also stored in a sqlite database, so they are kept between runs.
+
+The results are stored with the fingerprint of the pipeline, a hash of the
+tokenizer and the steps config. The code of the `custom_class` of a custom
+step is part of the fingerprint. Changing the config or the custom code starts
+a new cache, the same database can be shared by many pipelines.
+
+Example:
+    .. code-block::
+
+        config = {
+            "data_loader": {
+                "type": "list",
+                "batch_size": 1000
+            },
+            "cache": {
+                "max_size": 100000000,  # default is 64 MB
+                "path": "results_cache.sqlite"  # optional
+            },
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                }
+            ]
+        }
+        process = DataPreprocess(config)
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict, deque
+
+DEFAULT_MAX_SIZE = 64 * 2 ** 20
+# Maximum number of keys in one sqlite query
+SQL_BATCH = 500
+# Estimate of the memory used by an entry without the text
+ENTRY_SIZE = 200
+
+
+class ResultCache:
+    """Two tier cache of processed items.
+
+    Args:
+        fingerprint (str): Fingerprint of the pipeline
+        max_size (int): Maximum size of the memory tier in bytes
+        path (str): Optional path of the sqlite database
+    """
+    def __init__(self, fingerprint, max_size=DEFAULT_MAX_SIZE, path=None):
+        self.fingerprint = fingerprint
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "fingerprint TEXT, key TEXT, data TEXT, tags TEXT, "
+                "PRIMARY KEY (fingerprint, key))"
+            )
+            self._db.commit()
+
+    def lookup(self, items):
+        """Fill the items found in the cache.
+
+        Args:
+            items (list): Items to process
+        Returns:
+            tuple: Indexes, keys and items that were not found
+        """
+        keys = [_key(item) for item in items]
+        with self._lock:
+            found = {}
+            for key in keys:
+                if key is not None and key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key][0]
+            if self._db is not None:
+                missing = [
+                    key for key in keys
+                    if key is not None and key not in found
+                ]
+                for key, value in self._read(missing):
+                    found[key] = value
+                    self._add(key, value)
+
+        indexes = []
+        miss_keys = []
+        misses = []
+        for index, (key, item) in enumerate(zip(keys, items)):
+            value = found.get(key)
+            if value is None:
+                indexes.append(index)
+                miss_keys.append(key)
+                misses.append(item)
+                continue
+            item["data"], tags = value
+            if tags:
+                item["tags"] = json.loads(tags)
+        self.hits += len(items) - len(misses)
+        self.misses += len(misses)
+        return indexes, miss_keys, misses
+
+    def merge(self, items, indexes, keys, results):
+        """Store the processed items and put them back in the batch.
+
+        Args:
+            items (list): Batch passed to `lookup`
+            indexes (list): Indexes returned by `lookup`
+            keys (list): Keys returned by `lookup`
+            results (list): The items returned by `lookup` after processing
+        Returns:
+            list: The batch with all the items processed
+        """
+        self.store(keys, results)
+        for index, item in zip(indexes, results):
+            items[index] = item
+        return items
+
+    def store(self, keys, items):
+        """Store processed items.
+
+        Args:
+            keys (list): Keys returned by `lookup`
+            items (list): Processed items
+        """
+        rows = []
+        with self._lock:
+            for key, item in zip(keys, items):
+                if key is None:
+                    continue
+                tags = item.get("tags")
+                value = (item.get("data"), json.dumps(tags) if tags else None)
+                self._add(key, value)
+                rows.append((self.fingerprint, key, json.dumps(value[0]),
+                             value[1]))
+            if self._db is not None and rows:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                self._db.commit()
+
+    def close(self):
+        """Close the sqlite database."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _add(self, key, value):
+        """Add an entry to the memory tier and evict the oldest entries.
+
+        Args:
+            key (str): Key of the item
+            value (tuple): Processed data and tags
+        """
+        size = _size(value)
+        if key in self._memory:
+            self.size -= self._memory.pop(key)[1]
+        self._memory[key] = (value, size)
+        self.size += size
+        while self.size > self.max_size and self._memory:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self.size -= evicted
+
+    def _read(self, keys):
+        """Read entries from the sqlite database.
+
+        Args:
+            keys (list): Keys to read
+        Yields:
+            tuple: Key and value
+        """
+        for start in range(0, len(keys), SQL_BATCH):
+            batch = keys[start:start + SQL_BATCH]
+            rows = self._db.execute(
+                "SELECT key, data, tags FROM results WHERE fingerprint = ? "
+                "AND key IN ({})".format(", ".join("?" * len(batch))),
+                [self.fingerprint] + batch
+            )
+            for key, data, tags in rows:
+                yield key, (json.loads(data), tags)
+
+
+class CacheChannel:
+    """Look up chunks in the cache before they are sent to the workers.
+
+    Only the items that are not in the cache are sent on the channel. Chunks
+    with all their items in the cache are returned without being sent. The
+    channel has the same `put` and `get` methods as the worker pool.
+
+    Args:
+        channel (obj): Worker pool or channel to send the items on
+        cache (obj): ResultCache
+    """
+    def __init__(self, channel, cache):
+        self._channel = channel
+        self._cache = cache
+        self._sent = {}
+        self._ready = deque()
+
+    @property
+    def pending(self):
+        """Number of chunks sent and not collected."""
+        return self._channel.pending + len(self._ready)
+
+    def put(self, msg):
+        """Look up a chunk and send the items that are not in the cache.
+
+        Args:
+            msg (tuple): Sequence number and the items to process
+        """
+        seq, items = msg
+        indexes, keys, misses = self._cache.lookup(items)
+        if not misses:
+            self._ready.append(msg)
+            return
+        self._sent[seq] = (items, indexes, keys)
+        self._channel.put((seq, misses))
+
+    def get(self):
+        """Get the next chunk, with the cached and processed items.
+
+        Returns:
+            tuple: Sequence number and the processed items
+        """
+        if self._ready:
+            return self._ready.popleft()
+        seq, results = self._channel.get()
+        items, indexes, keys = self._sent.pop(seq)
+        if isinstance(results, Exception):
+            return seq, results
+        return seq, self._cache.merge(items, indexes, keys, results)
+
+    def close(self):
+        """Close the channel the items are sent on."""
+        if hasattr(self._channel, "close"):
+            self._channel.close()
+
+
+def fingerprint(config):
+    """Create the fingerprint of a pipeline from its config.
+
+    Args:
+        config (obj): Validated config
+    Returns:
+        str: md5 of the tokenizer and steps config
+    """
+    pipeline = {
+        "tokenizer": _step_config(config.get("tokenizer", {})),
+        "steps": [_step_config(step) for step in config.get("steps", [])]
+    }
+    text = json.dumps(pipeline, sort_keys=True, default=_qualified_name)
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+def _step_config(step):
+    """Config of a step without the keys that do not change the results."""
+    return {
+        key: value for key, value in step.items()
+        if key not in ["tokenizer", "log_level"]
+    }
+
+
+def _qualified_name(obj):
+    """Name of an object in the config that is not JSON, like a class.
+
+    The code of the functions and methods of the object is added to the name,
+    so a custom class whose methods change gets a new fingerprint.
+    """
+    if not hasattr(obj, "__code__"):
+        if not isinstance(obj, type):
+            obj = type(obj)
+        functions = [
+            value for cls in reversed(obj.__mro__[:-1])
+            for value in vars(cls).values() if hasattr(value, "__code__")
+        ]
+    else:
+        functions = [obj]
+    code = hashlib.md5()
+    for function in functions:
+        code.update(function.__qualname__.encode("utf-8"))
+        _hash_code(code, function.__code__)
+    return "{}.{}:{}".format(
+        obj.__module__, obj.__qualname__, code.hexdigest()
+    )
+
+
+def _hash_code(digest, code):
+    """Add the bytecode and constants of a code object to a digest."""
+    digest.update(code.co_code)
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _hash_code(digest, const)
+        else:
+            digest.update(repr(const).encode("utf-8"))
+
+
+def _key(item):
+    """Key of an item, the md5 of its data.
+
+    Args:
+        item (dict): Item
+    Returns:
+        str: Key, or None if the item has no text
+    """
+    data = item.get("data")
+    if not data or not isinstance(data, str):
+        return None
+    return hashlib.md5(data.encode("utf-8")).hexdigest()
+
+
+def _size(value):
+    """Estimate the memory used by an entry."""
+    data, tags = value
+    size = ENTRY_SIZE + sys.getsizeof(data)
+    if tags:
+        size += sys.getsizeof(tags)
+    return size
@@ -0,0 +1,101 @@
+"""Checkpoints of long running jobs.
+
+With `checkpoint_path` set in the data loader config, `DataPreprocess` saves
+the position of the data loader after the items before it were yielded and
+written to the sink. The files of the sink are committed first, so the
+checkpoint never points past data that is not on disk. A checkpoint is saved
+at most every `checkpoint_interval` seconds and at the end of the data.
+
+With `resume` set to True in the data loader config, the last checkpoint is
+loaded when `DataPreprocess` is created. The data loader starts at the saved
+position and the sink appends to its last file, so the output of the resumed
+run follows the output of the crashed run. Items that were processed after
+the last checkpoint are processed again.
+
+Only the csv, text and jsonl data loaders keep a position in their data.
+
+Example:
+    .. code-block::
+
+        config = {
+            "data_loader": {
+                "type": "csv",
+                "file_path": "posts.csv",
+                "columns": {"id": "id", "data": "text"},
+                "batch_size": 1000,
+                "checkpoint_path": "posts.checkpoint",
+                "checkpoint_interval": 60,  # seconds, default is 60
+                "resume": True  # default is False
+            },
+            "sink": {
+                "type": "jsonl",
+                "file_path": "posts.jsonl.gz",
+                "compression": "gzip"
+            },
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                }
+            ]
+        }
+        with DataPreprocess(config) as process:
+            for _ in process.multiprocess_data(workers=8):
+                pass
+"""
+
+import json
+import os
+import time
+
+DEFAULT_INTERVAL = 60
+
+
+class Checkpoint:
+    """Checkpoint file of a job.
+
+    The file is written to a temporary file and moved over the old
+    checkpoint, so a crash while saving keeps the previous checkpoint.
+
+    Args:
+        path (str): Path of the checkpoint file
+        interval (float): Minimum seconds between two checkpoints
+    """
+    def __init__(self, path, interval=DEFAULT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._saved = time.monotonic()
+
+    def load(self):
+        """Load the last checkpoint.
+
+        Returns:
+            dict: State of the checkpoint, or None if there is no checkpoint
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def due(self):
+        """Check if the interval since the last checkpoint has passed.
+
+        Returns:
+            bool: True if a checkpoint should be saved
+        """
+        return time.monotonic() - self._saved >= self.interval
+
+    def save(self, state):
+        """Save a checkpoint.
+
+        Args:
+            state (dict): JSON state of the job
+        """
+        temp_path = "{}.tmp".format(self.path)
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self._saved = time.monotonic()
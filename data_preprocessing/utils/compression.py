@@ -0,0 +1,246 @@
+"""Read compressed input files.
+
+The file data loaders open their file with `open_data`. The codec is found
+from the extension of the file, `.gz`, `.bz2`, `.xz` or `.zst` (needs the
+`zstandard` package), or set with the `compression` key of the data loader
+config. The file is decompressed while it is read, nothing is written to
+disk.
+
+The compressed file and the decompressed stream are read in blocks of
+`buffer_size` bytes. With `decompress_thread` set to True the data is
+decompressed by a background thread, so decompressing overlaps with parsing
+the records. The thread keeps up to `QUEUE_BLOCKS` blocks ready.
+
+Compressed files can only be read from the start. The loaders resume a
+checkpoint by reading up to the offset in the decompressed data, they can not
+shard or partition compressed files.
+
+Example:
+    .. code-block::
+
+        config = {
+            "data_loader": {
+                "type": "csv",
+                "file_path": "posts.csv.gz",
+                "columns": {"id": "id", "data": "text"},
+                "batch_size": 1000,
+                "compression": "infer",  # default is infer
+                "buffer_size": 4 * 2 ** 20,  # bytes, default is 1 MB
+                "decompress_thread": True  # default is False
+            },
+            "steps": []
+        }
+"""
+
+import bz2
+import contextlib
+import gzip
+import io
+import lzma
+import queue
+import threading
+
+from data_preprocessing.utils.records import map_file
+
+DEFAULT_BUFFER_SIZE = 2 ** 20
+QUEUE_BLOCKS = 4
+CODECS = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd"
+}
+
+
+def codec(path, compression="infer"):
+    """Get the codec of a file.
+
+    Args:
+        path (str): Path of the file
+        compression (str): `infer`, a codec name or None for the default
+    Returns:
+        str: Codec name, or None for a file that is not compressed
+    """
+    if compression and compression != "infer":
+        if compression not in CODECS.values():
+            raise ValueError("Unknown compression {}".format(compression))
+        return compression
+    for extension, name in CODECS.items():
+        if path.endswith(extension):
+            return name
+    return None
+
+
+@contextlib.contextmanager
+def open_data(config, memory_map=False):
+    """Open the file of a data loader.
+
+    Args:
+        config (dict): Data loader config with the file_path and the
+            optional compression, buffer_size and decompress_thread
+        memory_map (bool): Map a file that is not compressed into memory
+    Yields:
+        obj: Binary file, stream of the decompressed data or memory map
+    """
+    path = config["file_path"]
+    buffer_size = config.get("buffer_size")
+    name = codec(path, config.get("compression"))
+    if name:
+        with open_file(
+                path, name, buffer_size,
+                config.get("decompress_thread", False)) as f:
+            yield f
+        return
+    with open(path, "rb", buffering=buffer_size or -1) as f:
+        if not memory_map:
+            yield f
+            return
+        with map_file(f) as buffer:
+            yield buffer
+
+
+@contextlib.contextmanager
+def open_file(path, compression, buffer_size=None, threaded=False):
+    """Open a compressed file for reading.
+
+    Args:
+        path (str): Path of the file
+        compression (str): Codec name
+        buffer_size (int): Bytes read at a time, default is 1 MB
+        threaded (bool): Decompress in a background thread
+    Yields:
+        obj: Binary file of the decompressed data
+    """
+    buffer_size = buffer_size or DEFAULT_BUFFER_SIZE
+    with open(path, "rb", buffering=buffer_size) as raw:
+        stream = _decompressor(raw, compression)
+        if threaded:
+            stream = ThreadedReader(stream, buffer_size)
+        reader = io.BufferedReader(stream, buffer_size)
+        try:
+            yield reader
+        finally:
+            reader.close()
+
+
+class ThreadedReader(io.RawIOBase):
+    """Read a stream in a background thread.
+
+    The thread reads blocks of the stream into a queue, `readinto` takes the
+    blocks from the queue. An error of the thread is raised by `readinto`.
+
+    Args:
+        stream (obj): Binary stream to read
+        buffer_size (int): Bytes read at a time
+    """
+    def __init__(self, stream, buffer_size):
+        super().__init__()
+        self._stream = stream
+        self._buffer_size = buffer_size
+        self._queue = queue.Queue(QUEUE_BLOCKS)
+        self._block = memoryview(b"")
+        self._position = 0
+        self._finished = False
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._reader,
+            name="data_preprocess_decompress",
+            daemon=True
+        )
+        self._thread.start()
+
+    def readable(self):
+        """The stream is readable.
+
+        Returns:
+            bool: True
+        """
+        return True
+
+    def tell(self):
+        """Get the position in the stream.
+
+        Returns:
+            int: Bytes read from the stream
+        """
+        return self._position
+
+    def readinto(self, buffer):
+        """Read the next bytes of the stream into a buffer.
+
+        Args:
+            buffer (obj): Writable buffer
+        Returns:
+            int: Number of bytes read, 0 at the end of the stream
+        """
+        if not self._block:
+            if self._finished:
+                return 0
+            block = self._queue.get()
+            if isinstance(block, Exception):
+                self._finished = True
+                raise block
+            if not block:
+                self._finished = True
+                return 0
+            self._block = memoryview(block)
+        size = min(len(buffer), len(self._block))
+        buffer[:size] = self._block[:size]
+        self._block = self._block[size:]
+        self._position += size
+        return size
+
+    def close(self):
+        """Stop the thread and close the stream."""
+        if self.closed:
+            return
+        self._stopped.set()
+        # Unblock the thread when the queue is full
+        while self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        self._stream.close()
+        super().close()
+
+    def _reader(self):
+        """Background thread that reads the blocks into the queue."""
+        try:
+            while not self._stopped.is_set():
+                block = self._stream.read(self._buffer_size)
+                self._queue.put(block)
+                if not block:
+                    break
+        except Exception as e:
+            self._queue.put(e)
+
+
+def _decompressor(raw, compression):
+    """Wrap a file in a decompressor.
+
+    Args:
+        raw (obj): Binary file
+        compression (str): `gzip`, `bz2`, `xz` or `zstd`
+    Returns:
+        obj: Binary stream of the decompressed data
+    """
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    if compression == "bz2":
+        return bz2.BZ2File(raw, mode="rb")
+    if compression == "xz":
+        return lzma.LZMAFile(raw, mode="rb")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(
+                "The zstd compression needs the zstandard package!"
+            )
+        return zstandard.ZstdDecompressor().stream_reader(
+            raw,
+            read_size=DEFAULT_BUFFER_SIZE,
+            closefd=False
+        )
+    raise ValueError("Unknown compression {}".format(compression))
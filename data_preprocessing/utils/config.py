@@ -33,9 +33,24 @@ DATA_LOADER = {
         "file_path": "str",
         "columns": {}
     },
+    "text": {
+        "file_path": "str"
+    },
+    "jsonl": {
+        "file_path": "str",
+        "columns": {}
+    },
     "list": {},
     "single_item": {}
 }
+# Data loaders that keep a position in a file
+FILE_LOADERS = ["csv", "text", "jsonl"]
+# Codecs of compressed input files
+INPUT_COMPRESSION = ["infer", "gzip", "bz2", "xz", "zstd"]
+# Formats of the jsonl data loader
+JSON_FORMATS = ["lines", "array"]
+# Parsers of the csv data loader
+CSV_ENGINES = ["c", "python", "pyarrow"]
 PERMITTED_STEPS = {
     "steps": {
         "normalize_text": {
@@ -84,6 +99,37 @@ REQUIRED_PRE_STEPS = {
     "remove_stopwords": ["lowercase"],
     "expand_contractions": ["lowercase"]
 }
+# Optional result cache
+CACHE = {
+    "max_size": int,
+    "path": str
+}
+# Optional duplicate filter
+DEDUPE = {
+    "mode": str,
+    "key": str,
+    "memory": int,
+    "error_rate": float
+}
+DEDUPE_MODES = ["exact", "bloom"]
+DEDUPE_KEYS = ["data", "id"]
+# Optional sink
+SINK = {
+    "type": str,
+    "file_path": str,
+    "compression": str,
+    "max_file_size": int,
+    "buffer_size": int,
+    "background": bool,
+    "queue_size": int,
+    "log_level": str
+}
+SINK_TYPES = ["jsonl", "csv", "parquet"]
+SINK_COMPRESSION = {
+    "jsonl": ["gzip", "zstd"],
+    "csv": ["gzip", "zstd"],
+    "parquet": ["snappy", "gzip", "brotli", "lz4", "zstd"]
+}
 
 
 def validate_config(config, log_level="INFO"):
@@ -104,6 +150,9 @@ def validate_config(config, log_level="INFO"):
     config = _check_data_loader(config, log_level)
     config = _check_tokenizer(config, log_level)
     config = _check_normalize_text(config, log_level)
+    config = _check_cache(config)
+    config = _check_dedupe(config)
+    config = _check_sink(config, log_level)
     return config
 
 
@@ -168,6 +217,72 @@ def _check_data_loader(config, log_level):
     else:
         config["data_loader"]["batch_size"] = 10
 
+    # Parser options of the csv loader
+    check_engine = check_data_loader.get("engine")
+    if check_engine is not None and check_engine not in CSV_ENGINES:
+        raise ValueError(
+            "The engine must be one of {}!".format(", ".join(CSV_ENGINES))
+        )
+    check_dtype = check_data_loader.get("dtype")
+    if check_dtype is not None and not isinstance(check_dtype, dict):
+        raise TypeError("The dtype must be a dict of column types")
+    check_block = check_data_loader.get("block_size")
+    if check_block is not None:
+        if not isinstance(check_block, int) or check_block < 1:
+            raise TypeError("The block_size must be a positive int!")
+    if not isinstance(check_data_loader.get("memory_map", False), bool):
+        raise TypeError("The memory_map option must be of type bool")
+    check_encoding = check_data_loader.get("encoding")
+    if check_encoding is not None and not isinstance(check_encoding, str):
+        raise TypeError("The encoding must be of type str")
+
+    check_format = check_data_loader.get("format")
+    if check_format is not None and check_format not in JSON_FORMATS:
+        raise ValueError(
+            "The format must be one of {}!".format(", ".join(JSON_FORMATS))
+        )
+
+    # Compressed input files
+    check_compression = check_data_loader.get("compression")
+    if check_compression is not None:
+        if check_data_config not in FILE_LOADERS:
+            raise ValueError(
+                "Compression is only supported by the {} data "
+                "loaders!".format(", ".join(FILE_LOADERS))
+            )
+        if check_compression not in INPUT_COMPRESSION:
+            raise ValueError(
+                "The compression must be one of {}!".format(
+                    ", ".join(INPUT_COMPRESSION)
+                )
+            )
+    check_buffer = check_data_loader.get("buffer_size")
+    if check_buffer is not None:
+        if not isinstance(check_buffer, int) or check_buffer < 1:
+            raise TypeError("The buffer_size must be a positive int!")
+    check_thread = check_data_loader.get("decompress_thread", False)
+    if not isinstance(check_thread, bool):
+        raise TypeError("The decompress_thread option must be of type bool")
+
+    # Checkpoints of the position in the data, only the file loaders have one
+    checkpoint_path = check_data_loader.get("checkpoint_path")
+    if checkpoint_path is not None or check_data_loader.get("resume"):
+        if check_data_config not in FILE_LOADERS:
+            raise ValueError(
+                "Checkpoints are only supported by the {} data "
+                "loaders!".format(", ".join(FILE_LOADERS))
+            )
+        if not isinstance(checkpoint_path, str):
+            raise TypeError("The checkpoint_path must be of type str")
+    check_interval = check_data_loader.get("checkpoint_interval")
+    if check_interval is not None:
+        if not isinstance(check_interval, (int, float)) or check_interval < 0:
+            raise TypeError(
+                "The checkpoint_interval must be a positive number!"
+            )
+    if not isinstance(check_data_loader.get("resume", False), bool):
+        raise TypeError("The resume option must be of type bool")
+
     # Set the name key - this is to import the data loader module
     config["data_loader"]["name"] = "data_loader"
 
@@ -288,3 +403,127 @@ def _check_normalize_text(config, log_level):
         raise KeyError("Please add steps to your config!")
 
     return config
+
+
+def _check_cache(config):
+    """Check the optional cache config.
+
+    Args:
+        config (obj): config object
+    Returns:
+        The valid config object is returned. If there are errors, an error is
+        raised.
+    """
+    cache = config.get("cache")
+    if not cache:
+        return config
+    if not isinstance(cache, dict):
+        raise TypeError("The cache config must be a dict!")
+    for key, value in cache.items():
+        if key not in CACHE:
+            raise KeyError("{} is not a valid cache option!".format(key))
+        if not isinstance(value, CACHE[key]):
+            raise TypeError(
+                "The value for {a} must be of type {b}".format(
+                    a=key,
+                    b=CACHE[key]
+                )
+            )
+    if cache.get("max_size") is not None and cache["max_size"] < 1:
+        raise ValueError("The cache max_size must be a positive int!")
+    return config
+
+
+def _check_dedupe(config):
+    """Check the optional dedupe config.
+
+    Args:
+        config (obj): config object
+    Returns:
+        The valid config object is returned. If there are errors, an error is
+        raised.
+    """
+    dedupe = config.get("dedupe")
+    if not dedupe:
+        return config
+    if not isinstance(dedupe, dict):
+        raise TypeError("The dedupe config must be a dict!")
+    for key, value in dedupe.items():
+        if key not in DEDUPE:
+            raise KeyError("{} is not a valid dedupe option!".format(key))
+        if not isinstance(value, DEDUPE[key]):
+            raise TypeError(
+                "The value for {a} must be of type {b}".format(
+                    a=key,
+                    b=DEDUPE[key]
+                )
+            )
+    if dedupe.get("mode", "exact") not in DEDUPE_MODES:
+        raise ValueError(
+            "The dedupe mode must be one of {}!".format(
+                ", ".join(DEDUPE_MODES)
+            )
+        )
+    if dedupe.get("key", "data") not in DEDUPE_KEYS:
+        raise ValueError(
+            "The dedupe key must be one of {}!".format(
+                ", ".join(DEDUPE_KEYS)
+            )
+        )
+    if dedupe.get("memory") is not None and dedupe["memory"] < 1:
+        raise ValueError("The dedupe memory must be a positive int!")
+    error_rate = dedupe.get("error_rate")
+    if error_rate is not None and not 0 < error_rate < 1:
+        raise ValueError("The dedupe error_rate must be between 0 and 1!")
+    return config
+
+
+def _check_sink(config, log_level):
+    """Check the optional sink config.
+
+    Args:
+        config (obj): config object
+        log_level (str): log level for the sink
+    Returns:
+        The valid config object is returned. If there are errors, an error is
+        raised.
+    """
+    sink = config.get("sink")
+    if not sink:
+        return config
+    if not isinstance(sink, dict):
+        raise TypeError("The sink config must be a dict!")
+    sink.pop("name", None)
+    for key, value in sink.items():
+        if key not in SINK:
+            raise KeyError("{} is not a valid sink option!".format(key))
+        if not isinstance(value, SINK[key]):
+            raise TypeError(
+                "The value for {a} must be of type {b}".format(
+                    a=key,
+                    b=SINK[key]
+                )
+            )
+    if sink.get("type") not in SINK_TYPES:
+        raise ValueError(
+            "The sink type must be one of {}!".format(", ".join(SINK_TYPES))
+        )
+    if not sink.get("file_path"):
+        raise KeyError("The key file_path is missing for this sink!")
+    compression = sink.get("compression")
+    if compression and compression not in SINK_COMPRESSION[sink["type"]]:
+        raise ValueError(
+            "The compression of the {a} sink must be one of {b}!".format(
+                a=sink["type"],
+                b=", ".join(SINK_COMPRESSION[sink["type"]])
+            )
+        )
+    for key in ["max_file_size", "buffer_size", "queue_size"]:
+        if sink.get(key) is not None and sink[key] < 1:
+            raise ValueError("The sink {} must be a positive int!".format(key))
+
+    # Set the name key - this is to set up the logger of the sink
+    config["sink"]["name"] = "sink"
+    if not config["sink"].get("log_level"):
+        config["sink"]["log_level"] = log_level
+    return config
@@ -91,7 +91,9 @@ class ConfigTemplates:
 
         Args:
             **kwargs: accepts the keyword arguments file_path, columns,
-                batch_size and log_level
+                batch_size, log_level, engine, dtype, block_size,
+                memory_map, compression, buffer_size, decompress_thread,
+                checkpoint_path, checkpoint_interval and resume
         Returns:
             obj: csv config object
         """
@@ -112,7 +114,7 @@ class ConfigTemplates:
         if kwargs.get("preserve_original"):
             preserve_original = kwargs["preserve_original"]
 
-        return {
+        config = {
             "type": "csv",
             "file_path": file_path,
             "columns": columns,
@@ -120,6 +122,108 @@ class ConfigTemplates:
             "log_level": log_level,
             "preserve_original": preserve_original
         }
+        for key in [
+                "engine", "dtype", "block_size", "memory_map", "compression",
+                "buffer_size", "decompress_thread", "checkpoint_path"]:
+            if kwargs.get(key):
+                config[key] = kwargs[key]
+        if kwargs.get("checkpoint_interval") is not None:
+            config["checkpoint_interval"] = kwargs["checkpoint_interval"]
+        if kwargs.get("resume"):
+            config["resume"] = kwargs["resume"]
+        return config
+
+    @classmethod
+    def data_loader_text_loader(cls, **kwargs):
+        """Data Loader Text config.
+
+        Args:
+            **kwargs: accepts the keyword arguments file_path, encoding,
+                batch_size, log_level, compression, buffer_size,
+                decompress_thread, checkpoint_path, checkpoint_interval and
+                resume
+        Returns:
+            obj: text config object
+        """
+        file_path = ""
+        batch_size = 1000
+        log_level = "INFO"
+        preserve_original = False
+
+        if kwargs.get("file_path"):
+            file_path = kwargs["file_path"]
+        if kwargs.get("batch_size"):
+            batch_size = kwargs["batch_size"]
+        if kwargs.get("log_level"):
+            log_level = kwargs["log_level"]
+        if kwargs.get("preserve_original"):
+            preserve_original = kwargs["preserve_original"]
+
+        config = {
+            "type": "text",
+            "file_path": file_path,
+            "batch_size": batch_size,
+            "log_level": log_level,
+            "preserve_original": preserve_original
+        }
+        for key in [
+                "encoding", "compression", "buffer_size", "decompress_thread",
+                "checkpoint_path"]:
+            if kwargs.get(key):
+                config[key] = kwargs[key]
+        if kwargs.get("checkpoint_interval") is not None:
+            config["checkpoint_interval"] = kwargs["checkpoint_interval"]
+        if kwargs.get("resume"):
+            config["resume"] = kwargs["resume"]
+        return config
+
+    @classmethod
+    def data_loader_jsonl_loader(cls, **kwargs):
+        """Data Loader JSON Lines config.
+
+        Args:
+            **kwargs: accepts the keyword arguments file_path, columns,
+                format, encoding, batch_size, log_level, compression,
+                buffer_size, decompress_thread, checkpoint_path,
+                checkpoint_interval and resume
+        Returns:
+            obj: jsonl config object
+        """
+        file_path = ""
+        columns = {"id": "id", "data": "text"}
+        batch_size = 1000
+        log_level = "INFO"
+        preserve_original = False
+
+        if kwargs.get("file_path"):
+            file_path = kwargs["file_path"]
+        if kwargs.get("columns"):
+            columns = kwargs["columns"]
+        if kwargs.get("batch_size"):
+            batch_size = kwargs["batch_size"]
+        if kwargs.get("log_level"):
+            log_level = kwargs["log_level"]
+        if kwargs.get("preserve_original"):
+            preserve_original = kwargs["preserve_original"]
+
+        config = {
+            "type": "jsonl",
+            "file_path": file_path,
+            "columns": columns,
+            "batch_size": batch_size,
+            "log_level": log_level,
+            "preserve_original": preserve_original
+        }
+        for key in [
+                "format", "encoding", "compression", "buffer_size",
+                "decompress_thread", "checkpoint_path"]:
+            if kwargs.get(key):
+                config[key] = kwargs[key]
+        if kwargs.get("checkpoint_interval") is not None:
+            config["checkpoint_interval"] = kwargs["checkpoint_interval"]
+        if kwargs.get("resume"):
+            config["resume"] = kwargs["resume"]
+        return config
 
     @classmethod
     def data_loader_list_loader(cls, **kwargs):
@@ -493,3 +597,68 @@ class ConfigTemplates:
             "type": "spacy_word_tokenize",
             "log_level": log_level
         }
+
+    @classmethod
+    def cache(cls, **kwargs):
+        """Result cache config.
+
+        Args:
+            **kwargs: accepts the keyword arguments max_size and path
+        Returns:
+            obj: cache config object
+        """
+        config = {
+            "max_size": 64 * 2 ** 20
+        }
+        if kwargs.get("max_size"):
+            config["max_size"] = kwargs["max_size"]
+        if kwargs.get("path"):
+            config["path"] = kwargs["path"]
+        return config
+
+    @classmethod
+    def dedupe(cls, **kwargs):
+        """Duplicate filter config.
+
+        Args:
+            **kwargs: accepts the keyword arguments mode, key, memory and
+                error_rate
+        Returns:
+            obj: dedupe config object
+        """
+        config = {
+            "mode": "exact"
+        }
+        if kwargs.get("mode"):
+            config["mode"] = kwargs["mode"]
+        if kwargs.get("key"):
+            config["key"] = kwargs["key"]
+        if kwargs.get("memory"):
+            config["memory"] = kwargs["memory"]
+        if kwargs.get("error_rate"):
+            config["error_rate"] = kwargs["error_rate"]
+        return config
+
+    @classmethod
+    def sink(cls, **kwargs):
+        """Sink config.
+
+        Args:
+            **kwargs: accepts the keyword arguments type, file_path,
+                compression, max_file_size, buffer_size, background and
+                log_level
+        Returns:
+            obj: sink config object
+        """
+        config = {
+            "type": "jsonl",
+            "file_path": "processed.jsonl",
+            "log_level": "INFO"
+        }
+        for key in ["type", "file_path", "compression", "max_file_size",
+                    "buffer_size", "log_level"]:
+            if kwargs.get(key):
+                config[key] = kwargs[key]
+        if kwargs.get("background") is not None:
+            config["background"] = kwargs["background"]
+        return config
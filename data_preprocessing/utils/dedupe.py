@@ -0,0 +1,169 @@
+"""Duplicate filter for `DataPreprocess`.
+
+The filter is set with the `dedupe` key of the config. Items with a key
+that was already seen in the same call to `process_data`, `multiprocess_data`
+or `aprocess_data` are dropped before they are processed. In
+`multiprocess_data` the filter runs in the parent process, so duplicates are
+never sent to the workers.
+
+Keys:
+    * `data` - the md5 of the text of the item, like the keys of the result
+      cache. Items with the same text are dropped even when the data loader
+      reads their ids from the data. This is the default.
+    * `id` - the id of the item. Items with an id column are only dropped
+      when the id is repeated, items without an id get the md5 of their text
+      as the id from the data loader.
+
+Modes:
+    * `exact` - keeps every key in a set, no item is dropped by mistake
+    * `bloom` - keeps the keys in a Bloom filter with a fixed memory budget.
+      A new item is dropped by mistake with a probability of `error_rate`,
+      as long as the number of items stays below the capacity of the
+      filter. The capacity is logged when the filter is created.
+
+Example:
+    .. code-block::
+
+        config = {
+            "data_loader": {
+                "type": "csv",
+                "file_path": "scraped.csv",
+                "columns": {"id": "id", "data": "text"},
+                "batch_size": 1000
+            },
+            "dedupe": {
+                "mode": "bloom",
+                "key": "data",  # default is data
+                "memory": 2 ** 30,  # bytes, default is 16 MB
+                "error_rate": 0.0001  # default is 0.001
+            },
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                }
+            ]
+        }
+        process = DataPreprocess(config)
+"""
+
+import hashlib
+import math
+
+DEFAULT_MEMORY = 16 * 2 ** 20
+DEFAULT_ERROR_RATE = 0.001
+
+
+def content_key(item):
+    """Key of an item, the md5 of its data.
+
+    Args:
+        item (dict): Item
+    Returns:
+        bytes: Key, or None if the item has no text
+    """
+    data = item.get("data")
+    if not data or not isinstance(data, str):
+        return None
+    return hashlib.md5(data.encode("utf-8")).digest()
+
+
+def id_key(item):
+    """Key of an item, its id.
+
+    Args:
+        item (dict): Item
+    Returns:
+        obj: Key, or None if the item has no id
+    """
+    return item.get("id")
+
+
+class ExactFilter:
+    """Filter that keeps every key it has seen.
+
+    Args:
+        key (function): Function that returns the key of an item
+    """
+    def __init__(self, key=content_key):
+        self.key = key
+        self._seen = set()
+
+    def seen(self, key):
+        """Add a key to the filter.
+
+        Args:
+            key (obj): Key of the item
+        Returns:
+            bool: True if the key was already in the filter
+        """
+        if key in self._seen:
+            return True
+        self._seen.add(key)
+        return False
+
+
+class BloomFilter:
+    """Bloom filter with a fixed memory budget.
+
+    The number of hash functions is picked for the error rate, the capacity
+    is the number of items the memory holds at that error rate.
+
+    Args:
+        memory (int): Size of the filter in bytes
+        error_rate (float): False positive rate at full capacity
+        key (function): Function that returns the key of an item
+    """
+    def __init__(self, memory=DEFAULT_MEMORY, error_rate=DEFAULT_ERROR_RATE,
+                 key=content_key):
+        self.key = key
+        self._bits = memory * 8
+        self._hashes = max(1, round(-math.log2(error_rate)))
+        self.capacity = int(
+            self._bits * math.log(2) ** 2 / -math.log(error_rate)
+        )
+        self._array = bytearray(memory)
+
+    def seen(self, key):
+        """Add a key to the filter.
+
+        Args:
+            key (obj): Key of the item
+        Returns:
+            bool: True if the key was probably already in the filter
+        """
+        if not isinstance(key, bytes):
+            key = str(key).encode("utf-8")
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        array = self._array
+        bits = self._bits
+        found = True
+        for i in range(self._hashes):
+            bit = (first + i * second) % bits
+            mask = 1 << (bit & 7)
+            if not array[bit >> 3] & mask:
+                found = False
+                array[bit >> 3] |= mask
+        return found
+
+
+def create_filter(config):
+    """Create the filter set in the `dedupe` config.
+
+    Args:
+        config (dict): Dedupe config
+    Returns:
+        obj: ExactFilter or BloomFilter
+    """
+    key = id_key if config.get("key") == "id" else content_key
+    if config.get("mode", "exact") == "exact":
+        return ExactFilter(key)
+    return BloomFilter(
+        config.get("memory", DEFAULT_MEMORY),
+        config.get("error_rate", DEFAULT_ERROR_RATE),
+        key
+    )
+
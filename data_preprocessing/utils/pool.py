@@ -0,0 +1,302 @@
+"""Worker pool used by `DataPreprocess.multiprocess_data`.
+
+The pool starts the worker processes once and keeps them running, so repeated
+calls to `multiprocess_data` reuse the same workers. Work is sent on the
+`queue` and the results come back on the `kafka_queue`. Each worker stops when
+it receives the `None` sentinel from `shutdown`, the last result it sends is
+returned by `shutdown`.
+
+Workers are started with fork where it is available, so the models loaded by
+the steps are shared copy-on-write with the parent. The garbage collector is
+frozen while the workers start, so collections in the workers do not touch
+the shared objects and copy their memory pages.
+
+Pipelines can also run on a `concurrent.futures` executor with the
+`ExecutorChannel`, it has the same `put` and `get` methods as the pool. The
+executor calls the module function `_run_chunk` with the id of the pipeline,
+the pipeline is looked up in `_PIPELINES`. Process pool executors must fork
+their workers after the pipeline is created, thread pool executors share the
+pipeline directly.
+
+With partitioned loading the work sent to a worker is a `Partition` instead of
+a chunk of items. The worker loads the items of the partition with its own
+copy of the data loader before processing them.
+
+An error raised by a worker while loading or processing a chunk is sent back
+as the result of the chunk and raised again in the parent. `WorkerPool.get`
+raises an error when a worker process stopped, so the parent never waits for
+a result that will not come.
+"""
+
+import gc
+import multiprocessing as mp
+import pickle
+import queue
+import traceback
+import weakref
+from multiprocessing import resource_tracker
+from concurrent.futures import wait, FIRST_COMPLETED, ThreadPoolExecutor
+
+_PIPELINES = weakref.WeakValueDictionary()
+# Seconds between the checks of the workers while waiting for a result
+POLL_SECONDS = 1
+
+
+class Partition:
+    """Part of the data that a worker loads itself.
+
+    Args:
+        data (obj): Data passed to the data loader, like a slice of a list,
+            or None for file data loaders
+        shard (tuple): Index and number of shards passed to the data loader
+        byte_range (tuple): Optional start and end byte offsets of the
+            records passed to the data loader
+    """
+    __slots__ = ("data", "shard", "byte_range")
+
+    def __init__(self, data, shard, byte_range=None):
+        self.data = data
+        self.shard = shard
+        self.byte_range = byte_range
+
+    def __getstate__(self):
+        return self.data, self.shard, self.byte_range
+
+    def __setstate__(self, state):
+        self.data, self.shard, self.byte_range = state
+
+
+class WorkerPool:
+    """Pool of long running worker processes.
+
+    Args:
+        target (obj): Function run by each worker, it is called with the work
+            queue and the results queue
+        workers (int): Number of worker processes
+        log (obj): Logger
+    """
+    def __init__(self, target, workers, log):
+        self.workers = workers
+        context = _context()
+        self.queue = context.JoinableQueue()
+        self.kafka_queue = context.Queue()
+        self.pending = 0
+        self._log = log
+        self._processes = []
+        # Workers share the resource tracker of the parent, so shared memory
+        # blocks they attach to are not removed when a worker exits
+        resource_tracker.ensure_running()
+        gc.freeze()
+        try:
+            for i in range(workers):
+                worker_process = context.Process(
+                    target=target,
+                    args=(self.queue, self.kafka_queue),
+                    daemon=True,
+                    name='data_preprocess_worker_{}'.format(i)
+                )
+                worker_process.start()
+                self._processes.append(worker_process)
+        finally:
+            gc.unfreeze()
+        self._log.info("Setting up workers - {}".format(
+                ", ".join([x.name for x in self._processes])
+            )
+        )
+
+    def is_alive(self):
+        """Check that all the worker processes are running.
+
+        Returns:
+            bool: True if all the workers are running
+        """
+        return bool(self._processes) and all(
+            p.is_alive() for p in self._processes
+        )
+
+    def put(self, msg):
+        """Send work to the workers.
+
+        Args:
+            msg (obj): Work for the workers
+        """
+        self.queue.put(msg)
+        self.pending += 1
+
+    def get(self):
+        """Get the next result from the workers.
+
+        The workers are checked while waiting, a worker process that stopped
+        raises an error instead of blocking for ever.
+
+        Returns:
+            obj: Result from a worker
+        """
+        while True:
+            try:
+                msg = self.kafka_queue.get(timeout=POLL_SECONDS)
+                break
+            except queue.Empty:
+                if not self.is_alive():
+                    raise RuntimeError(
+                        "A worker process stopped, exit codes {}".format(
+                            [p.exitcode for p in self._processes]
+                        )
+                    )
+        self.pending -= 1
+        return msg
+
+    def drain(self):
+        """Discard the results of work that was never collected.
+
+        This happens when a generator using the pool is not run to the end.
+        """
+        if self.pending:
+            self._log.info("Discarding {} unread results".format(
+                self.pending
+            ))
+        while self.pending:
+            try:
+                self.get()
+            except RuntimeError as e:
+                self._log.warning("Results lost - {}".format(e))
+                self.pending = 0
+
+    def shutdown(self, timeout=10):
+        """Stop the workers with a sentinel and wait for them to exit.
+
+        Args:
+            timeout (int): Seconds to wait for each worker before terminating
+        Returns:
+            list: Last result sent by each worker that stopped
+        """
+        self.drain()
+        for _ in self._processes:
+            self.queue.put(None)
+        results = []
+        for _ in self._processes:
+            try:
+                _, result = self.kafka_queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            results.append(result)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                self._log.warning("Terminating worker {}".format(
+                    process.name
+                ))
+                process.terminate()
+                process.join()
+        self._processes = []
+        self.pending = 0
+        for q in (self.queue, self.kafka_queue):
+            q.close()
+            q.join_thread()
+        self._log.info("Workers stopped")
+        return results
+
+
+class ExecutorChannel:
+    """Send work to a `concurrent.futures` executor.
+
+    Thread pool executors run the chunks with the thread steps of the
+    pipeline, see `DataPreprocess._thread_steps`.
+
+    Args:
+        executor (obj): `concurrent.futures` executor
+        pipeline_id (str): Id of the pipeline in `_PIPELINES`
+    """
+    def __init__(self, executor, pipeline_id):
+        self._executor = executor
+        self._pipeline_id = pipeline_id
+        self._threads = isinstance(executor, ThreadPoolExecutor)
+        self._futures = {}
+
+    @property
+    def pending(self):
+        """Number of chunks submitted and not collected."""
+        return len(self._futures)
+
+    def put(self, msg):
+        """Submit a chunk to the executor.
+
+        Args:
+            msg (tuple): Sequence number and the items to process
+        """
+        seq, items = msg
+        future = self._executor.submit(
+            _run_chunk,
+            self._pipeline_id,
+            items,
+            self._threads
+        )
+        self._futures[future] = seq
+
+    def get(self):
+        """Wait for the next finished chunk.
+
+        Returns:
+            tuple: Sequence number and the processed items
+        """
+        done, _ = wait(self._futures, return_when=FIRST_COMPLETED)
+        future = done.pop()
+        seq = self._futures.pop(future)
+        return seq, future.result()
+
+
+def _context():
+    """Get the multiprocessing context for the workers.
+
+    Returns:
+        obj: Fork context, or the default context if fork is not available
+    """
+    if "fork" in mp.get_all_start_methods():
+        return mp.get_context("fork")
+    return mp.get_context()
+
+
+def worker_error(error):
+    """Get an error of a worker that can be sent to the parent.
+
+    Args:
+        error (obj): Exception raised in the worker
+    Returns:
+        obj: The exception, or a RuntimeError with its traceback when the
+            exception can not be pickled
+    """
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError("Error in worker:\n{}".format(
+            "".join(traceback.format_exception(
+                type(error), error, error.__traceback__
+            ))
+        ))
+
+
+def _run_chunk(pipeline_id, items, threads=False):
+    """Process a chunk of items with a registered pipeline.
+
+    This function is submitted to `concurrent.futures` executors.
+
+    Args:
+        pipeline_id (str): Id of the pipeline in `_PIPELINES`
+        items (list): Items to process, or a Partition to load
+        threads (bool): Use the thread steps of the pipeline
+    Returns:
+        list: Processed items
+    """
+    pipeline = _PIPELINES.get(pipeline_id)
+    if pipeline is None:
+        raise RuntimeError(
+            "The pipeline {} is not available in this worker. Process pool "
+            "executors must fork their workers after the DataPreprocess "
+            "object is created.".format(pipeline_id)
+        )
+    if isinstance(items, Partition):
+        items = pipeline._load_partition(items)
+    if threads:
+        return pipeline._process_batch(items, pipeline._thread_steps())
+    return pipeline._process_batch(items)
@@ -0,0 +1,504 @@
+"""Find the records of text files.
+
+The file data loaders read records at byte offsets, so they can start at a
+checkpoint or read only the byte range of a shard. A record is a line of the
+file. With `quoted` set, lines are joined while a quoted field is open, a
+record ends at a line break with an even number of quotes before it.
+
+Like the csv parser of pandas, a quote only starts a quoted field at the
+start of a field, a quote inside an unquoted field is kept as text. A line
+with an odd number of quotes is checked with `CSV_RECORD`, it is a whole
+record when all of its quoted fields are closed, a quoted field ending with
+`""` before the line break is still open. `csv_record_ends` splits a
+block with the same rules, it also ends records at a lone `\\r`.
+
+Files with a lone `\\r` at the end of their lines are read with
+`CarriageReturnReader`, use `newline_reader` to wrap a file when it has these
+line breaks.
+
+The functions work on binary files, streams of compressed files and on
+memory maps of files. With a memory map, `record_end` finds the records in
+the mapped buffer without copying the lines, the text is only copied and
+decoded for the records that are used.
+
+Example:
+    .. code-block::
+
+        with open(path, "rb") as f, map_file(f) as buffer:
+            start, end = shard_range(buffer, 0, (0, 4))
+            while start < end:
+                stop = record_end(buffer, start)
+                print(buffer[start:stop].decode("utf-8"))
+                start = stop
+"""
+
+import contextlib
+import io
+import itertools
+import mmap
+import os
+import re
+
+# Size of the byte ranges loaded by the workers
+PARTITION_BYTES = 4 * 2 ** 20
+# Bytes read at a time when a stream is moved forward
+SKIP_SIZE = 2 ** 20
+# Field of a csv record, quoted or without quotes. A quote right after the
+# closing quote of a field is an escaped quote, the field is still open
+CSV_FIELD = (
+    rb'(?:"(?:[^"]|"")*"(?:[^,\r\n"][^,\r\n]*)?|[^,\r\n"][^,\r\n]*|)'
+)
+# Csv record with its line break
+CSV_RECORD = re.compile(
+    CSV_FIELD + rb"(?:," + CSV_FIELD + rb")*(?:\r\n|\n|\r)"
+)
+
+
+@contextlib.contextmanager
+def map_file(f):
+    """Map a file into memory for reading.
+
+    Args:
+        f (obj): Binary file
+    Yields:
+        obj: Memory map, or the file itself if the file is empty
+    """
+    if not os.fstat(f.fileno()).st_size:
+        # Empty files can not be mapped
+        yield f
+        return
+    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield buffer
+    finally:
+        buffer.close()
+
+
+def read_record(f, quoted=True):
+    """Read one record.
+
+    Args:
+        f (obj): Binary file or memory map at the start of a record
+        quoted (bool): Keep line breaks in quoted fields in the record
+    Returns:
+        bytes: The record, empty at the end of the file
+    """
+    record = f.readline()
+    if not quoted:
+        return record
+    quotes = record.count(b'"')
+    if quotes % 2 and _whole_record(record, 0, len(record)):
+        return record
+    while quotes % 2:
+        line = f.readline()
+        if not line:
+            break
+        quotes += line.count(b'"')
+        record += line
+    return record
+
+
+def seek(f, offset):
+    """Move to a byte offset.
+
+    Streams that can not seek, like the data of a compressed file read by a
+    thread, are read up to the offset.
+
+    Args:
+        f (obj): Binary file, stream or memory map
+        offset (int): Byte offset at or after the position of a stream
+    """
+    if not isinstance(f, io.IOBase) or f.seekable():
+        f.seek(offset)
+        return
+    skip = offset - f.tell()
+    if skip < 0:
+        raise ValueError("The stream can not move back to {}".format(offset))
+    while skip > 0:
+        data = f.read(min(skip, SKIP_SIZE))
+        if not data:
+            break
+        skip -= len(data)
+
+
+def record_end(buffer, start, quoted=True):
+    """Find the end of the record at an offset of a memory map.
+
+    Args:
+        buffer (obj): Memory map
+        start (int): Byte offset of the record
+        quoted (bool): Keep line breaks in quoted fields in the record
+    Returns:
+        int: Byte offset after the record
+    """
+    size = len(buffer)
+    end = buffer.find(b"\n", start)
+    end = size if end == -1 else end + 1
+    if not quoted or buffer.find(b'"', start, end) == -1:
+        return end
+    quotes = buffer[start:end].count(b'"')
+    if quotes % 2 and _whole_record(buffer, start, end):
+        return end
+    while quotes % 2 and end < size:
+        line_end = buffer.find(b"\n", end)
+        line_end = size if line_end == -1 else line_end + 1
+        quotes += buffer[end:line_end].count(b'"')
+        end = line_end
+    return end
+
+
+def record_ends(data, quoted=True):
+    """Find the ends of the whole records in a block of bytes.
+
+    Args:
+        data (bytes): Block starting at a record
+        quoted (bool): Keep line breaks in quoted fields in the record
+    Returns:
+        list: Byte offset after each record that ends with a line break
+    """
+    ends = []
+    find = data.find
+    count = data.count
+    start = 0
+    while True:
+        end = find(b"\n", start) + 1
+        if not end:
+            return ends
+        if quoted:
+            quotes = count(b'"', start, end)
+            if quotes % 2 and _whole_record(data, start, end):
+                quotes = 0
+            while quotes % 2:
+                line_end = find(b"\n", end) + 1
+                if not line_end:
+                    return ends
+                quotes += count(b'"', end, line_end)
+                end = line_end
+        ends.append(end)
+        start = end
+
+
+def csv_record_ends(data):
+    """Find the ends of the csv records in a block of bytes.
+
+    The records are found with `CSV_RECORD`, so quotes inside unquoted
+    fields are kept as text and a lone `\\r` ends a record. It is slower than
+    `record_ends`, the csv data loader uses it for the blocks where pandas
+    parses another number of rows.
+
+    Args:
+        data (bytes): Block starting at a record
+    Returns:
+        list: Byte offset after each record, the last record can end
+            without a line break
+    """
+    ends = []
+    match = CSV_RECORD.match
+    start = 0
+    size = len(data)
+    while start < size:
+        record = match(data, start)
+        if not record:
+            # A quoted field that is not closed or a last line without a
+            # line break
+            ends.append(size)
+            break
+        start = record.end()
+        ends.append(start)
+    return ends
+
+
+def _whole_record(data, start, end):
+    """Check if a line with an odd number of quotes is a whole csv record.
+
+    Args:
+        data (bytes): Buffer with the line
+        start (int): Byte offset of the line
+        end (int): Byte offset after the line break
+    Returns:
+        bool: True when the quoted fields of the line are closed
+    """
+    if data[end - 1:end] not in (b"\n", b"\r"):
+        return False
+    return CSV_RECORD.fullmatch(data, start, end) is not None
+
+
+def newline_reader(f):
+    """Wrap a file with a lone `\\r` at the end of its lines.
+
+    The line break is found at the start of the file, the position of the
+    file is not moved.
+
+    Args:
+        f (obj): Binary file, stream or memory map at the start of the file
+    Returns:
+        obj: `CarriageReturnReader` of the file, or the file itself when its
+            lines end with `\\n`
+    """
+    if hasattr(f, "peek"):
+        data = f.peek(SKIP_SIZE)
+    else:
+        position = f.tell()
+        data = f.read(SKIP_SIZE)
+        f.seek(position)
+    match = re.search(rb"[\r\n]", data)
+    if not match or match.group() != b"\r" or match.end() == len(data):
+        return f
+    if data[match.end():match.end() + 1] == b"\n":
+        return f
+    return CarriageReturnReader(f)
+
+
+class CarriageReturnReader(io.BufferedIOBase):
+    """Read the lines of a file that end with a lone `\\r`.
+
+    `readline` ends the lines at `\\r` instead of `\\n`, the bytes are not
+    changed, so the byte offsets are the same as in the file. The file is not
+    closed with the reader.
+
+    Args:
+        f (obj): Binary file, stream or memory map
+    """
+    def __init__(self, f):
+        super().__init__()
+        self._f = f
+        self._buffer = b""
+
+    def readable(self):
+        """The file is readable.
+
+        Returns:
+            bool: True
+        """
+        return True
+
+    def seekable(self):
+        """Check if the file can seek.
+
+        Returns:
+            bool: True for files and memory maps that can seek
+        """
+        return not isinstance(self._f, io.IOBase) or self._f.seekable()
+
+    def tell(self):
+        """Get the position in the file.
+
+        Returns:
+            int: Byte offset of the next byte read
+        """
+        return self._f.tell() - len(self._buffer)
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        """Move to a byte offset.
+
+        Args:
+            offset (int): Byte offset
+            whence (int): Offset from the start, the position or the end
+        Returns:
+            int: The new position
+        """
+        if whence == os.SEEK_CUR:
+            offset -= len(self._buffer)
+        self._buffer = b""
+        self._f.seek(offset, whence)
+        return self._f.tell()
+
+    def read(self, size=-1):
+        """Read bytes.
+
+        Args:
+            size (int): Number of bytes, all the bytes left when negative
+        Returns:
+            bytes: The bytes read, empty at the end of the file
+        """
+        if size is None or size < 0:
+            data = self._buffer + self._f.read()
+            self._buffer = b""
+            return data
+        if len(self._buffer) < size:
+            self._buffer += self._f.read(size - len(self._buffer))
+        data = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return data
+
+    def readline(self, size=-1):
+        """Read a line ending with `\\r`.
+
+        Args:
+            size (int): Not used
+        Returns:
+            bytes: The line with the line break, empty at the end of the file
+        """
+        start = 0
+        while True:
+            end = self._buffer.find(b"\r", start) + 1
+            if end:
+                break
+            start = len(self._buffer)
+            data = self._f.read(SKIP_SIZE)
+            if not data:
+                end = len(self._buffer)
+                break
+            self._buffer += data
+        line = self._buffer[:end]
+        self._buffer = self._buffer[end:]
+        return line
+
+
+def shard_range(f, start, shard):
+    """Get the byte range of a shard.
+
+    The data after `start` is split into ranges of the same size. A range
+    starts at the first line after its start byte, a record belongs to the
+    range its first byte is in.
+
+    Args:
+        f (obj): Binary file or memory map
+        start (int): Byte offset of the first record
+        shard (tuple): Index and number of shards
+    Returns:
+        tuple: Byte offsets of the first record of the shard and of the
+            first record after the shard
+    """
+    index, count = shard
+    f.seek(0, os.SEEK_END)
+    length = f.tell() - start
+    return tuple(
+        line_start(f, start + length * i // count, start)
+        for i in (index, index + 1)
+    )
+
+
+def line_start(f, offset, start):
+    """Get the start of the first line at or after a byte offset.
+
+    Args:
+        f (obj): Binary file or memory map
+        offset (int): Byte offset
+        start (int): Byte offset of the first record
+    Returns:
+        int: Byte offset of the line
+    """
+    if offset <= start:
+        return start
+    f.seek(offset - 1)
+    f.readline()
+    return f.tell()
+
+
+def partition_count(size, workers):
+    """Get the number of partitions of some data.
+
+    Args:
+        size (int): Bytes of data
+        workers (int): Number of workers
+    Returns:
+        int: Partitions of about `PARTITION_BYTES`, at least one for each
+            worker
+    """
+    return max(workers, -(-size // PARTITION_BYTES), 1)
+
+
+def file_shards(path, workers, shard=None):
+    """Split a file into shards of about `PARTITION_BYTES`.
+
+    There is at least one shard for each worker. A shard passed in is split
+    into smaller shards. The shards start at lines, use `record_ranges` for
+    records with line breaks in quoted fields.
+
+    Args:
+        path (str): Path of the file
+        workers (int): Number of workers
+        shard (tuple): Optional index and number of shards
+    Yields:
+        tuple: Index and number of shards of each byte range
+    """
+    index, count = shard or (0, 1)
+    parts = partition_count(os.path.getsize(path) // count, workers)
+    for i in range(parts):
+        yield index * parts + i, count * parts
+
+
+def record_shard(f, start, shard):
+    """Get the byte range of a shard of csv records.
+
+    Like `shard_range` the data after `start` is split into ranges of the
+    same size, but the quotes are counted from `start` like in
+    `record_ranges`, so a shard never starts inside a quoted field with line
+    breaks. The quotes are only counted up to the end of the shard.
+
+    Args:
+        f (obj): Binary file or memory map
+        start (int): Byte offset of the first record
+        shard (tuple): Index and number of shards
+    Returns:
+        tuple: Byte offsets of the first record of the shard and of the
+            first record after the shard
+    """
+    index, count = shard
+    f.seek(0, os.SEEK_END)
+    end = f.tell()
+    bounds = list(itertools.islice(
+        _record_bounds(f, start, end, count), index + 2
+    ))
+    return bounds[index], bounds[index + 1]
+
+
+def record_ranges(f, start, end, parts):
+    """Split a byte range into ranges that start at whole records.
+
+    The quotes are counted from `start`, a range starts at the first line
+    after its start byte with an even number of quotes before it. Records
+    with line breaks in quoted fields are not split. Ranges can be empty
+    when a record is longer than a range.
+
+    Args:
+        f (obj): Binary file or memory map
+        start (int): Byte offset of a record
+        end (int): Byte offset after the last record
+        parts (int): Number of ranges
+    Returns:
+        list: Start and end byte offsets of each range
+    """
+    bounds = list(_record_bounds(f, start, end, parts))
+    return list(zip(bounds, bounds[1:]))
+
+
+def _record_bounds(f, start, end, parts):
+    """Generator of the bounds of the ranges of `record_ranges`.
+
+    Args:
+        f (obj): Binary file or memory map
+        start (int): Byte offset of a record
+        end (int): Byte offset after the last record
+        parts (int): Number of ranges
+    Yields:
+        int: `start`, the start of each range after the first and `end`
+    """
+    yield start
+    bound = start
+    position = start
+    quotes = 0
+    for i in range(1, parts):
+        target = start + (end - start) * i // parts
+        if target <= bound:
+            yield bound
+            continue
+        f.seek(position)
+        remaining = target - 1 - position
+        while remaining > 0:
+            data = f.read(min(remaining, SKIP_SIZE))
+            if not data:
+                break
+            quotes += data.count(b'"')
+            remaining -= len(data)
+        # The line at the target byte and the lines of an open quoted field
+        while True:
+            line = f.readline()
+            quotes += line.count(b'"')
+            if not line or not quotes % 2:
+                break
+        position = f.tell()
+        bound = min(position, end)
+        yield bound
+    yield end
@@ -0,0 +1,205 @@
+"""Processing stats of a pipeline.
+
+`DataPreprocess` counts the items it processes and times every step of the
+pipeline. The stats are returned by `DataPreprocess.disconnect`. Workers of
+`multiprocess_data` keep their own stats, they are merged into the pipeline
+stats when the workers stop. Items dropped by the duplicate filter are counted
+in `duplicates`.
+
+The size of the data going in and out of a step is counted in characters.
+Steps that pass tokens to the next step are counted as the joined text.
+
+Example:
+    .. code-block::
+
+        process = DataPreprocess(config)
+        for batch in process.process_data(data):
+            pass
+        stats = process.disconnect()
+        for step in stats.steps:
+            print(step.name, step.time, step.items_per_second)
+        print(stats.to_dict())
+"""
+
+import logging
+import threading
+
+
+class StepStats:
+    """Stats of one step of the pipeline.
+
+    Args:
+        name (str): Name of the step
+    """
+    def __init__(self, name):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        """Set all the counters to zero."""
+        self.calls = 0
+        self.items = 0
+        self.time = 0.0
+        self.chars_in = 0
+        self.chars_out = 0
+        self.errors = 0
+
+    @property
+    def items_per_second(self):
+        """Number of items the step processes in a second."""
+        if not self.time:
+            return 0.0
+        return self.items / self.time
+
+    def merge(self, other):
+        """Add the counters of another `StepStats` of the same step.
+
+        Args:
+            other (obj): StepStats
+        """
+        self.calls += other.calls
+        self.items += other.items
+        self.time += other.time
+        self.chars_in += other.chars_in
+        self.chars_out += other.chars_out
+        self.errors += other.errors
+
+    def to_dict(self):
+        """Get the stats as a dictionary.
+
+        Returns:
+            dict: Stats of the step
+        """
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "items": self.items,
+            "time": self.time,
+            "chars_in": self.chars_in,
+            "chars_out": self.chars_out,
+            "errors": self.errors,
+            "items_per_second": self.items_per_second
+        }
+
+
+class PipelineStats:
+    """Stats of a pipeline and each of its steps.
+
+    Args:
+        names (list): Names of the steps
+    """
+    def __init__(self, names):
+        self.steps = [StepStats(name) for name in names]
+        self.items = 0
+        self.duplicates = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def record(self, index, items, seconds, chars_in, chars_out):
+        """Record a call to a step.
+
+        Args:
+            index (int): Index of the step in the pipeline
+            items (int): Number of items processed
+            seconds (float): Time taken by the step
+            chars_in (int): Characters of the data passed to the step
+            chars_out (int): Characters of the data returned by the step
+        """
+        step = self.steps[index]
+        with self._lock:
+            step.calls += 1
+            step.items += items
+            step.time += seconds
+            step.chars_in += chars_in
+            step.chars_out += chars_out
+
+    def add_items(self, items):
+        """Count items that went through the pipeline.
+
+        Args:
+            items (int): Number of items
+        """
+        with self._lock:
+            self.items += items
+
+    def reset(self):
+        """Set all the counters to zero."""
+        with self._lock:
+            self.items = 0
+            self.duplicates = 0
+            self.elapsed = 0.0
+            for step in self.steps:
+                step.reset()
+
+    @property
+    def items_per_second(self):
+        """Number of items the pipeline processes in a second."""
+        if not self.elapsed:
+            return 0.0
+        return self.items / self.elapsed
+
+    def merge(self, other):
+        """Add the counters of another `PipelineStats`, like from a worker.
+
+        Args:
+            other (obj): PipelineStats of the same pipeline
+        """
+        with self._lock:
+            self.items += other.items
+            for step, other_step in zip(self.steps, other.steps):
+                step.merge(other_step)
+
+    def to_dict(self):
+        """Get the stats as a dictionary.
+
+        Returns:
+            dict: Stats of the pipeline
+        """
+        return {
+            "items": self.items,
+            "duplicates": self.duplicates,
+            "elapsed": self.elapsed,
+            "items_per_second": self.items_per_second,
+            "steps": [step.to_dict() for step in self.steps]
+        }
+
+
+class ErrorCounter(logging.Handler):
+    """Logging handler that counts the errors logged by a step.
+
+    Args:
+        stats (obj): StepStats of the step
+    """
+    def __init__(self, stats):
+        super().__init__(logging.ERROR)
+        self._stats = stats
+
+    def emit(self, record):
+        self._stats.errors += 1
+
+
+def data_size(items):
+    """Count the characters of the data of the items.
+
+    Args:
+        items (list): List of items
+    Returns:
+        int: Number of characters
+    """
+    size = 0
+    for item in items:
+        data = item.get("data")
+        if isinstance(data, str):
+            size += len(data)
+        elif isinstance(data, list) and data:
+            size += sum(map(len, data)) + len(data) - 1
+    return size
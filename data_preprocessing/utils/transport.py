@@ -0,0 +1,274 @@
+"""Shared memory transport for `DataPreprocess.multiprocess_data`.
+
+Sending large texts through the worker queues pickles and copies every text
+twice. With the shared memory transport the texts of a chunk are packed into a
+`multiprocessing.shared_memory` block as UTF-8 bytes with an offsets array.
+The `original_data` of the items, kept with `preserve_original`, is packed in
+the same block. Only a small `SharedChunk` descriptor with the rest of the
+item fields is sent to the worker. The worker writes the processed texts back
+into the same block, if they do not fit the results are sent back on the
+queue instead.
+
+The block layout is the offsets array of `count * len(fields) + 1` int64
+values followed by the text bytes. Text `i` is stored in the bytes from
+`offsets[i]` to `offsets[i + 1]`, the texts of an item are stored one after
+the other in the order of `fields`.
+
+Example:
+    .. code-block::
+
+        process = DataPreprocess(config)
+        for item in process.multiprocess_data(
+                workers=4, transport="shared_memory"):
+            print(item)
+"""
+
+import sys
+from array import array
+from multiprocessing import shared_memory
+
+OFFSET_SIZE = array("q").itemsize
+# Extra room in the block for results that are longer than the input
+GROWTH = 1.25
+# Item fields that are packed in the block when they are text
+TEXT_FIELDS = ("data", "original_data")
+
+
+class SharedChunk:
+    """Descriptor of a chunk of items packed in shared memory.
+
+    Args:
+        name (str): Name of the shared memory block
+        count (int): Number of items
+        items (list): Items with the texts removed
+        results (bool): True when the block holds the processed texts
+        fields (tuple): Item fields stored in the block
+    """
+    __slots__ = ("name", "count", "items", "results", "fields")
+
+    def __init__(self, name, count, items, results=False,
+                 fields=TEXT_FIELDS[:1]):
+        self.name = name
+        self.count = count
+        self.items = items
+        self.results = results
+        self.fields = fields
+
+    def __getstate__(self):
+        return (self.name, self.count, self.items, self.results, self.fields)
+
+    def __setstate__(self, state):
+        (self.name, self.count, self.items, self.results,
+         self.fields) = state
+
+
+class SharedMemoryChannel:
+    """Send chunks to a worker pool through shared memory.
+
+    The channel has the same `put` and `get` methods as the worker pool. The
+    parent creates and removes the shared memory blocks, the workers only
+    attach to them.
+
+    Args:
+        pool (obj): Worker pool
+    """
+    def __init__(self, pool):
+        self._pool = pool
+        self._blocks = {}
+
+    @property
+    def pending(self):
+        """Number of chunks sent and not collected."""
+        return self._pool.pending
+
+    def put(self, msg):
+        """Pack a chunk in shared memory and send the descriptor.
+
+        Chunks with data that is not text are sent on the queue.
+
+        Args:
+            msg (tuple): Sequence number and the items to process
+        """
+        seq, items = msg
+        fields = _text_fields(items)
+        if fields is None:
+            self._pool.put(msg)
+            return
+        texts = _pop_texts(items, fields)
+        size = sum(len(text) for text in texts)
+        header = OFFSET_SIZE * (len(texts) + 1)
+        block = shared_memory.SharedMemory(
+            create=True,
+            size=header + max(int(size * GROWTH), 1)
+        )
+        _write_texts(block, texts)
+        self._blocks[seq] = block
+        self._pool.put(
+            (seq, SharedChunk(block.name, len(items), items, fields=fields))
+        )
+
+    def get(self):
+        """Get the next result and unpack it from shared memory.
+
+        Returns:
+            tuple: Sequence number and the processed items
+        """
+        seq, results = self._pool.get()
+        block = self._blocks.pop(seq, None)
+        if block is None:
+            return seq, results
+        try:
+            if isinstance(results, SharedChunk):
+                results = _read_items(block, results)
+        finally:
+            block.close()
+            block.unlink()
+        return seq, results
+
+    def close(self):
+        """Remove the blocks of chunks that were never collected.
+
+        The results still being processed are discarded first, so no worker
+        is using a block when it is removed.
+        """
+        self._pool.drain()
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks = {}
+
+
+def attach(name):
+    """Attach to a shared memory block created by the parent.
+
+    Args:
+        name (str): Name of the shared memory block
+    Returns:
+        obj: SharedMemory
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def read_chunk(chunk):
+    """Read the items of a chunk in the worker.
+
+    Args:
+        chunk (obj): SharedChunk descriptor
+    Returns:
+        list: Items with their data
+    """
+    block = attach(chunk.name)
+    try:
+        return _read_items(block, chunk)
+    finally:
+        block.close()
+
+
+def write_results(chunk, items):
+    """Write the processed items back to the shared memory block.
+
+    The items are returned as they are when the data is not text or the
+    texts do not fit in the block.
+
+    Args:
+        chunk (obj): SharedChunk descriptor the items were read from
+        items (list): Processed items
+    Returns:
+        obj: SharedChunk descriptor or the list of items
+    """
+    fields = _text_fields(items)
+    if fields is None:
+        return items
+    texts = [
+        item[field].encode("utf-8") for item in items for field in fields
+    ]
+    block = attach(chunk.name)
+    try:
+        header = OFFSET_SIZE * (len(texts) + 1)
+        if header + sum(len(text) for text in texts) > block.size:
+            return items
+        _write_texts(block, texts)
+    finally:
+        block.close()
+    for item in items:
+        for field in fields:
+            item[field] = None
+    return SharedChunk(chunk.name, len(items), items, results=True,
+                       fields=fields)
+
+
+def _text_fields(items):
+    """Fields of the items that are packed in shared memory.
+
+    The `original_data` is packed when every item has it as text.
+
+    Args:
+        items (list): Items
+    Returns:
+        tuple: Field names, or None when the data of an item is not text
+    """
+    if not all(isinstance(item.get("data"), str) for item in items):
+        return None
+    if all(isinstance(item.get("original_data"), str) for item in items):
+        return TEXT_FIELDS
+    return TEXT_FIELDS[:1]
+
+
+def _pop_texts(items, fields):
+    """Encode the texts of the items and remove them from the items.
+
+    Args:
+        items (list): Items
+        fields (tuple): Fields to take the texts from
+    Returns:
+        list: Encoded texts, in the block order
+    """
+    texts = []
+    for item in items:
+        for field in fields:
+            texts.append(item[field].encode("utf-8"))
+            item[field] = None
+    return texts
+
+
+def _write_texts(block, texts):
+    """Write the offsets array and the texts to a block.
+
+    Args:
+        block (obj): SharedMemory
+        texts (list): Encoded texts
+    """
+    offsets = array("q", [0])
+    for text in texts:
+        offsets.append(offsets[-1] + len(text))
+    header = OFFSET_SIZE * len(offsets)
+    buf = block.buf
+    buf[:header] = offsets.tobytes()
+    buf[header:header + offsets[-1]] = b"".join(texts)
+    del buf
+
+
+def _read_items(block, chunk):
+    """Read the texts from a block into the items of a chunk.
+
+    Args:
+        block (obj): SharedMemory
+        chunk (obj): SharedChunk descriptor
+    Returns:
+        list: Items with their data
+    """
+    header = OFFSET_SIZE * (chunk.count * len(chunk.fields) + 1)
+    buf = block.buf
+    offsets = array("q")
+    offsets.frombytes(buf[:header])
+    index = 0
+    for item in chunk.items:
+        for field in chunk.fields:
+            start = header + offsets[index]
+            end = header + offsets[index + 1]
+            item[field] = str(buf[start:end], "utf-8")
+            index += 1
+    del buf
+    return chunk.items
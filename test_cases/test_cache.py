@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+
+from data_preprocessing import DataPreprocess
+from data_preprocessing.utils.cache import fingerprint
+from data_preprocessing.utils.config_template import ConfigTemplates
+
+TEST_LIST = ["this is a test", "I like dogs", "The jets suck."]
+
+
+class TestCache(unittest.TestCase):
+    def test_cache(self):
+        config = {
+            "data_loader": {"type": "list", "batch_size": 2},
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        test = [item.lower() for item in TEST_LIST * 2]
+        with tempfile.TemporaryDirectory() as directory:
+            config["cache"] = ConfigTemplates.cache(
+                path=os.path.join(directory, "cache.sqlite")
+            )
+            loader = DataPreprocess(config)
+            data = [
+                item["data"]
+                for batch in loader.process_data(TEST_LIST * 2)
+                for item in batch
+            ]
+            self.assertEqual(test, data)
+            data = [
+                item["data"] for item in loader.multiprocess_data(
+                    TEST_LIST * 2, workers=2, ordered=True
+                )
+            ]
+            self.assertEqual(test, data)
+            stats = loader.disconnect()
+            self.assertEqual(3, stats.items)
+            self.assertEqual(9, loader._cache.hits)
+
+            # Results are read from the database by a new pipeline
+            loader = DataPreprocess(config)
+            data = [
+                item["data"]
+                for batch in loader.process_data(TEST_LIST) for item in batch
+            ]
+            self.assertEqual(test[:3], data)
+            self.assertEqual(0, loader.disconnect().items)
+
+        config["cache"] = {"max_size": 500}
+        loader = DataPreprocess(config)
+        for _ in loader.process_data(TEST_LIST * 2):
+            pass
+        self.assertLessEqual(loader._cache.size, 500)
+        with self.assertRaises(KeyError):
+            config["cache"] = {"size": 500}
+            DataPreprocess(config)
+
+    def test_custom_fingerprint(self):
+        def custom_config(instance):
+            return {
+                "steps": [
+                    {
+                        "name": "normalize_text",
+                        "type": "custom_normalize",
+                        "custom_class": instance
+                    }
+                ]
+            }
+
+        def custom_class(suffix):
+            class Custom:
+                if suffix:
+                    def process(self, item):
+                        item["data"] = item["data"] + "!"
+                        return item
+                else:
+                    def process(self, item):
+                        item["data"] = item["data"] + "?"
+                        return item
+            return Custom()
+
+        first = fingerprint(custom_config(custom_class(True)))
+        self.assertEqual(
+            first, fingerprint(custom_config(custom_class(True)))
+        )
+        # The same class name with a new method body is a new pipeline
+        self.assertNotEqual(
+            first, fingerprint(custom_config(custom_class(False)))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,28 @@
+import asyncio
+import bz2
+import csv
+import gzip
+import json
+import lzma
+import multiprocessing as mp
+import os
+import shutil
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
 from data_preprocessing import DataPreprocess
+from data_preprocessing.utils.config_template import ConfigTemplates
 from data_preprocessing.steps.data_loaders.single_item import SingleItemLoader
 from data_preprocessing.steps.data_loaders.list_loader import ListDataLoader
 from data_preprocessing.steps.data_loaders.csv_loader import CsvDataLoader
+from data_preprocessing.steps.data_loaders.text_loader import TextDataLoader
+from data_preprocessing.steps.data_loaders.jsonl_loader import (
+    JsonlDataLoader
+)
+from data_preprocessing.utils.transport import (
+    SharedMemoryChannel, read_chunk
+)
 
 
 TEST_DATA = "This is a TEST sentence!"
@@ -39,6 +58,321 @@ class TestDataLoaders(unittest.TestCase):
         data = [item["data"] for item in loader.process()]
         self.assertEqual(4, len(data))
 
+    def test_csv_columns(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "items.csv")
+        with open(path, "w") as f:
+            f.write("id,text,user,other\n7,Some text,ann,1\n,123,bob,2\n"
+                    "9,,carl,3\n")
+        config = {
+            "name": "data_loader",
+            "type": "csv",
+            "file_path": path,
+            "columns": {
+                "id": "id", "data": "text", "additional_columns": ["user"]
+            },
+            "batch_size": 1000,
+            "log_level": "INFO",
+            "preserve_original": True,
+        }
+        items = list(CsvDataLoader(config).process())
+        self.assertEqual([
+            {
+                "id": 7,
+                "data": "Some text",
+                "tags": {},
+                "additional_keys": {"user": "ann"},
+                "original_data": "Some text"
+            },
+            {
+                "id": "202cb962ac59075b964b07152d234b70",
+                "data": "123",
+                "tags": {},
+                "additional_keys": {"user": "bob"},
+                "original_data": "123"
+            }
+        ], items)
+        self.assertIsInstance(items[0]["id"], int)
+
+        config["engine"] = "python"
+        config["block_size"] = 1
+        config["dtype"] = {"user": "category"}
+        self.assertEqual(items, list(CsvDataLoader(config).process()))
+        config["memory_map"] = True
+        self.assertEqual(items, list(CsvDataLoader(config).process()))
+        config["engine"] = "c"
+        config["block_size"] = 2 ** 20
+        self.assertEqual(items, list(CsvDataLoader(config).process()))
+
+        config = {
+            "data_loader": dict(config, engine="fast"),
+            "steps": []
+        }
+        with self.assertRaises(ValueError):
+            DataPreprocess(config)
+
+    def test_csv_records(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "items.csv")
+        config = {
+            "name": "data_loader",
+            "type": "csv",
+            "file_path": path,
+            "columns": {"id": "id", "data": "text"},
+            "batch_size": 1000,
+            "log_level": "INFO",
+            "preserve_original": False,
+        }
+
+        def texts(**options):
+            loader = CsvDataLoader(dict(config, **options))
+            return [item["data"] for item in loader.process()], loader
+
+        # A quote inside an unquoted field is text
+        with open(path, "wb") as f:
+            f.write(b'id,text\n1,5" screen\n2,two\n3,"multi\nline"\n')
+        expected = ['5" screen', "two", "multi\nline"]
+        self.assertEqual(expected, texts()[0])
+        self.assertEqual(expected, texts(memory_map=True)[0])
+
+        # Escaped quotes before a line break inside a quoted field
+        for data, expected in [
+                (b'id,text\n25,"a""\nb"', ['a"\nb']),
+                (b'id,text\n25,"""a\n"', ['"a\n']),
+                (b'id,text\n1,"' + b"x" * 40 + b'""\nmore"\n2,two\n',
+                 ["x" * 40 + '"\nmore', "two"])]:
+            with open(path, "wb") as f:
+                f.write(data)
+            self.assertEqual(expected, texts()[0])
+            self.assertEqual(expected, texts(memory_map=True)[0])
+            self.assertEqual(expected, texts(block_size=8)[0])
+            self.assertEqual(
+                expected, texts(block_size=8, memory_map=True)[0]
+            )
+
+        # Lines ending with a lone carriage return
+        with open(path, "wb") as f:
+            f.write(b'id,text\r1,one\r2,"two\rlines"\r3,three\r')
+        expected = ["one", "two\rlines", "three"]
+        self.assertEqual(expected, texts()[0])
+        self.assertEqual(expected, texts(memory_map=True)[0])
+        loader = CsvDataLoader(config)
+        items = loader.process()
+        next(items)
+        resumed = CsvDataLoader(config)
+        resumed.restore(loader.position)
+        self.assertEqual(
+            expected[1:], [item["data"] for item in resumed.process()]
+        )
+        data, loader = texts(block_size=1)
+        self.assertEqual(expected, data)
+        self.assertEqual(os.path.getsize(path), loader.position["offset"])
+
+        # A carriage return inside a line is found by the parser
+        with open(path, "wb") as f:
+            f.write(b"id,text\n1,one\r2,two\n3,three\n")
+        self.assertEqual(["one", "two", "three"], texts()[0])
+
+        with open(path, "wb") as f:
+            f.write(b'id,text\n1,one\r2,"not closed\n')
+        with self.assertRaisesRegex(ValueError, "record at byte 14"):
+            texts()
+
+    def test_text_loader(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "items.txt")
+        lines = ["Line {} caf\u00e9".format(i) for i in range(30)]
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write("\r\n".join(lines[:10]) + "\r\n\n  \n")
+            f.write("\n".join(lines[10:]))
+        config = ConfigTemplates.data_loader_text_loader(file_path=path)
+        config["name"] = "data_loader"
+        loader = TextDataLoader(config)
+        items = list(loader.process())
+        self.assertEqual(lines, [item["data"] for item in items])
+        self.assertEqual(
+            {"offset": os.path.getsize(path), "row": 32, "shard": None},
+            loader.position
+        )
+
+        shards = [
+            [item["data"] for item in loader.process(shard=(i, 4))]
+            for i in range(4)
+        ]
+        self.assertTrue(all(shards))
+        self.assertEqual(lines, sum(shards, []))
+
+        loader = TextDataLoader(config)
+        process = loader.process(shard=(1, 2))
+        first = [next(process)["data"] for _ in range(5)]
+        resumed = TextDataLoader(config)
+        resumed.restore(loader.position)
+        rest = [item["data"] for item in resumed.process(shard=(1, 2))]
+        self.assertEqual(shards[2] + shards[3], first + rest)
+        resumed.restore(loader.position)
+        with self.assertRaises(ValueError):
+            list(resumed.process())
+
+        config = {
+            "data_loader": config,
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        with DataPreprocess(config) as loader:
+            data = [
+                item["data"] for item in loader.multiprocess_data(
+                    workers=2, ordered=True, partitioned=True
+                )
+            ]
+        self.assertEqual([line.lower() for line in lines], data)
+
+    def test_compressed_files(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "items.csv")
+        rows = [[i + 1, "Line {}\nwith a \"quote\"".format(i)]
+                for i in range(300)]
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "text"])
+            writer.writerows(rows)
+        with open(path, "rb") as f:
+            data = f.read()
+        for name, module in [("gz", gzip), ("bz2", bz2), ("xz", lzma)]:
+            with module.open(path + "." + name, "wb") as f:
+                f.write(data)
+        config = ConfigTemplates.data_loader_csv_loader(
+            file_path=path,
+            columns={"id": "id", "data": "text"},
+            block_size=256
+        )
+        config["name"] = "data_loader"
+        items = list(CsvDataLoader(config).process())
+        self.assertEqual(300, len(items))
+        for name in ["gz", "bz2", "xz"]:
+            for thread in [False, True]:
+                loader = CsvDataLoader(dict(
+                    config,
+                    file_path=path + "." + name,
+                    buffer_size=1000,
+                    decompress_thread=thread
+                ))
+                self.assertEqual(items, list(loader.process()))
+                self.assertEqual(len(data), loader.position["offset"])
+
+        config["file_path"] = path + ".gz"
+        config["decompress_thread"] = True
+        loader = CsvDataLoader(config)
+        process = loader.process()
+        first = [next(process) for _ in range(120)]
+        resumed = CsvDataLoader(config)
+        resumed.restore(loader.position)
+        process.close()
+        self.assertEqual(items, first + list(resumed.process()))
+        with self.assertRaises(ValueError):
+            list(CsvDataLoader(config).process(shard=(0, 2)))
+
+        path = os.path.join(directory, "items.txt.bz2")
+        lines = ["Line {}".format(i) for i in range(50)]
+        with bz2.open(path, "wt") as f:
+            f.write("\n".join(lines))
+        config = ConfigTemplates.data_loader_text_loader(file_path=path)
+        config["name"] = "data_loader"
+        loader = TextDataLoader(config)
+        self.assertEqual(lines, [item["data"] for item in loader.process()])
+        config = {
+            "data_loader": dict(config, compression="lz4"),
+            "steps": []
+        }
+        with self.assertRaises(ValueError):
+            DataPreprocess(config)
+
+    def test_jsonl_loader(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        records = [
+            {
+                "id": i + 1 if i % 5 else None,
+                "body": {"text": "Post {}".format(i)},
+                "user": {"name": "user{}".format(i % 3)},
+                "lang.code": "en"
+            }
+            for i in range(40)
+        ]
+        records[7] = {"id": 8, "body": {}}
+        path = os.path.join(directory, "items.jsonl")
+        with open(path, "w") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.write("\n{not json\n")
+        config = ConfigTemplates.data_loader_jsonl_loader(
+            file_path=path,
+            columns={
+                "id": "id",
+                "data": "body.text",
+                "additional_columns": ["user.name", "lang.code"]
+            }
+        )
+        config["name"] = "data_loader"
+        items = list(JsonlDataLoader(config).process())
+        self.assertEqual(39, len(items))
+        self.assertEqual({
+            "id": 2,
+            "data": "Post 1",
+            "tags": {},
+            "additional_keys": {"user.name": "user1", "lang.code": "en"}
+        }, items[1])
+        self.assertEqual(32, len(items[0]["id"]))
+
+        shards = [
+            list(JsonlDataLoader(config).process(shard=(i, 3)))
+            for i in range(3)
+        ]
+        self.assertTrue(all(shards))
+        self.assertEqual(items, sum(shards, []))
+
+        # One array, read in blocks smaller than an object
+        array_path = os.path.join(directory, "items.json.gz")
+        with gzip.open(array_path, "wt") as f:
+            f.write(" [\n" + ",\n  ".join(
+                json.dumps(record) for record in records
+            ) + "\n]\n")
+        config["file_path"] = array_path
+        config["buffer_size"] = 16
+        loader = JsonlDataLoader(config)
+        process = loader.process()
+        first = [next(process) for _ in range(10)]
+        resumed = JsonlDataLoader(config)
+        resumed.restore(loader.position)
+        process.close()
+        self.assertEqual(items, first + list(resumed.process()))
+        shards = [
+            list(JsonlDataLoader(config).process(shard=(i, 2)))
+            for i in range(2)
+        ]
+        self.assertEqual(
+            sorted(item["data"] for item in items),
+            sorted(item["data"] for item in sum(shards, []))
+        )
+        with self.assertRaises(ValueError):
+            list(JsonlDataLoader(config).partitions(None, 2, 10))
+
+        with open(array_path, "wb") as f:
+            f.write(gzip.compress(b'[{"text": "a"}, {"text": 1.5} {}]'))
+        config["columns"] = {"data": "text"}
+        process = JsonlDataLoader(config).process()
+        self.assertEqual(["a", "1.5"], [next(process)["data"] for _ in "ab"])
+        with self.assertRaises(ValueError):
+            next(process)
+
     def test_single_item_pipeline(self):
         config = {
             "data_loader": {"type": "single_item"},
@@ -74,6 +408,336 @@ class TestDataLoaders(unittest.TestCase):
         test = [item.lower() for item in TEST_LIST]
         self.assertEqual(test, data)
 
+    def test_multiprocess_pipeline(self):
+        config = {
+            "data_loader": {"type": "list", "batch_size": 2},
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        loader = DataPreprocess(config)
+        data = [
+            item["data"]
+            for item in loader.multiprocess_data(TEST_LIST, workers=2)
+        ]
+        test = [item.lower() for item in TEST_LIST]
+        self.assertEqual(sorted(test), sorted(data))
+
+        data = [
+            item["data"] for item in loader.multiprocess_data(
+                TEST_LIST * 3, workers=2, chunk_size=4
+            )
+        ]
+        self.assertEqual(sorted(test * 3), sorted(data))
+
+    def test_multiprocess_ordered(self):
+        config = {
+            "data_loader": {"type": "list", "batch_size": 7},
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "remove_digits",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        loader = DataPreprocess(config)
+        test_data = ["item {}".format(i) for i in range(50)]
+        expected = [
+            item for batch in loader.process_data(list(test_data))
+            for item in batch
+        ]
+        data = list(loader.multiprocess_data(
+            test_data, workers=3, chunk_size=2, ordered=True
+        ))
+        self.assertEqual(expected, data)
+
+        data = list(loader.multiprocess_data(
+            test_data, workers=3, chunk_size=3, ordered=True,
+            max_in_flight=2
+        ))
+        self.assertEqual(expected, data)
+
+    def test_reorder_window(self):
+        class StalledChannel:
+            """Return the first chunk last, the others newest first."""
+            def __init__(self):
+                self.sent = []
+                self.count = 0
+                self.yielded = 0
+                self.held = 0
+
+            def put(self, msg):
+                self.sent.append(msg)
+                self.count += 1
+                # Chunks being processed or waiting in the reorder buffer
+                self.held = max(self.held, self.count - self.yielded)
+
+            def get(self):
+                if len(self.sent) > 1 and self.sent[0][0] == 0:
+                    return self.sent.pop()
+                return self.sent.pop(0)
+
+        config = {
+            "data_loader": {"type": "list"},
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        channel = StalledChannel()
+        chunks = ([i] for i in range(100))
+        with DataPreprocess(config) as loader:
+            data = []
+            for item in loader._stream_chunks(channel, chunks, True, 4):
+                data.append(item)
+                channel.yielded += 1
+        self.assertEqual(list(range(100)), data)
+        self.assertLessEqual(channel.held, 4)
+
+    def test_multiprocess_shared_memory(self):
+        config = {
+            "data_loader": {"type": "list", "batch_size": 2},
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        data = TEST_LIST + ["ΟΔΟΣ Café", ""]
+        with DataPreprocess(config) as loader:
+            test = [
+                item["data"]
+                for batch in loader.process_data(data) for item in batch
+            ]
+            results = [
+                item["data"] for item in loader.multiprocess_data(
+                    data, workers=2, ordered=True, transport="shared_memory"
+                )
+            ]
+            self.assertEqual(test, results)
+            with self.assertRaises(ValueError):
+                next(loader.multiprocess_data(data, transport="pipe"))
+
+        # The original data is packed in the block with the data
+        config["data_loader"]["preserve_original"] = True
+        with DataPreprocess(config) as loader:
+            results = list(loader.multiprocess_data(
+                data, workers=2, ordered=True, transport="shared_memory"
+            ))
+            self.assertEqual(test, [item["data"] for item in results])
+            self.assertEqual(
+                data, [item["original_data"] for item in results]
+            )
+
+        # Only the item fields that are not text are pickled
+        class Pool:
+            sent = []
+
+            def put(self, msg):
+                self.sent.append(msg)
+
+        sent = Pool.sent
+        channel = SharedMemoryChannel(Pool())
+        channel.put((0, [{"id": 1, "data": "a", "original_data": "A"}]))
+        self.assertEqual(
+            [{"id": 1, "data": None, "original_data": None}],
+            sent[0][1].items
+        )
+        self.assertEqual(
+            [{"id": 1, "data": "a", "original_data": "A"}],
+            read_chunk(sent[0][1])
+        )
+        for block in channel._blocks.values():
+            block.close()
+            block.unlink()
+
+        # Results longer than the block are sent back on the queue
+        config["steps"].append(
+            ConfigTemplates.normalize_text_expand_contractions()
+        )
+        data = ["I'd've", "we'll"]
+        with DataPreprocess(config) as loader:
+            test = [
+                item["data"]
+                for batch in loader.process_data(data) for item in batch
+            ]
+            results = [
+                item["data"] for item in loader.multiprocess_data(
+                    data, workers=1, ordered=True, transport="shared_memory"
+                )
+            ]
+            self.assertEqual(test, results)
+
+    def test_dedupe(self):
+        config = {
+            "data_loader": {"type": "list", "batch_size": 2},
+            "dedupe": ConfigTemplates.dedupe(),
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        test = [item.lower() for item in TEST_LIST]
+        loader = DataPreprocess(config)
+        data = [
+            item["data"]
+            for batch in loader.process_data(TEST_LIST * 3) for item in batch
+        ]
+        self.assertEqual(test, data)
+
+        config["dedupe"] = ConfigTemplates.dedupe(mode="bloom", memory=1024)
+        with DataPreprocess(config) as loader:
+            data = [
+                item["data"] for item in loader.multiprocess_data(
+                    TEST_LIST * 3, workers=2, ordered=True
+                )
+            ]
+            self.assertEqual(test, data)
+
+            async def collect():
+                return [
+                    item["data"]
+                    async for batch in loader.aprocess_data(TEST_LIST * 3)
+                    for item in batch
+                ]
+            self.assertEqual(test, asyncio.run(collect()))
+        self.assertEqual(12, loader.disconnect().duplicates)
+
+        # Ids read from a csv file do not hide repeated texts
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "items.csv")
+        with open(path, "w") as f:
+            f.write("id,text\n")
+            for i, text in enumerate(TEST_LIST * 3, 1):
+                f.write("{},{}\n".format(i, text))
+        config["data_loader"] = {
+            "type": "csv",
+            "file_path": path,
+            "columns": {"id": "id", "data": "text"},
+            "batch_size": 2
+        }
+        for dedupe, expected in [
+                (ConfigTemplates.dedupe(), [1, 2, 3]),
+                (ConfigTemplates.dedupe(mode="bloom"), [1, 2, 3]),
+                (ConfigTemplates.dedupe(key="id"), list(range(1, 10)))]:
+            config["dedupe"] = dedupe
+            with DataPreprocess(config) as loader:
+                data = [
+                    item["id"]
+                    for batch in loader.process_data() for item in batch
+                ]
+            self.assertEqual(expected, data)
+
+        with self.assertRaises(ValueError):
+            config["dedupe"] = {"mode": "approximate"}
+            DataPreprocess(config)
+        with self.assertRaises(ValueError):
+            config["dedupe"] = {"key": "text"}
+            DataPreprocess(config)
+
+    def test_multiprocess_executor(self):
+        config = {
+            "data_loader": {"type": "list", "batch_size": 2},
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        loader = DataPreprocess(config)
+        with ThreadPoolExecutor(2) as executor:
+            data = [
+                item["data"] for item in loader.multiprocess_data(
+                    TEST_LIST, ordered=True, executor=executor
+                )
+            ]
+        self.assertEqual([item.lower() for item in TEST_LIST], data)
+
+    def test_threaded_pipeline(self):
+        config = {
+            "data_loader": {"type": "list", "batch_size": 2},
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+                {
+                    "name": "normalize_text",
+                    "type": "remove_stopwords",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        loader = DataPreprocess(config)
+        expected = [
+            item for batch in loader.process_data(list(TEST_LIST * 5))
+            for item in batch
+        ]
+        data = list(loader.threaded_process_data(
+            TEST_LIST * 5, threads=3, chunk_size=2, ordered=True
+        ))
+        self.assertEqual(expected, data)
+
+        # Steps that are not thread safe are built once for each thread
+        built = []
+        build_steps = loader._build_steps
+        loader._build_steps = lambda configs: built.append(1) or build_steps(
+            configs
+        )
+        loader._thread_safe = False
+        for _ in range(3):
+            data = list(loader.threaded_process_data(
+                TEST_LIST * 5, threads=2, chunk_size=2, ordered=True
+            ))
+            self.assertEqual(expected, data)
+        self.assertLessEqual(len(built), 2)
+        loader.disconnect()
+        self.assertIsNone(loader._thread_pool)
+
+    def test_async_pipeline(self):
+        config = {
+            "data_loader": {"type": "list", "batch_size": 2},
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        loader = DataPreprocess(config)
+
+        async def source():
+            for item in TEST_LIST:
+                yield item
+
+        async def run(data):
+            return [batch async for batch in loader.aprocess_data(data)]
+
+        test = [item.lower() for item in TEST_LIST]
+        for data in (TEST_LIST, source()):
+            batches = asyncio.run(run(data))
+            self.assertEqual([2, 1], [len(batch) for batch in batches])
+            data = [item["data"] for batch in batches for item in batch]
+            self.assertEqual(test, data)
+
     def test_csv_pipeline(self):
         config = {
             "data_loader": {
@@ -102,6 +766,239 @@ class TestDataLoaders(unittest.TestCase):
         self.assertEqual(4, len(data))
 
 
+    def test_csv_resume(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "items.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "text", "other"])
+            for i in range(50):
+                text = "Line {}\nwith a \"quote\"".format(i) if i % 7 else \
+                    "Row {}".format(i)
+                writer.writerow([i + 1, text, "x"])
+        config = {
+            "data_loader": ConfigTemplates.data_loader_csv_loader(
+                file_path=path,
+                columns={"id": "id", "data": "text"},
+                batch_size=4,
+                checkpoint_path=os.path.join(directory, "items.checkpoint"),
+                checkpoint_interval=0,
+                resume=True
+            ),
+            "sink": ConfigTemplates.sink(
+                file_path=os.path.join(directory, "items.jsonl.gz"),
+                compression="gzip"
+            ),
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+
+        def crash():
+            # Stop without closing the sink, like a killed process
+            loader = DataPreprocess(config)
+            for index, _ in enumerate(loader.process_data()):
+                if index == 5:
+                    os._exit(0)
+        process = mp.get_context("fork").Process(target=crash)
+        process.start()
+        process.join()
+        with open(config["data_loader"]["checkpoint_path"]) as f:
+            self.assertEqual(20, json.load(f)["loader"]["row"])
+
+        with DataPreprocess(config) as loader:
+            list(loader.multiprocess_data(workers=2, chunk_size=3,
+                                          ordered=True))
+        with gzip.open(config["sink"]["file_path"], "rt") as f:
+            ids = [json.loads(line)["id"] for line in f]
+        self.assertEqual(list(range(1, 51)), ids)
+        with DataPreprocess(config) as loader:
+            self.assertEqual([], list(loader.process_data()))
+
+
+    def test_shards(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "items.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "text"])
+            for i in range(100):
+                writer.writerow([i, "Text " * (i % 13 + 1)])
+        config = {
+            "data_loader": ConfigTemplates.data_loader_csv_loader(
+                file_path=path,
+                columns={"id": "id", "data": "text"},
+                batch_size=8
+            ),
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        with DataPreprocess(config) as loader:
+            shards = [
+                [
+                    item["data"]
+                    for batch in loader.process_data(
+                        shard_index=i, num_shards=3
+                    )
+                    for item in batch
+                ]
+                for i in range(3)
+            ]
+            self.assertTrue(all(shards))
+            self.assertEqual(
+                ["text " * (i % 13 + 1) for i in range(100)],
+                sum(shards, [])
+            )
+
+            with self.assertRaises(ValueError):
+                list(loader.process_data(shard_index=3, num_shards=3))
+
+        # Shards start at whole records when quoted fields have line breaks
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "text"])
+            for i in range(1, 501):
+                writer.writerow([i, "Line {}\nzzz".format(i) * (i % 3 + 1)])
+        for memory_map in [False, True]:
+            config["data_loader"]["memory_map"] = memory_map
+            with DataPreprocess(config) as loader:
+                items = [
+                    item
+                    for i in range(4)
+                    for batch in loader.process_data(
+                        shard_index=i, num_shards=4
+                    )
+                    for item in batch
+                ]
+            self.assertEqual(
+                list(range(1, 501)), [item["id"] for item in items]
+            )
+            self.assertTrue(all(isinstance(item["id"], int) for item in items))
+            self.assertEqual(
+                ["line {}\nzzz".format(i) * (i % 3 + 1)
+                 for i in range(1, 501)],
+                [item["data"] for item in items]
+            )
+
+        config["data_loader"] = {"type": "list", "batch_size": 4}
+        data = ["text {}".format(i) for i in range(50)]
+        with DataPreprocess(config) as loader:
+            shards = [
+                [
+                    item["data"] for item in loader.multiprocess_data(
+                        data, workers=2, ordered=True,
+                        shard_index=i, num_shards=4
+                    )
+                ]
+                for i in range(4)
+            ]
+        self.assertTrue(all(shards))
+        self.assertEqual(sorted(data), sorted(sum(shards, [])))
+
+
+    def test_partitioned(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "items.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "text"])
+            for i in range(200):
+                writer.writerow([i + 1, "Text {}".format(i)])
+        config = {
+            "data_loader": ConfigTemplates.data_loader_csv_loader(
+                file_path=path,
+                columns={"id": "id", "data": "text"},
+                batch_size=16
+            ),
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        test = ["text {}".format(i) for i in range(200)]
+        with DataPreprocess(config) as loader:
+            data = [
+                item["data"] for item in loader.multiprocess_data(
+                    workers=3, ordered=True, partitioned=True
+                )
+            ]
+            self.assertEqual(test, data)
+            data = [
+                item["data"] for item in loader.threaded_process_data(
+                    threads=2, partitioned=True, shard_index=1, num_shards=2
+                )
+            ]
+            self.assertEqual(test[-len(data):], sorted(data, key=test.index))
+            self.assertEqual(200 + len(data), loader.disconnect().items)
+
+        # Most lines are inside quoted fields, the partitions start at
+        # whole records
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "text"])
+            for i in range(200):
+                writer.writerow([i + 1, "Text {}\n\n\n\"x\"".format(i)])
+        with DataPreprocess(config) as loader:
+            data = [
+                item["data"] for item in loader.multiprocess_data(
+                    workers=7, ordered=True, partitioned=True
+                )
+            ]
+        self.assertEqual(
+            ["text {}\n\n\n\"x\"".format(i) for i in range(200)], data
+        )
+
+        # A partition that fails to load raises the error in the parent
+        with open(path, "a") as f:
+            f.write("201,\"not closed\n")
+        with DataPreprocess(config) as loader:
+            with self.assertRaises(ValueError):
+                list(loader.multiprocess_data(
+                    workers=2, ordered=True, partitioned=True
+                ))
+            self.assertTrue(loader._pool.is_alive())
+            with open(path, "w") as f:
+                f.write("id,text\n1,Text\n")
+            data = [
+                item["data"] for item in loader.multiprocess_data(
+                    workers=2, partitioned=True
+                )
+            ]
+            self.assertEqual(["text"], data)
+
+        config["data_loader"] = {"type": "list", "batch_size": 4}
+        config["dedupe"] = ConfigTemplates.dedupe()
+        with DataPreprocess(config) as loader:
+            with self.assertRaises(ValueError):
+                list(loader.multiprocess_data(
+                    test, workers=2, partitioned=True
+                ))
+        del config["dedupe"]
+        with DataPreprocess(config) as loader:
+            data = [
+                item["data"] for item in loader.multiprocess_data(
+                    test, workers=2, chunk_size=7, ordered=True,
+                    partitioned=True
+                )
+            ]
+        self.assertEqual(test, data)
+
+
 if __name__ == "__main__":
     unittest.main()
 
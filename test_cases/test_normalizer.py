@@ -95,6 +95,77 @@ class TestNormalizer(unittest.TestCase):
         process = loader.process_item(" remove  whitespace ")
         self.assertEqual("remove whitespace", process["data"])
 
+    def test_process_batch(self):
+        config = templates.pipeline()
+        config['data_loader'] = templates.data_loader_list_loader(
+            batch_size=2
+        )
+        config['steps'].append(templates.normalize_text_lowercase())
+        config['steps'].append(templates.normalize_text_remove_punctuation())
+        config['steps'].append(templates.normalize_text_remove_stopwords())
+        loader = DataPreprocess(config)
+        batches = list(loader.process_data(TEST_LIST))
+        self.assertEqual([2, 1], [len(batch) for batch in batches])
+        data = [item["data"] for batch in batches for item in batch]
+        self.assertEqual(["test", "like dogs", "jets suck"], data)
+
+    def test_empty_item(self):
+        config = templates.pipeline()
+        config['data_loader'] = templates.data_loader_list_loader()
+        config['steps'].append(templates.normalize_text_remove_digits())
+        config['steps'].append(templates.normalize_text_lowercase())
+        loader = DataPreprocess(config)
+        batch = next(loader.process_data(["123", "Keep 4"]))
+        self.assertEqual(["", "keep "], [item["data"] for item in batch])
+
+    def test_fused_char_steps(self):
+        config = templates.pipeline()
+        config['data_loader'] = templates.data_loader_single_item_loader()
+        config['steps'].append(templates.normalize_text_lowercase())
+        config['steps'].append(templates.normalize_text_remove_digits())
+        config['steps'].append(templates.normalize_text_remove_punctuation())
+        config['steps'].append(templates.normalize_text_remove_whitespace())
+        loader = DataPreprocess(config)
+        self.assertEqual(1, len(loader._pipeline_steps))
+        for text, expected in [
+                (" It's 2021,  ΟΔΟΣ 1!\n", "it s οδος"),
+                ("ΑΣ1Β", "αςβ")]:
+            process = loader.process_item(text)
+            self.assertEqual(expected, process["data"])
+
+    def test_token_stream(self):
+        config = templates.pipeline()
+        config['data_loader'] = templates.data_loader_single_item_loader()
+        config['steps'].append(templates.normalize_text_lowercase())
+        config['steps'].append(templates.normalize_text_expand_contractions())
+        config['steps'].append(templates.normalize_text_remove_stopwords())
+        config['steps'].append(templates.normalize_text_porter_stemmer())
+        loader = DataPreprocess(config)
+        keep_tokens = [step._keep_tokens for step in loader._pipeline_steps]
+        self.assertEqual([False, True, True, False], keep_tokens)
+        process = loader.process_item("I can't find the running dogs")
+        self.assertEqual("cannot find run dog", process["data"])
+
+    def test_token_stream_error(self):
+        class FailingStemmer:
+            def stem(self, word):
+                raise LookupError("Resource not found")
+
+        # The tokens kept by a step are joined when the next step fails
+        for last_step in [[], [templates.normalize_text_lowercase()]]:
+            config = templates.pipeline()
+            config['data_loader'] = templates.data_loader_single_item_loader()
+            config['steps'].append(templates.normalize_text_lowercase())
+            config['steps'].append(
+                templates.normalize_text_remove_stopwords()
+            )
+            config['steps'].append(templates.normalize_text_porter_stemmer())
+            config['steps'] += last_step
+            loader = DataPreprocess(config)
+            loader._pipeline_steps[2]._porter_stemmer = FailingStemmer()
+            process = loader.process_item("The big CITIES of the world")
+            self.assertEqual("big cities world", process["data"])
+
 
 if __name__ == "__main__":
     unittest.main()
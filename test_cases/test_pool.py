@@ -0,0 +1,46 @@
+import logging
+import os
+import unittest
+
+from data_preprocessing import DataPreprocess
+from data_preprocessing.utils.pool import WorkerPool
+
+TEST_LIST = ["this is a test", "I like dogs", "The jets suck."]
+
+
+class TestPool(unittest.TestCase):
+    def test_multiprocess_pool(self):
+        config = {
+            "data_loader": {"type": "list", "batch_size": 2},
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        test = [item.lower() for item in TEST_LIST]
+        with DataPreprocess(config) as loader:
+            for _ in range(2):
+                data = [
+                    item["data"]
+                    for item in loader.multiprocess_data(TEST_LIST, workers=2)
+                ]
+                self.assertEqual(sorted(test), sorted(data))
+            pool = loader._pool
+            self.assertTrue(pool.is_alive())
+        self.assertIsNone(loader._pool)
+        self.assertFalse(pool.is_alive())
+
+        # A worker that stops raises an error instead of blocking
+        pool = WorkerPool(lambda queue, results: os._exit(1), 1,
+                          logging.getLogger(__name__))
+        pool.put((0, []))
+        with self.assertRaises(RuntimeError):
+            pool.get()
+        pool.shutdown(timeout=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
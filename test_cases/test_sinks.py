@@ -0,0 +1,87 @@
+import csv
+import glob
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from data_preprocessing import DataPreprocess
+from data_preprocessing.utils.config_template import ConfigTemplates
+
+TEST_LIST = ["this is a test", "I like dogs", "The jets suck."]
+
+
+class TestSinks(unittest.TestCase):
+    def test_sink(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        config = {
+            "data_loader": {"type": "list", "batch_size": 2},
+            "sink": ConfigTemplates.sink(
+                file_path=os.path.join(directory, "items.jsonl.gz"),
+                compression="gzip",
+                max_file_size=1,
+                buffer_size=1
+            ),
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        with DataPreprocess(config) as loader:
+            list(loader.multiprocess_data(TEST_LIST, workers=2, ordered=True))
+        files = sorted(glob.glob(os.path.join(directory, "items-*.jsonl.gz")))
+        self.assertGreater(len(files), 1)
+        self.assertTrue(files[0].endswith("items-00000.jsonl.gz"))
+        data = []
+        for path in files:
+            with gzip.open(path, "rt") as f:
+                data += [json.loads(line)["data"] for line in f]
+        self.assertEqual([item.lower() for item in TEST_LIST], data)
+
+        path = os.path.join(directory, "items.csv")
+        config["sink"] = ConfigTemplates.sink(
+            type="csv",
+            file_path=path,
+            background=False
+        )
+        with DataPreprocess(config) as loader:
+            for _ in loader.process_data(TEST_LIST):
+                pass
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(["id", "data", "tags"], list(rows[0]))
+        self.assertEqual(
+            [item.lower() for item in TEST_LIST],
+            [row["data"] for row in rows]
+        )
+
+        # Items changed in the loop are written as they were yielded
+        path = os.path.join(directory, "changed.jsonl")
+        config["sink"] = ConfigTemplates.sink(file_path=path)
+        with DataPreprocess(config) as loader:
+            for batch in loader.process_data(TEST_LIST * 50):
+                for item in batch:
+                    item["data"] = None
+                    item["tags"]["changed"] = True
+        with open(path) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(
+            [item.lower() for item in TEST_LIST * 50],
+            [row["data"] for row in rows]
+        )
+        self.assertFalse(any(row["tags"] for row in rows))
+
+        with self.assertRaises(ValueError):
+            config["sink"] = {"type": "jsonl", "file_path": path,
+                              "compression": "snappy"}
+            DataPreprocess(config)
+
+
+if __name__ == "__main__":
+    unittest.main()
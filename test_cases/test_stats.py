@@ -0,0 +1,74 @@
+import unittest
+
+from data_preprocessing import DataPreprocess
+
+TEST_DATA = "This is a TEST sentence!"
+TEST_LIST = ["this is a test", "I like dogs", "The jets suck."]
+
+
+class TestStats(unittest.TestCase):
+    def test_stats(self):
+        config = {
+            "data_loader": {"type": "list", "batch_size": 2},
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "remove_urls",
+                    "log_level": "INFO"
+                },
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+                {
+                    "name": "normalize_text",
+                    "type": "remove_punctuation",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        with DataPreprocess(config) as loader:
+            data = [
+                item["data"]
+                for batch in loader.process_data(TEST_LIST) for item in batch
+            ]
+            data += [
+                item["data"]
+                for item in loader.multiprocess_data(TEST_LIST, workers=2)
+            ]
+        stats = loader.disconnect()
+        self.assertEqual(6, stats.items)
+        self.assertEqual(
+            ["remove_urls", "lowercase+remove_punctuation"],
+            [step.name for step in stats.steps]
+        )
+        chars = sum(len(item) for item in TEST_LIST) * 2
+        self.assertEqual(6, stats.steps[0].items)
+        self.assertEqual(chars, stats.steps[0].chars_in)
+        self.assertEqual(chars, stats.steps[1].chars_in)
+        self.assertEqual(
+            sum(len(item) for item in data), stats.steps[1].chars_out
+        )
+        self.assertEqual(6, stats.to_dict()["steps"][1]["items"])
+
+        config = {
+            "data_loader": {"type": "single_item"},
+            "steps": [
+                {
+                    "name": "normalize_text",
+                    "type": "lowercase",
+                    "log_level": "INFO"
+                },
+            ],
+        }
+        loader = DataPreprocess(config)
+        loader.process_item(TEST_DATA)
+        loader._process_batch([{"id": "1", "data": ["not", "text"]}])
+        stats = loader.disconnect()
+        self.assertEqual(2, stats.items)
+        self.assertEqual(1, stats.steps[0].errors)
+
+
+if __name__ == "__main__":
+    unittest.main()